@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+import time
+from typing import Any, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+Key = TypeVar('Key', bound=Hashable)
+Value = TypeVar('Value')
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class LRUCache(Generic[Key, Value]):  # pylint: disable=too-many-instance-attributes
+    max_size: int = 1024
+    ttl: Optional[float] = None  # seconds, None never expires
+    clock: Callable[[], float] = time.monotonic
+    # key -> (expires_at, value), least recently used first
+    _entries: 'OrderedDict[Key, Tuple[float, Value]]' = field(
+        default_factory=OrderedDict, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+    _hits: int = field(default=0, init=False, repr=False)
+    _misses: int = field(default=0, init=False, repr=False)
+    _evictions: int = field(default=0, init=False, repr=False)
+    _expirations: int = field(default=0, init=False, repr=False)
+    # bumped by every invalidate and clear; key -> generation of its last
+    # invalidation, the oldest dropped past max_size
+    _generation: int = field(default=0, init=False, repr=False)
+    _invalidations: 'OrderedDict[Key, int]' = field(
+        default_factory=OrderedDict, init=False, repr=False)
+    # invalidations up to this generation are no longer known per key
+    _forgotten: int = field(default=0, init=False, repr=False)
+
+    def token(self) -> int:
+        # taken before reading the value to cache: set() with it is skipped
+        # if the key was invalidated in between, so a stale read isn't cached
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Key, default: Any = None) -> Optional[Value]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is None or entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+            return default
+
+    def set(self, key: Key, value: Value, token: Optional[int] = None) -> None:
+        expires_at = float('inf') if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            if token is not None and (
+                    self._forgotten > token or self._invalidations.get(key, 0) > token):
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+            self._invalidations[key] = self._generation
+            self._invalidations.move_to_end(key)
+            if len(self._invalidations) > self.max_size:
+                self._forgotten = self._invalidations.popitem(last=False)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidations.clear()
+            self._forgotten = self._generation
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._entries)
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,8 +1,22 @@
 from dataclasses import dataclass
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
 from __seedwork.domain.repositories import SearchResult
 
 
+@dataclass(frozen=True, slots=True)
+class Unset:
+    # marks an optional input field the caller did not send (None is a value)
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return 'UNSET'
+
+
+UNSET = Unset()
+
+
 Filter = TypeVar("Filter")
 
 
@@ -13,6 +27,7 @@ class SearchInput(Generic[Filter]):
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    facets: Optional[Tuple[str, ...]] = None
 
 
 Item = TypeVar('Item')
@@ -25,6 +40,7 @@ class PaginationOutput(Generic[Item]):
     current_page: int
     per_page: int
     last_page: int
+    facets: Optional[Dict[str, Dict[Any, int]]] = None
 
 
 Output = TypeVar('Output', bound=PaginationOutput)
@@ -46,5 +62,6 @@ class PaginationOutputMapper:
             total=result.total,
             current_page=result.current_page,
             per_page=result.per_page,
-            last_page=result.last_page
+            last_page=result.last_page,
+            facets=result.facets
         )
@@ -0,0 +1,134 @@
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from functools import cache, lru_cache
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, Tuple
+
+
+# writes use case outputs straight into a bytes buffer, with the same result
+# as json.dumps(asdict(output), default=isoformat, separators=(',', ':'))
+
+Writer = Callable[[bytearray, Any], None]
+
+
+def encode(value: Any) -> bytes:
+    buffer = bytearray()
+    _write(buffer, value)
+    return bytes(buffer)
+
+
+@cache
+def _field_plan(cls: type) -> Tuple[Tuple[str, bytes], ...]:
+    # the '"name":' prefix of each field is encoded once per class
+    return tuple(
+        (dataclass_field.name,
+         (b',' if index else b'') + _encode_str(dataclass_field.name) + b':')
+        for index, dataclass_field in enumerate(fields(cls))
+    )
+
+
+@lru_cache(maxsize=4096)
+def _encode_datetime(value: date, _utc_offset: Any) -> bytes:
+    # aware datetimes at the same instant are equal whatever their offset,
+    # so the offset is part of the cache key
+    return b'"' + value.isoformat().encode('ascii') + b'"'
+
+
+def _encode_str(value: str) -> bytes:
+    return encode_basestring_ascii(value).encode('ascii')
+
+
+def _write(buffer: bytearray, value: Any) -> None:
+    value_type = type(value)
+    writer = _WRITERS.get(value_type) or _writer_for(value_type)
+    writer(buffer, value)
+
+
+def _write_dataclass(buffer: bytearray, value: Any) -> None:
+    # _write inlined, this runs once per field of every item
+    writers = _WRITERS
+    buffer += b'{'
+    for name, prefix in _field_plan(type(value)):
+        buffer += prefix
+        item = getattr(value, name)
+        (writers.get(type(item)) or _writer_for(type(item)))(buffer, item)
+    buffer += b'}'
+
+
+def _write_list(buffer: bytearray, value: Any) -> None:
+    writers = _WRITERS
+    buffer += b'['
+    separator = b''
+    for item in value:
+        buffer += separator
+        separator = b','
+        (writers.get(type(item)) or _writer_for(type(item)))(buffer, item)
+    buffer += b']'
+
+
+def _write_dict(buffer: bytearray, value: Dict) -> None:
+    buffer += b'{'
+    for index, (key, item) in enumerate(value.items()):
+        if index:
+            buffer += b','
+        buffer += _encode_str(key if isinstance(key, str) else json.dumps(key)) + b':'
+        _write(buffer, item)
+    buffer += b'}'
+
+
+def _write_str(buffer: bytearray, value: str) -> None:
+    buffer += _encode_str(value)
+
+
+def _write_int(buffer: bytearray, value: int) -> None:
+    buffer += int.__repr__(value).encode('ascii')
+
+
+def _write_float(buffer: bytearray, value: float) -> None:
+    buffer += json.dumps(value).encode('ascii')
+
+
+def _write_bool(buffer: bytearray, value: bool) -> None:
+    buffer += b'true' if value else b'false'
+
+
+def _write_none(buffer: bytearray, _value: None) -> None:
+    buffer += b'null'
+
+
+def _write_datetime(buffer: bytearray, value: datetime) -> None:
+    buffer += _encode_datetime(value, value.utcoffset())
+
+
+def _write_date(buffer: bytearray, value: date) -> None:
+    buffer += _encode_datetime(value, None)
+
+
+_WRITERS: Dict[type, Writer] = {
+    str: _write_str,
+    int: _write_int,
+    float: _write_float,
+    bool: _write_bool,
+    type(None): _write_none,
+    list: _write_list,
+    tuple: _write_list,
+    dict: _write_dict,
+    datetime: _write_datetime,
+    date: _write_date,
+}
+
+
+@cache
+def _writer_for(value_type: type) -> Writer:
+    if is_dataclass(value_type):
+        return _write_dataclass
+    for base, writer in _WRITERS.items():
+        if base is not type(None) and issubclass(value_type, base):
+            return writer
+    return _write_unsupported
+
+
+def _write_unsupported(_buffer: bytearray, value: Any) -> None:
+    raise TypeError(
+        f'Object of type {type(value).__name__} is not JSON serializable')
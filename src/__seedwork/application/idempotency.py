@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+from __seedwork.application.cache import LRUCache
+from __seedwork.application.single_flight import SingleFlight
+
+
+Output = TypeVar('Output')
+
+_MISSING = object()
+
+
+@dataclass(slots=True, frozen=True)
+class IdempotencyStore(Generic[Output]):
+    # idempotency key -> output returned by the first successful execution
+    max_size: int = 10_000
+    ttl: Optional[float] = 24 * 60 * 60  # seconds
+    _outputs: LRUCache[Hashable, Output] = field(init=False, repr=False, compare=False)
+    _flights: SingleFlight = field(
+        default_factory=SingleFlight, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, '_outputs', LRUCache(
+            max_size=self.max_size, ttl=self.ttl))
+
+    def execute(self, key: Hashable, fn: Callable[[], Output]) -> Output:
+        output = self._outputs.get(key, _MISSING)
+        if output is not _MISSING:
+            return output
+        # requests racing on the same key wait for the first one; failures are
+        # not stored, so the client can retry them
+        return self._flights.do(key, lambda: self.__execute_once(key, fn))
+
+    def __execute_once(self, key: Hashable, fn: Callable[[], Output]) -> Output:
+        # a flight for this key may have finished between the lookup and do()
+        output = self._outputs.get(key, _MISSING)
+        if output is _MISSING:
+            output = fn()
+            self._outputs.set(key, output)
+        return output
+
+    def forget(self, key: Hashable) -> None:
+        self._outputs.invalidate(key)
+
+    def __len__(self) -> int:
+        return len(self._outputs)
@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Condition, Event, Thread
+from typing import Deque, Iterable, List, Optional
+from __seedwork.domain.events import DomainEvent
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxMessage:
+    sequence: int
+    event: DomainEvent
+
+
+class OutboxInterface(ABC):
+    # written by the use cases in the same unit as the repository change (a
+    # table in the same transaction for a database backend), drained later
+
+    @abstractmethod
+    def add_all(self, events: Iterable[DomainEvent]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def fetch(self, limit: int, timeout: Optional[float] = None) -> List[OutboxMessage]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def ack(self, messages: List[OutboxMessage]) -> None:
+        raise NotImplementedError()
+
+
+class EventPublisherInterface(ABC):  # pylint: disable=too-few-public-methods
+
+    @abstractmethod
+    def publish(self, events: List[DomainEvent]) -> None:
+        raise NotImplementedError()
+
+
+@dataclass(slots=True)
+class InMemoryOutbox(OutboxInterface):
+    _messages: Deque[OutboxMessage] = field(
+        default_factory=deque, init=False, repr=False)
+    _last_sequence: int = field(default=0, init=False)
+    _condition: Condition = field(
+        default_factory=Condition, init=False, repr=False, compare=False)
+
+    def add_all(self, events: Iterable[DomainEvent]) -> None:
+        with self._condition:
+            for event in events:
+                self._last_sequence += 1
+                self._messages.append(OutboxMessage(self._last_sequence, event))
+            if self._messages:
+                self._condition.notify_all()
+
+    def fetch(self, limit: int, timeout: Optional[float] = None) -> List[OutboxMessage]:
+        # oldest messages first; they stay in the outbox until acked
+        with self._condition:
+            if timeout is not None:
+                self._condition.wait_for(lambda: self._messages, timeout)
+            return [self._messages[index]
+                    for index in range(min(limit, len(self._messages)))]
+
+    def ack(self, messages: List[OutboxMessage]) -> None:
+        if not messages:
+            return
+        last_sequence = messages[-1].sequence
+        with self._condition:
+            while self._messages and self._messages[0].sequence <= last_sequence:
+                self._messages.popleft()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+
+@dataclass(slots=True)
+class InMemoryEventPublisher(EventPublisherInterface):
+    # in-process stand-in for the message broker
+    published: List[DomainEvent] = field(default_factory=list)
+    batches: int = 0
+
+    def publish(self, events: List[DomainEvent]) -> None:
+        self.published.extend(events)
+        self.batches += 1
+
+
+@dataclass(slots=True)
+class OutboxDispatcher:
+    # drains the outbox to the publisher in batches, in a background thread;
+    # at-least-once: a batch is acked only after it was published
+    outbox: OutboxInterface
+    publisher: EventPublisherInterface
+    batch_size: int = 100
+    poll_interval: float = 0.5  # seconds waiting for new messages
+    retry_delay: float = 1.0  # seconds after a failed publish
+    last_error: Optional[Exception] = field(default=None, init=False)
+    _stopping: Event = field(default_factory=Event, init=False, repr=False)
+    _thread: Optional[Thread] = field(default=None, init=False, repr=False)
+
+    def dispatch_pending(self, timeout: Optional[float] = None) -> int:
+        dispatched = 0
+        while messages := self.outbox.fetch(
+                self.batch_size, timeout if not dispatched else None):
+            self.publisher.publish([message.event for message in messages])
+            self.outbox.ack(messages)
+            dispatched += len(messages)
+        return dispatched
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = Thread(target=self.__run, name='outbox-dispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        # the messages left are published on the next start
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.dispatch_pending(self.poll_interval)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                self.last_error = ex
+                self._stopping.wait(self.retry_delay)
@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+import inspect
+from threading import Event, Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+from __seedwork.application.use_cases import Input, Output, UseCase
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+@dataclass(slots=True)
+class _Call(Generic[Output]):
+    done: Event = field(default_factory=Event)
+    result: Optional[Output] = None
+    error: Optional[BaseException] = None
+
+
+def _key(input_param: Any) -> Optional[Hashable]:
+    # frozen Input dataclasses are hashable; anything else runs uncoalesced
+    try:
+        hash(input_param)
+    except TypeError:
+        return None
+    return input_param
+
+
+Result = TypeVar('Result')
+
+
+@dataclass(slots=True, frozen=True)
+class SingleFlight:
+    # concurrent calls with the same key share one execution of fn
+    _calls: Dict[Hashable, _Call] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _lock: Lock = field(
+        default_factory=Lock, init=False, repr=False, compare=False)
+
+    def do(self, key: Hashable, fn: Callable[[], Result]) -> Result:  # pylint: disable=invalid-name
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as ex:  # pylint: disable=broad-exception-caught
+                call.error = ex
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+@dataclass(slots=True, frozen=True)
+class SingleFlightUseCase(UseCase[Input, Output]):
+    # concurrent executions with equal inputs share one call to use_case
+    use_case: UseCase[Input, Output]
+    _flights: SingleFlight = field(
+        default_factory=SingleFlight, init=False, repr=False, compare=False)
+
+    def execute(self, input_param: Input) -> Output:
+        key = _key(input_param)
+        if key is None:
+            return self.use_case.execute(input_param)
+        return self._flights.do(key, lambda: self.use_case.execute(input_param))
+
+
+@dataclass(slots=True, frozen=True)
+class AsyncSingleFlightUseCase(Generic[Input, Output]):
+    # asyncio variant: async use cases are awaited, sync ones run in a thread
+    use_case: UseCase[Input, Output]
+    _calls: Dict[Hashable, 'asyncio.Future[Output]'] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+
+    async def execute(self, input_param: Input) -> Output:
+        # asyncio takes longer to import than the rest of the use case layer
+        import asyncio  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        key = _key(input_param)
+        if key is None:
+            return await self.__run(input_param)
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(
+                self.__run(input_param))
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # a cancelled caller must not cancel the call the others wait on
+        return await asyncio.shield(task)
+
+    async def __run(self, input_param: Input) -> Output:
+        import asyncio  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        if inspect.iscoroutinefunction(self.use_case.execute):
+            return await self.use_case.execute(input_param)
+        return await asyncio.to_thread(self.use_case.execute, input_param)
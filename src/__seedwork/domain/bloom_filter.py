@@ -0,0 +1,108 @@
+from dataclasses import dataclass, field
+from hashlib import blake2b
+import math
+from threading import Lock
+from typing import Dict, Iterator, List, Optional
+
+from __seedwork.domain.entities import UniqueEntityId
+from __seedwork.domain.exceptions import (
+    EntityValidationException, InvalidUuidException, NotFoundExeption
+)
+from __seedwork.domain.repositories import ET, RepositoryInterface
+
+
+@dataclass(slots=True)
+class BloomFilter:
+    # "not in" is always right, "in" is wrong for about error_rate of the keys
+    # never added (while no more than capacity keys were added)
+    capacity: int = 100_000
+    error_rate: float = 0.01
+    _bits: bytearray = field(init=False, repr=False)
+    _size: int = field(init=False, repr=False)
+    _hashes: int = field(init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._size = max(8, math.ceil(
+            -self.capacity * math.log(self.error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / self.capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def add(self, key: str | bytes) -> None:
+        # a lock, two unlocked |= on the same byte could lose a bit
+        with self._lock:
+            for position in self._positions(key):
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str | bytes) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(key))
+
+    def _positions(self, key: str | bytes) -> Iterator[int]:
+        # double hashing: k positions out of one 128-bit digest
+        digest = blake2b(key.encode() if isinstance(key, str) else key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + index * second) % self._size for index in range(self._hashes))
+
+
+@dataclass(slots=True)
+class BloomFilteredRepository(RepositoryInterface[ET]):
+    # fronts a repository backed by storage: an id the filter has never seen is
+    # answered as missing without a round trip; deleted ids stay in the filter
+    # and simply reach the storage
+    repository: RepositoryInterface[ET]
+    ids: BloomFilter = field(default_factory=BloomFilter)
+
+    def __post_init__(self):
+        # every stored id must be in the filter, or it would hide that entity
+        for entity in self.repository.find_all():
+            self.ids.add(entity.unique_entity_id.raw)
+
+    # the keys are added before the write: a reader reacting to it (e.g. a
+    # change feed subscriber) must find them, and a failed write only leaves
+    # a harmless extra key
+
+    def insert(self, entity: ET) -> None:
+        self.ids.add(entity.unique_entity_id.raw)
+        self.repository.insert(entity)
+
+    def bulk_insert(self, entities: List[ET]) -> None:
+        for entity in entities:
+            self.ids.add(entity.unique_entity_id.raw)
+        self.repository.bulk_insert(entities)
+
+    def bulk_insert_valid(self, entities: List[ET]) -> Dict[int, EntityValidationException]:
+        for entity in entities:
+            self.ids.add(entity.unique_entity_id.raw)
+        return self.repository.bulk_insert_valid(entities)
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        if not self._may_exist(entity_id):
+            raise NotFoundExeption(f"Entity not found using ID '{entity_id}'")
+        return self.repository.find_by_id(entity_id)
+
+    def find_all(self) -> List[ET]:
+        return self.repository.find_all()
+
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        return self._may_exist(entity_id) and self.repository.exists(entity_id)
+
+    def update(self, entity: ET, expected_version: Optional[int] = None) -> None:
+        self.repository.update(entity, expected_version)
+
+    def update_changes(self, entity: ET, expected_version: Optional[int] = None) -> bool:
+        return self.repository.update_changes(entity, expected_version)
+
+    def delete(self, entity_id: str | UniqueEntityId,
+               expected_version: Optional[int] = None) -> None:
+        self.repository.delete(entity_id, expected_version)
+
+    def _may_exist(self, entity_id: str | UniqueEntityId) -> bool:
+        if isinstance(entity_id, UniqueEntityId):
+            return entity_id.raw in self.ids
+        try:
+            return UniqueEntityId(entity_id).raw in self.ids
+        except InvalidUuidException:
+            return False
@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+from threading import Condition
+from typing import FrozenSet, Generic, List, Literal, Optional, TypeVar
+
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.exceptions import ChangeFeedGapException
+
+ET = TypeVar('ET', bound=Entity)
+
+ChangeType = Literal['insert', 'update', 'delete']
+
+
+@dataclass(slots=True, frozen=True)
+class ChangeEvent(Generic[ET]):
+    sequence: int
+    type: ChangeType
+    entity_id: str
+    version: int
+    # the entity as written, a copy taken when the event was published
+    entity: ET
+    # fields written by a partial update, None when the whole entity was
+    fields: Optional[FrozenSet[str]] = None
+
+
+@dataclass(slots=True)
+class ChangeFeed(Generic[ET]):
+    # ordered log of repository writes; only the last max_size events are kept
+    max_size: int = 10_000
+    _buffer: List[Optional[ChangeEvent[ET]]] = field(init=False, repr=False)
+    _last_sequence: int = field(default=0, init=False)
+    _condition: Condition = field(
+        default_factory=Condition, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._buffer = [None] * self.max_size
+
+    @property
+    def last_sequence(self) -> int:
+        return self._last_sequence
+
+    @property
+    def first_sequence(self) -> int:
+        # oldest sequence still held; last_sequence + 1 when the feed is empty
+        return max(1, self._last_sequence - self.max_size + 1) \
+            if self._last_sequence else 1
+
+    def publish(self, change_type: ChangeType, entity: ET,
+                fields: Optional[FrozenSet[str]] = None) -> ChangeEvent[ET]:
+        with self._condition:
+            sequence = self._last_sequence + 1
+            event = ChangeEvent(
+                sequence=sequence, type=change_type, entity_id=entity.id,
+                version=entity.version, entity=_snapshot(entity), fields=fields)
+            self._buffer[sequence % self.max_size] = event
+            self._last_sequence = sequence
+            self._condition.notify_all()
+        return event
+
+    def read(self, after: int = 0, limit: Optional[int] = None,
+             timeout: Optional[float] = None) -> List[ChangeEvent[ET]]:
+        # events with sequence > after; waits up to timeout when there are none
+        with self._condition:
+            if timeout is not None and after >= self._last_sequence:
+                self._condition.wait_for(
+                    lambda: after < self._last_sequence, timeout)
+            start = max(after, 0) + 1
+            if start < self.first_sequence:
+                raise ChangeFeedGapException(
+                    f"Events after sequence {after} were dropped, "
+                    f"the oldest one kept is {self.first_sequence}")
+            stop = self._last_sequence + 1
+            if limit is not None:
+                stop = min(stop, start + limit)
+            return [self._buffer[sequence % self.max_size]
+                    for sequence in range(start, stop)]
+
+    def subscribe(self, after: Optional[int] = None) -> 'ChangeFeedSubscription[ET]':
+        # from the current end of the feed unless a sequence to resume from is given
+        return ChangeFeedSubscription(
+            self, self._last_sequence if after is None else after)
+
+
+def _snapshot(entity: ET) -> ET:
+    # stored entities may be changed in place by later writes, which would
+    # otherwise rewrite the events already published
+    snapshot = entity.copy().mark_clean()
+    snapshot.pull_events()
+    return snapshot
+
+
+@dataclass(slots=True)
+class ChangeFeedSubscription(Generic[ET]):
+    feed: ChangeFeed[ET]
+    # last sequence consumed, persist it to resume after a restart
+    position: int = 0
+
+    def poll(self, limit: Optional[int] = None,
+             timeout: Optional[float] = None) -> List[ChangeEvent[ET]]:
+        events = self.feed.read(self.position, limit, timeout)
+        if events:
+            self.position = events[-1].sequence
+        return events
@@ -0,0 +1,43 @@
+from dataclasses import dataclass, field
+from threading import Event, Thread
+from typing import Optional
+
+from __seedwork.domain.repositories import InMemoryRepository
+
+
+@dataclass(slots=True)
+class TombstoneCompactor:
+    # compacts a soft deleting repository in a background thread once enough
+    # tombstones piled up, so each compaction pass over items drops a batch
+    repository: InMemoryRepository
+    threshold: int = 1000
+    poll_interval: float = 1.0  # seconds between checks
+    last_error: Optional[Exception] = field(default=None, init=False)
+    _stopping: Event = field(default_factory=Event, init=False, repr=False)
+    _thread: Optional[Thread] = field(default=None, init=False, repr=False)
+
+    def compact_pending(self) -> int:
+        if self.repository.tombstone_count < self.threshold:
+            return 0
+        return self.repository.compact()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = Thread(target=self.__run, name='tombstone-compactor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        # the tombstones left are compacted on the next start
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __run(self) -> None:
+        while not self._stopping.wait(self.poll_interval):
+            try:
+                self.compact_pending()
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                self.last_error = ex
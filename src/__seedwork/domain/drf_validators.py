@@ -0,0 +1,127 @@
+import contextlib
+from abc import ABC
+from functools import cache
+from typing import Any, Callable, Dict, List, Optional, Set, Type
+from rest_framework.serializers import ListSerializer, Serializer
+from rest_framework.fields import (
+    CharField,
+    BooleanField,
+    Field,
+    ProhibitNullCharactersValidator,
+    ProhibitSurrogateCharactersValidator
+)
+from django.core.validators import MaxLengthValidator, MinLengthValidator
+from django.conf import settings
+from .validators import ErrorFields, PropsValidated, ValidatorFieldsInterface
+
+if not settings.configured:
+    settings.configure(USE_I18N=False)
+
+
+class DRFValidator(ValidatorFieldsInterface[PropsValidated], ABC):  # pylint: disable=too-few-public-methods
+
+    def validate(self, data: Serializer) -> bool:
+        serializer = data
+        if serializer.is_valid():
+            self.validate_data = dict(serializer.validated_data)
+            return True
+        self.errors = self._to_error_fields(serializer.errors)
+        return False
+
+    def validate_many(self, data: ListSerializer) -> List[Optional[ErrorFields]]:
+        # one serializer pass for the whole chunk; None marks a valid item
+        serializer = data
+        items_count = len(serializer.initial_data)
+        if serializer.is_valid():
+            return [None] * items_count
+        errors_list = serializer.errors
+        if isinstance(errors_list, dict):
+            # newer DRF versions map item index -> errors
+            errors_list = [errors_list.get(index) for index in range(items_count)]
+        return [self._to_error_fields(errors) if errors else None for errors in errors_list]
+
+    @staticmethod
+    def _to_error_fields(errors: Dict) -> ErrorFields:
+        return {field: [str(error) for error in field_errors]
+                for field, field_errors in errors.items()}
+
+
+class StrictCharField(CharField):
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        return super().to_internal_value(data)
+
+
+class StrictBooleanField(BooleanField):
+
+    def to_internal_value(self, data):  # pylint: disable=inconsistent-return-statements
+        with contextlib.suppress(TypeError):
+            if data is True:
+                return True
+            if data is False:
+                return False
+            if data is None and self.allow_null:
+                return None
+        self.fail('invalid', input=data)
+
+
+# the validators a char field may carry and still be checked in pure Python
+_PLAIN_CHAR_VALIDATORS = (
+    MaxLengthValidator, MinLengthValidator,
+    ProhibitNullCharactersValidator, ProhibitSurrogateCharactersValidator
+)
+
+
+@cache
+def plain_validity_check(rules_class: Type[Serializer]) -> Callable[[Dict], bool]:
+    # a pure Python check derived from the serializer fields, True only for
+    # items the serializer accepts for sure: anything unusual (non-ascii text,
+    # fields with other types or validators, unknown keys...) gets False, and
+    # is left to the serializer, which also builds the error messages
+    checks: Dict[str, Callable[[Any], bool]] = {}
+    required: Set[str] = set()
+    for name, rules_field in rules_class().fields.items():
+        check = _plain_field_check(rules_field)
+        if check is None:
+            if rules_field.required:
+                return lambda item: False
+            continue
+        checks[name] = check
+        if rules_field.required:
+            required.add(name)
+
+    names = frozenset(checks)
+
+    def is_plainly_valid(item: Dict) -> bool:
+        # a loop, not all() over a generator: this runs once per item of a batch
+        if not names >= item.keys() >= required:
+            return False
+        for name, value in item.items():
+            if not checks[name](value):
+                return False
+        return True
+    return is_plainly_valid
+
+
+def _plain_field_check(rules_field: Field) -> Optional[Callable[[Any], bool]]:
+    allow_null = rules_field.allow_null
+    if isinstance(rules_field, BooleanField) and not rules_field.validators:
+        return lambda value: isinstance(value, bool) or (allow_null and value is None)
+    if not isinstance(rules_field, CharField) or not all(
+            isinstance(validator, _PLAIN_CHAR_VALIDATORS)
+            for validator in rules_field.validators):
+        return None
+    allow_blank, trim = rules_field.allow_blank, rules_field.trim_whitespace
+    min_length, max_length = rules_field.min_length or 0, rules_field.max_length
+
+    def check(value: Any) -> bool:
+        if value is None:
+            return allow_null
+        if not isinstance(value, str) or not value.isascii() or '\x00' in value:
+            return False
+        text = value.strip() if trim else value
+        return (allow_blank or text != '') and len(text) >= min_length \
+            and (max_length is None or len(text) <= max_length)
+    return check
@@ -1,28 +1,133 @@
 from abc import ABC
-from dataclasses import Field, asdict, dataclass, field
-from typing import Any
+from dataclasses import MISSING, Field, dataclass, field, fields
+from functools import cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from __seedwork.domain.events import DomainEvent
+from __seedwork.domain.exceptions import VersionConflictException
 from __seedwork.domain.value_objects import UniqueEntityId
 
 
+@cache
+def _props_name(cls: type) -> Tuple[str, ...]:
+    return tuple(
+        entity_field.name for entity_field in fields(cls)
+        if entity_field.name not in ('unique_entity_id', 'version')
+        and not entity_field.name.startswith('_')
+    )
+
+
+@cache
+def _restore_plan(cls: type) -> Tuple[Tuple[str, Any, Any], ...]:
+    return tuple(
+        (entity_field.name, entity_field.default, entity_field.default_factory)
+        for entity_field in fields(cls)
+    )
+
+
+def _same_value(value: Any, other: Any) -> bool:
+    # True == 1, so the type must match too for the value to count as unchanged
+    return value is other or (type(value) is type(other) and value == other)
+
+
 @dataclass(frozen=True, slots=True)
 class Entity(ABC):
     unique_entity_id: UniqueEntityId = field(
         default_factory=UniqueEntityId)
+    # optimistic concurrency: bumped by the repository on every write
+    version: int = field(default=1, kw_only=True)
+    # field name -> value it had when the entity was loaded (or last persisted)
+    _changes: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False)
+    # recorded by domain operations, pulled by the use case into the outbox
+    _events: Optional[List[DomainEvent]] = field(
+        default=None, init=False, repr=False, compare=False)
 
     @property
     def id(self):  # pylint: disable=invalid-name
-        return str(self.unique_entity_id)
+        return self.unique_entity_id.id
+
+    @property
+    def dirty_fields(self) -> FrozenSet[str]:
+        return frozenset(self._changes) if self._changes else frozenset()
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._changes)
+
+    def check_version(self, expected_version: Optional[int]):
+        if expected_version is not None and expected_version != self.version:
+            raise VersionConflictException(
+                f"Entity '{self.id}' has version {self.version}, expected {expected_version}")
+        return self
+
+    @property
+    def events(self) -> Tuple[DomainEvent, ...]:
+        return tuple(self._events) if self._events else ()
+
+    def record_event(self, event: DomainEvent):
+        if self._events is None:
+            object.__setattr__(self, '_events', [])
+        self._events.append(event)
+        return self
+
+    def pull_events(self) -> List[DomainEvent]:
+        events = self._events or []
+        object.__setattr__(self, '_events', None)
+        return events
+
+    def mark_clean(self):
+        object.__setattr__(self, '_changes', None)
+        return self
 
     def to_dict(self):
-        entity_dict = asdict(self)
-        entity_dict.pop('unique_entity_id')
+        entity_dict = {name: getattr(self, name)
+                       for name in _props_name(type(self))}
         entity_dict['id'] = self.id
         return entity_dict
 
     def _set(self, name: str, value: Any):
+        current = getattr(self, name)
+        changes = self._changes
+        if changes and name in changes:
+            if _same_value(changes[name], value):
+                del changes[name]
+        elif not _same_value(current, value):
+            if changes is None:
+                changes = {}
+                object.__setattr__(self, '_changes', changes)
+            changes[name] = current
         object.__setattr__(self, name, value)
         return self
 
+    def copy(self):
+        # a detached copy to change: the repository write that persists it
+        # checks the version, so concurrent writers can't overwrite each other
+        entity = object.__new__(type(self))
+        for name, _, _ in _restore_plan(type(self)):
+            object.__setattr__(entity, name, getattr(self, name))
+        if self._changes:
+            object.__setattr__(entity, '_changes', dict(self._changes))
+        if self._events:
+            object.__setattr__(entity, '_events', list(self._events))
+        return entity
+
+    @classmethod
+    def restore(cls, **props):
+        # builds the entity from props that were already validated (in bulk or
+        # by the storage), so __post_init__ and its validation are skipped
+        entity = object.__new__(cls)
+        for name, default, default_factory in _restore_plan(cls):
+            if name in props:
+                value = props[name]
+            elif default_factory is not MISSING:
+                value = default_factory()
+            elif default is not MISSING:
+                value = default
+            else:
+                raise TypeError(f"{cls.__name__}.restore() missing prop '{name}'")
+            object.__setattr__(entity, name, value)
+        return entity
+
     @classmethod
     def get_field(cls, entity_field: str) -> Field:
         # pylint: disable=no-member
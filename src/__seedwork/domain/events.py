@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DomainEvent:
+    entity_id: str
+    occurred_on: datetime = field(default_factory=datetime.now)
+
+    @property
+    def event_type(self) -> str:
+        return type(self).__name__
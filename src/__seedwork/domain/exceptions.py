@@ -24,3 +24,11 @@ class EntityValidationException(Exception):
 
 class NotFoundExeption(Exception):
     pass
+
+
+class VersionConflictException(Exception):
+    pass
+
+
+class ChangeFeedGapException(Exception):
+    pass
@@ -1,10 +1,24 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from functools import lru_cache
 import math
-from typing import Any, Generic, List, TypeVar, Optional
-
-from __seedwork.domain.entities import Entity, UniqueEntityId
-from __seedwork.domain.exceptions import NotFoundExeption
+from operator import attrgetter
+from threading import RLock
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Generic, Iterable, Iterator, List, Tuple, Type,
+    TypeVar, Optional
+)
+
+from __seedwork.domain.entities import Entity, UniqueEntityId, _same_value
+from __seedwork.domain.exceptions import (
+    EntityValidationException, InvalidUuidException, NotFoundExeption, VersionConflictException
+)
+from __seedwork.domain.specification import Specification
+
+if TYPE_CHECKING:
+    from __seedwork.domain.change_feed import ChangeFeed
 
 ET = TypeVar('ET', bound=Entity)
 
@@ -15,6 +29,22 @@ class RepositoryInterface(Generic[ET], ABC):
     def insert(self, entity: ET) -> None:
         raise NotImplementedError()
 
+    def bulk_insert(self, entities: List[ET]) -> None:
+        # backends with a multi-row insert should override it
+        for entity in entities:
+            self.insert(entity)
+
+    def bulk_insert_valid(self, entities: List[ET]) -> Dict[int, EntityValidationException]:
+        # inserts the entities no constraint of the backend (e.g. a unique
+        # field) rejects; the errors of the others are returned by their index
+        rejected = {}
+        for index, entity in enumerate(entities):
+            try:
+                self.insert(entity)
+            except EntityValidationException as ex:
+                rejected[index] = ex
+        return rejected
+
     @abstractmethod
     def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
         raise NotImplementedError()
@@ -23,14 +53,41 @@ class RepositoryInterface(Generic[ET], ABC):
     def find_all(self) -> List[ET]:
         raise NotImplementedError()
 
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        # backends should override it with a lookup that loads nothing
+        try:
+            self.find_by_id(entity_id)
+            return True
+        except NotFoundExeption:
+            return False
+
+    # update/delete compare the stored version with expected_version (update
+    # falls back to entity.version), raise VersionConflictException when they
+    # differ and bump the version, all as one atomic step
+
     @abstractmethod
-    def update(self, entity: ET) -> None:
+    def update(self, entity: ET, expected_version: Optional[int] = None) -> None:
         raise NotImplementedError()
 
     @abstractmethod
-    def delete(self, entity_id: str | UniqueEntityId) -> None:
+    def delete(self, entity_id: str | UniqueEntityId,
+               expected_version: Optional[int] = None) -> None:
         raise NotImplementedError()
 
+    def update_changes(self, entity: ET, expected_version: Optional[int] = None) -> bool:
+        # writes only the dirty fields; nothing is written for a clean entity
+        if not entity.is_dirty:
+            return False
+        self._update_fields(entity, entity.dirty_fields, expected_version)
+        entity.mark_clean()
+        return True
+
+    def _update_fields(self, entity: ET, fields: FrozenSet[str],
+                       expected_version: Optional[int] = None) -> None:
+        # pylint: disable=unused-argument
+        # backends able to write single columns should override it
+        self.update(entity, expected_version)
+
 
 Input = TypeVar('Input')
 Output = TypeVar('Output')
@@ -38,15 +95,74 @@ Output = TypeVar('Output')
 
 class SearchableRepositoryInterface(Generic[ET, Input, Output], RepositoryInterface[ET], ABC):
     sortable_fields: List[str] = []
+    facetable_fields: List[str] = []
 
     @abstractmethod
     def search(self, input_params: Input) -> Output:
         raise NotImplementedError()
 
+    def search_stream(self, input_params: Input) -> Iterator[List[ET]]:
+        # yields every page from input_params.page on, per_page items at a time;
+        # backends able to run the query once (a cursor) should override it
+        page = input_params.page
+        while True:
+            result = self.search(replace(input_params, page=page))
+            if result.items:
+                yield result.items
+            if page >= result.last_page:
+                return
+            page += 1
+
+    # the *_where operations act on every entity matching input_params.filter,
+    # page and sort are ignored; they return the entities written, as written.
+    # Backends should override them with a single DELETE/UPDATE ... WHERE
+    # (... RETURNING)
+
+    def delete_where(self, input_params: Input) -> List[ET]:
+        matches = [entity for items in self.search_stream(replace(input_params, page=1))
+                   for entity in items]
+        for entity in matches:
+            self.delete(entity.unique_entity_id)
+        return matches
+
+    def update_where(self, input_params: Input, changes: Dict[str, Any]) -> List[ET]:
+        # changes are raw field values, no domain method (or validation) runs;
+        # entities already holding them are not written nor returned
+        matches = [entity for items in self.search_stream(replace(input_params, page=1))
+                   for entity in items]
+        updated = []
+        for entity in matches:
+            for name, value in changes.items():
+                entity._set(name, value)  # pylint: disable=protected-access
+            if self.update_changes(entity):
+                updated.append(entity)
+        return updated
+
 
 Filter = TypeVar('Filter', str, Any)
 
 
+# (field, 'asc' | 'desc')
+SortField = Tuple[str, str]
+
+
+@lru_cache(maxsize=256)
+def parse_sort(sort: Optional[str], sort_dir: Optional[str] = None) -> Tuple[SortField, ...]:
+    # 'name,-created_at': '-' sorts a field descending, '+' ascending and a
+    # bare field follows sort_dir
+    default_dir = 'desc' if sort_dir == 'desc' else 'asc'
+    sort_fields = {}
+    for token in (sort or '').split(','):
+        token = token.strip()
+        if token[:1] in ('-', '+'):
+            name, direction = token[1:].strip(), 'desc' if token[0] == '-' else 'asc'
+        else:
+            name, direction = token, default_dir
+        if name:
+            sort_fields.setdefault(name, direction)
+    return tuple(sort_fields.items())
+
+
 @dataclass(slots=True, kw_only=True)
 class SearchParams:
     page: Optional[int] = 1
@@ -54,6 +170,8 @@ class SearchParams:
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    # facets counted over every filtered item, e.g. ('is_active',)
+    facets: Optional[Tuple[str, ...]] = None
 
     def __post_init__(self):
         self._normalize_page()
@@ -61,6 +179,12 @@ class SearchParams:
         self._normalize_sort()
         self._normalize_sort_dir()
         self._normalize_filter()
+        self._normalize_facets()
+
+    @property
+    def sort_fields(self) -> Tuple[SortField, ...]:
+        # the sort as an ordered spec a backend can turn into its ORDER BY
+        return parse_sort(self.sort, self.sort_dir)
 
     def _normalize_page(self):
         page = self._convert_to_int(self.page)
@@ -86,9 +210,18 @@ class SearchParams:
         self.sort_dir = 'asc' if sort_dir not in ('asc', 'desc') else sort_dir
 
     def _normalize_filter(self):
+        if isinstance(self.filter, Specification):
+            return
         self.filter = None if self.filter == '' or self.filter is None \
             else str(self.filter)
 
+    def _normalize_facets(self):
+        facets: Iterable = self.facets or ()
+        if isinstance(facets, str):
+            facets = facets.split(',')
+        names = (str(name).strip() for name in facets)
+        self.facets = tuple(dict.fromkeys(name for name in names if name)) or None
+
     def _convert_to_int(self, value: Any, default=0) -> int:
         try:
             return int(value)
@@ -110,6 +243,8 @@ class SearchResult(Generic[ET, Filter]):  # pylint: disable=too-many-instance-at
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    # facet -> value -> items with it, for the facets requested
+    facets: Optional[Dict[str, Dict[Any, int]]] = None
 
     def __post_init__(self):
         object.__setattr__(self, 'last_page',
@@ -124,36 +259,386 @@ class SearchResult(Generic[ET, Filter]):  # pylint: disable=too-many-instance-at
             'last_page': self.last_page,
             'sort': self.sort,
             'sort_dir': self.sort_dir,
-            'filter': self.filter
+            'filter': self.filter,
+            'facets': self.facets
         }
 
 
+class InMemoryIndex(Generic[ET], ABC):
+    # kept in step with InMemoryRepository.items by the repository writes;
+    # entries are keyed by entity id because stored entities may be changed in
+    # place before the write that persists them reaches the index. When items
+    # holds an id twice, only the entity the repository resolves it to is indexed
+
+    @abstractmethod
+    def add(self, entity: ET) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def discard(self, entity: ET) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError()
+
+    def add_many(self, entities: Iterable[ET]) -> None:
+        # indexes with a cheaper bulk load (e.g. one sort) should override it
+        for entity in entities:
+            self.add(entity)
+
+    def rebuild(self, items: Iterable[ET]) -> None:
+        self.clear()
+        self.add_many(items)
+
+    def lookup(self, spec: Specification) -> Optional[List[ET]]:
+        # the entities that may satisfy spec (a superset is fine, the caller
+        # checks them all), or None when this index can't narrow it
+        # pylint: disable=unused-argument
+        return None
+
+
+IndexT = TypeVar('IndexT', bound=InMemoryIndex)
+
+
+@dataclass(slots=True, frozen=True)
+class Tombstone(Generic[ET]):
+    # a soft deleted entity, kept until the repository is compacted
+    entity: ET
+    deleted_at: datetime
+
+
 @dataclass(slots=True)
-class InMemoryRepository(RepositoryInterface[ET], ABC):
+class InMemoryRepository(RepositoryInterface[ET], ABC):  # pylint: disable=too-many-instance-attributes
     items: List[ET] = field(default_factory=lambda: [])
+    # guards the version check-and-write, the index rebuilds and the index
+    # lookups that iterate; the other reads only take it for a rebuild
+    _write_lock: RLock = field(
+        default_factory=RLock, init=False, repr=False, compare=False)
+    _indexes: Optional[Tuple[InMemoryIndex[ET], ...]] = field(
+        default=None, init=False, repr=False, compare=False)
+    # the list (and its size) the indexes were built from; assigning or growing
+    # items directly makes the indexes rebuild on the next access
+    _indexed_items: Optional[List[ET]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _indexed_size: int = field(default=0, init=False, repr=False, compare=False)
+    # raw id -> stored entity, synced like the indexes
+    _ids: Dict[bytes, ET] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # every successful write is published here, in write order
+    change_feed: Optional['ChangeFeed[ET]'] = field(
+        default=None, kw_only=True, repr=False, compare=False)
+    # delete leaves a tombstone: the entity drops out of the id map and the
+    # indexes at once, and out of items when the repository is compacted
+    soft_delete: bool = field(default=False, kw_only=True, compare=False)
+    # stored row (its id()) -> tombstone of the deleted entity still in items;
+    # an id inserted again and deleted again has a tombstone per row
+    _tombstones: Dict[int, Tombstone[ET]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    # the rows of items not tombstoned, by id(), in items order: built on the
+    # first soft delete, then kept in step by every write
+    _live: Optional[Dict[int, ET]] = field(
+        default=None, init=False, repr=False, compare=False)
+    # _live as a list for the scans, dropped when a row joins or leaves _live
+    _live_list: Optional[List[ET]] = field(
+        default=None, init=False, repr=False, compare=False)
 
     def insert(self, entity: ET) -> None:
-        self.items.append(entity)
+        with self._write_lock:
+            indexes = self._synced_indexes()
+            self._check_write((entity,))
+            self.items.append(entity)
+            self._indexed_size += 1
+            self._add_live((entity,))
+            if self._ids.setdefault(entity.unique_entity_id.raw, entity) is entity:
+                for index in indexes:
+                    index.add(entity)
+            self._publish('insert', entity)
+        entity.mark_clean()
+
+    def bulk_insert(self, entities: List[ET]) -> None:
+        with self._write_lock:
+            self._check_write(entities)
+            self._insert_many(entities)
+        for entity in entities:
+            entity.mark_clean()
+
+    def bulk_insert_valid(self, entities: List[ET]) -> Dict[int, EntityValidationException]:
+        # one write, as bulk_insert
+        with self._write_lock:
+            rejected = self._write_conflicts(entities)
+            if rejected:
+                entities = [entity for index, entity in enumerate(entities)
+                            if index not in rejected]
+            self._insert_many(entities)
+        for entity in entities:
+            entity.mark_clean()
+        return rejected
+
+    def _insert_many(self, entities: List[ET]) -> None:
+        # under the write lock, the entities already checked
+        indexes = self._synced_indexes()
+        self.items.extend(entities)
+        self._indexed_size += len(entities)
+        self._add_live(entities)
+        ids = self._ids
+        indexed = [entity for entity in entities
+                   if ids.setdefault(entity.unique_entity_id.raw, entity) is entity]
+        for index in indexes:
+            index.add_many(indexed)
+        for entity in entities:
+            self._publish('insert', entity)
 
     def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
-        return self._get(str(entity_id))
+        return self._get(entity_id)
 
     def find_all(self) -> List[ET]:
-        return self.items
+        return self._live_items()
+
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        raw = self._to_raw_id(entity_id)
+        self._synced_indexes()
+        return raw is not None and raw in self._ids
+
+    def update(self, entity: ET, expected_version: Optional[int] = None) -> None:
+        with self._write_lock:
+            indexes = self._synced_indexes()
+            entity_found = self._get(entity.unique_entity_id)
+            entity_found.check_version(
+                entity.version if expected_version is None else expected_version)
+            self._check_write((entity,))
+            position = self._position(entity_found)
+            self.items[position] = entity
+            if self._live is not None:
+                # O(n) as the search above, the row keeps its place
+                self._rebuild_live()
+            self._ids[entity.unique_entity_id.raw] = entity
+            object.__setattr__(entity, 'version', entity_found.version + 1)
+            for index in indexes:
+                index.discard(entity_found)
+                index.add(entity)
+            self._publish('update', entity)
+        entity.mark_clean()
+
+    def delete(self, entity_id: str | UniqueEntityId,
+               expected_version: Optional[int] = None) -> None:
+        with self._write_lock:
+            indexes = self._synced_indexes()
+            entity_found = self._get(entity_id)
+            entity_found.check_version(expected_version)
+            if self.soft_delete:
+                self._bury(entity_found, indexes, datetime.now())
+                self._publish('delete', entity_found)
+                return
+            del self.items[self._position(entity_found)]
+            self._indexed_size -= 1
+            self._discard_live((entity_found,))
+            del self._ids[entity_found.unique_entity_id.raw]
+            for index in indexes:
+                index.discard(entity_found)
+            self._publish('delete', entity_found)
+
+    def _update_fields(self, entity: ET, fields: FrozenSet[str],
+                       expected_version: Optional[int] = None) -> None:
+        with self._write_lock:
+            indexes = self._synced_indexes()
+            entity_found = self._get(entity.unique_entity_id)
+            entity_found.check_version(
+                entity.version if expected_version is None else expected_version)
+            changes = {name: getattr(entity, name) for name in fields}
+            self._check_write((entity_found,), changes)
+            for name, value in changes.items():
+                object.__setattr__(entity_found, name, value)
+            version = entity_found.version + 1
+            object.__setattr__(entity_found, 'version', version)
+            object.__setattr__(entity, 'version', version)
+            for index in indexes:
+                index.discard(entity_found)
+                index.add(entity_found)
+            self._publish('update', entity_found, fields)
+        entity_found.mark_clean()
+
+    @property
+    def tombstone_count(self) -> int:
+        return len(self._tombstones)
+
+    def tombstones(self) -> List[Tombstone[ET]]:
+        # the soft deleted entities not compacted yet, in delete order
+        return list(self._tombstones.values())
+
+    def restore(self, entity_id: str | UniqueEntityId) -> ET:
+        # undoes a soft delete, until the repository is compacted
+        with self._write_lock:
+            indexes = self._synced_indexes()
+            raw = self._to_raw_id(entity_id)
+            # the latest tombstone of the id; a walk, restores are rare
+            row = next((row for row, tombstone in reversed(self._tombstones.items())
+                        if tombstone.entity.unique_entity_id.raw == raw), None)
+            if row is None:
+                raise NotFoundExeption(f"Deleted entity not found using ID '{entity_id}'")
+            if raw in self._ids:
+                raise VersionConflictException(
+                    f"Entity '{entity_id}' was inserted again after it was deleted")
+            entity = self._tombstones[row].entity
+            self._check_write((entity,))
+            del self._tombstones[row]
+            # back in its place among the rows
+            self._rebuild_live()
+            self._ids[raw] = entity
+            for index in indexes:
+                index.add(entity)
+            self._publish('insert', entity)
+            return entity
 
-    def update(self, entity: ET) -> None:
-        entity_found = self._get(entity.id)
-        index = self.items.index(entity_found)
-        self.items[index] = entity
+    def compact(self) -> int:
+        # one pass over items drops every tombstoned entity
+        with self._write_lock:
+            self._synced_indexes()
+            if not self._tombstones:
+                return 0
+            self.items[:] = self._live_items()
+            self._indexed_size = len(self.items)
+            compacted = len(self._tombstones)
+            # _live still holds every row of items
+            self._tombstones.clear()
+            self._live_list = None
+            return compacted
+
+    def _bury(self, entity: ET, indexes: Tuple[InMemoryIndex[ET], ...],
+              deleted_at: datetime) -> None:
+        # O(1) besides the indexes, items is only touched by compact
+        del self._ids[entity.unique_entity_id.raw]
+        for index in indexes:
+            index.discard(entity)
+        if self._live is None:
+            self._rebuild_live()
+        self._tombstones[id(entity)] = Tombstone(entity=entity, deleted_at=deleted_at)
+        self._discard_live((entity,))
+
+    def _position(self, entity: ET) -> int:
+        # by identity: an equal row may be tombstoned, or another copy of the id
+        return next(position for position, item in enumerate(self.items) if item is entity)
+
+    def _add_live(self, entities: Iterable[ET]) -> None:
+        if self._live is not None:
+            self._live.update((id(entity), entity) for entity in entities)
+            self._live_list = None
+
+    def _discard_live(self, entities: Iterable[ET]) -> None:
+        if self._live is not None:
+            for entity in entities:
+                self._live.pop(id(entity), None)
+            self._live_list = None
+
+    def _rebuild_live(self) -> None:
+        tombstones = self._tombstones
+        self._live = {id(item): item for item in self.items if id(item) not in tombstones}
+        self._live_list = None
+
+    def _live_items(self) -> List[ET]:
+        self._synced_indexes()
+        if not self._tombstones:
+            return self.items
+        live = self._live_list
+        if live is None:
+            with self._write_lock:
+                # under the lock, a write could otherwise leave a stale list cached
+                live = self._live_list = list(self._live.values())
+        return live
+
+    def _check_write(self, entities: Iterable[ET],
+                     changes: Optional[Dict[str, Any]] = None) -> None:
+        # called under the write lock before entities are stored, or before the
+        # stored entities get the values in changes
+        for error in self._write_conflicts(entities, changes).values():
+            raise error
+
+    def _write_conflicts(self, entities: Iterable[ET],
+                         changes: Optional[Dict[str, Any]] = None) \
+            -> Dict[int, EntityValidationException]:
+        # subclasses enforce their constraints here (e.g. unique fields): the
+        # index in entities -> error, for each entity breaking one
+        # pylint: disable=unused-argument
+        return {}
+
+    def _publish(self, change_type: str, entity: ET,
+                 fields: Optional[FrozenSet[str]] = None) -> None:
+        if self.change_feed is not None:
+            self.change_feed.publish(change_type, entity, fields)
+
+    def _create_indexes(self) -> Tuple[InMemoryIndex[ET], ...]:
+        # subclasses return the indexes they want maintained
+        return ()
+
+    def _get_index(self, index_type: Type[IndexT]) -> IndexT:
+        return next(index for index in self._synced_indexes()
+                    if isinstance(index, index_type))
+
+    def _synced_indexes(self) -> Tuple[InMemoryIndex[ET], ...]:
+        # checked first without the lock, so reads don't contend with the
+        # writers while the indexes are in sync; a write updates the size
+        # under the lock, and a stale view only sends the read to the lock
+        indexes = self._indexes
+        if indexes is not None and self._indexed_items is self.items \
+                and self._indexed_size == len(self.items):
+            return indexes
+        with self._write_lock:
+            if self._indexes is None:
+                self._indexes = self._create_indexes()
+            if self._indexed_items is not self.items or self._indexed_size != len(self.items):
+                if self._indexed_items is not self.items:
+                    # the tombstones were of the entities in the replaced list
+                    self._tombstones.clear()
+                    self._live = self._live_list = None
+                elif self._live is not None:
+                    self._rebuild_live()
+                live = list(self._live.values()) if self._tombstones else self.items
+                # reversed, so the first of duplicated ids wins, as in a scan
+                self._ids = {item.unique_entity_id.raw: item for item in reversed(live)}
+                indexed = self._indexed_entities(live)
+                for index in self._indexes:
+                    index.rebuild(indexed)
+                self._indexed_items = self.items
+                self._indexed_size = len(self.items)
+            return self._indexes
+
+    def _indexed_entities(self, items: List[ET]) -> List[ET]:
+        # the indexes hold one entity per id, the one the id map resolves it to
+        ids = self._ids
+        if len(ids) == len(items):
+            return items
+        return [item for item in items if ids.get(item.unique_entity_id.raw) is item]
+
+    def _get(self, entity_id: str | UniqueEntityId) -> ET:
+        if raw := self._to_raw_id(entity_id):
+            self._synced_indexes()
+            if (entity := self._ids.get(raw)) is not None:
+                return entity
+        raise NotFoundExeption(f"Entity not found using ID '{entity_id}'")
 
-    def delete(self, entity_id: str | UniqueEntityId) -> None:
-        entity_found = self._get(str(entity_id))
-        self.items.remove(entity_found)
+    @staticmethod
+    def _to_raw_id(entity_id: str | UniqueEntityId) -> Optional[bytes]:
+        if isinstance(entity_id, UniqueEntityId):
+            return entity_id.raw
+        try:
+            return UniqueEntityId(entity_id).raw
+        except InvalidUuidException:
+            return None
 
-    def _get(self, entity_id: str) -> ET:
-        if entity := next(filter(lambda item: item.id == entity_id, self.items), None):
-            return entity
-        raise NotFoundExeption(f"Entity not found using ID '{entity_id}'")
+
+def _rebuild_is_cheaper(changed: int, size: int) -> bool:
+    # past about a quarter of the items, rebuilding the indexes once beats
+    # discarding (and re-adding) every changed entity
+    return changed * 4 > size
+
+
+def _sort(items: List[ET], sort_fields: Tuple[SortField, ...],
+          sort_key: Callable[[str], Callable[[ET], Any]] = attrgetter) -> List[ET]:
+    # stable passes from the last field to the first, each one keyed by a C
+    # attrgetter; in CPython this beats a single sort on composite tuple keys
+    items = list(items)
+    for name, direction in reversed(sort_fields):
+        items.sort(key=sort_key(name), reverse=direction == 'desc')
+    return items
 
 
 class InMemorySearchRepository(
@@ -166,32 +651,156 @@ class InMemorySearchRepository(
     ABC
 ):
     def search(self, input_params: SearchParams) -> SearchResult[ET, Filter]:
-        items_filtered = self._apply_filter(self.items, input_params.filter)
-        items_sorted = self._apply_sort(
-            items_filtered, input_params.sort, input_params.sort_dir)
+        items_sorted = self._apply_search(input_params)
         items_paginated = self._apply_paginate(
             items_sorted, input_params.page, input_params.per_page)
 
         return SearchResult(
             items=items_paginated,
-            total=len(items_filtered),
+            total=len(items_sorted),
             current_page=input_params.page,
             per_page=input_params.per_page,
             sort=input_params.sort,
             sort_dir=input_params.sort_dir,
-            filter=input_params.filter
+            filter=input_params.filter,
+            facets=self._apply_facets(items_sorted, input_params)
         )
 
+    def search_stream(self, input_params: SearchParams) -> Iterator[List[ET]]:
+        # filters and sorts once, then slices lazily: O(n log n) for a full export
+        # instead of re-running the plan for every page
+        items = self._apply_search(input_params)
+        if items is self.items:
+            # snapshot, so writes during the export do not shift the chunks
+            items = list(items)
+        per_page = input_params.per_page
+        for start in range((input_params.page - 1) * per_page, len(items), per_page):
+            yield items[start:start + per_page]
+
+    def _apply_facets(self, items: List[ET],
+                      input_params: SearchParams) -> Optional[Dict[str, Dict[Any, int]]]:
+        # counted on the items the search already filtered, no second search;
+        # facets that are not facetable are ignored
+        facets = [name for name in input_params.facets or () if name in self.facetable_fields]
+        if not facets:
+            return None
+        return {name: dict(Counter(map(self._facet_key(name), items))) for name in facets}
+
+    def _facet_key(self, facet: str) -> Callable[[ET], Any]:
+        return attrgetter(facet)
+
+    def delete_where(self, input_params: SearchParams) -> List[ET]:
+        # one pass over items, whatever the number of matches
+        with self._write_lock:
+            indexes = self._synced_indexes()
+            deleted = {id(entity): entity
+                       for entity in self._filtered(input_params.filter)}
+            if not deleted:
+                return []
+            if self.soft_delete:
+                deleted_at = datetime.now()
+                for entity in deleted.values():
+                    self._bury(entity, indexes, deleted_at)
+                    self._publish('delete', entity)
+                return list(deleted.values())
+            rebuild = _rebuild_is_cheaper(len(deleted), len(self.items))
+            # in place, the indexes stay bound to the same list
+            self.items[:] = [item for item in self.items if id(item) not in deleted]
+            self._indexed_size = len(self.items)
+            self._discard_live(deleted.values())
+            for entity in deleted.values():
+                self._ids.pop(entity.unique_entity_id.raw, None)
+                if not rebuild:
+                    for index in indexes:
+                        index.discard(entity)
+            if rebuild:
+                for index in indexes:
+                    index.rebuild(self._indexed_entities(self._live_items()))
+            for entity in deleted.values():
+                self._publish('delete', entity)
+            return list(deleted.values())
+
+    def update_where(self, input_params: SearchParams, changes: Dict[str, Any]) -> List[ET]:
+        with self._write_lock:
+            indexes = self._synced_indexes()
+            updates = []
+            for entity in self._filtered(input_params.filter):
+                fields = frozenset(name for name, value in changes.items()
+                                   if not _same_value(getattr(entity, name), value))
+                if fields:
+                    updates.append((entity, fields))
+            self._check_write([entity for entity, _ in updates], changes)
+            rebuild = _rebuild_is_cheaper(len(updates), len(self.items))
+            for entity, fields in updates:
+                if not rebuild:
+                    for index in indexes:
+                        index.discard(entity)
+                for name in fields:
+                    object.__setattr__(entity, name, changes[name])
+                object.__setattr__(entity, 'version', entity.version + 1)
+                if not rebuild:
+                    for index in indexes:
+                        index.add(entity)
+            if rebuild:
+                for index in indexes:
+                    index.rebuild(self._indexed_entities(self._live_items()))
+            for entity, fields in updates:
+                self._publish('update', entity, fields)
+            return [entity for entity, _ in updates]
+
+    def _apply_search(self, input_params: SearchParams) -> List[ET]:
+        # the filtered and sorted items, before pagination
+        items_filtered = self._filtered(input_params.filter)
+        return self._apply_sort(items_filtered, input_params.sort, input_params.sort_dir)
+
+    def _filtered(self, filter_param: Optional[Filter | Specification]) -> List[ET]:
+        if isinstance(filter_param, Specification):
+            return self._apply_specification(filter_param)
+        return self._apply_filter(self._live_items(), filter_param)
+
     @abstractmethod
     def _apply_filter(self, items: List[ET], filter_param: Optional[Filter]) -> List[ET]:
         raise NotImplementedError()
 
+    def _apply_specification(self, spec: Specification) -> List[ET]:
+        # pylint: disable=import-outside-toplevel
+        from __seedwork.domain.specifications import compile_predicate
+        predicate = compile_predicate(spec)
+        with self._write_lock:
+            candidates = self._index_candidates(spec)
+        if candidates is None:
+            candidates = self._live_items()
+        return list(filter(predicate, candidates))
+
+    def _index_candidates(self, spec: Specification) -> Optional[List[ET]]:
+        # an index able to narrow the whole spec wins; otherwise an And is driven
+        # by its most selective indexed part and the rest (with every or/not
+        # no index answers) is left to the predicate; None means a full scan
+        # pylint: disable=import-outside-toplevel
+        from __seedwork.domain.specifications import And
+        for index in self._synced_indexes():
+            if (candidates := index.lookup(spec)) is not None:
+                return candidates
+        if not isinstance(spec, And):
+            return None
+        best = None
+        for child in spec.specs:
+            candidates = self._index_candidates(child)
+            if candidates is not None and (best is None or len(candidates) < len(best)):
+                best = candidates
+        return best
+
     def _apply_sort(self, items: List[ET],
                     sort: Optional[str], sort_dir: Optional[str]) -> List[ET]:
-        if sort and sort in self.sortable_fields:
-            is_reverse = sort_dir == 'desc'
-            return sorted(items, key=lambda item: getattr(item, sort), reverse=is_reverse)
-        return items
+        # fields that are not sortable are ignored
+        sort_fields = tuple(
+            sort_field for sort_field in parse_sort(sort, sort_dir)
+            if sort_field[0] in self.sortable_fields)
+        return _sort(items, sort_fields, self._sort_key) if sort_fields else items
+
+    def _sort_key(self, field_name: str) -> Callable[[ET], Any]:
+        # repositories keeping a precomputed key for a field return it here
+        return attrgetter(field_name)
 
     def _apply_paginate(self, items: List[ET], page: int, per_page: int) -> List[ET]:
         start = (page-1) * per_page
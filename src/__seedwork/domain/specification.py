@@ -0,0 +1,31 @@
+from abc import ABC
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from __seedwork.domain.specifications import And, Not, Or
+
+# the base class alone, cheap to import: the repositories tell specifications
+# from plain filters with it, the concrete ones and their compiler live in
+# specifications
+
+# pylint: disable=import-outside-toplevel
+
+
+class Specification(ABC):
+    __slots__ = ()
+
+    def __and__(self, other: 'Specification') -> 'And':
+        from __seedwork.domain.specifications import And, _flatten
+        return And(_flatten(And, self) + _flatten(And, other))
+
+    def __or__(self, other: 'Specification') -> 'Or':
+        from __seedwork.domain.specifications import Or, _flatten
+        return Or(_flatten(Or, self) + _flatten(Or, other))
+
+    def __invert__(self) -> 'Not':
+        from __seedwork.domain.specifications import Not
+        return Not(self)
+
+    def is_satisfied_by(self, entity: Any) -> bool:
+        from __seedwork.domain.specifications import compile_predicate
+        return compile_predicate(self)(entity) is True
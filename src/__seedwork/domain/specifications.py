@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple
+
+from __seedwork.domain.specification import Specification
+from __seedwork.domain.text import fold, similarity
+
+# criteria over entity fields, composed with & | ~ and written once: compile_predicate
+# runs them in memory, SqlCompiler turns them into a parameterized WHERE clause
+
+
+def _flatten(kind: type, spec: Specification) -> Tuple[Specification, ...]:
+    # (a & b) & c is kept as a single And of three
+    return spec.specs if isinstance(spec, kind) else (spec,)
+
+
+@dataclass(slots=True, frozen=True)
+class Eq(Specification):
+    field: str
+    value: Any
+
+
+@dataclass(slots=True, frozen=True)
+class Contains(Specification):
+    # case- and accent-insensitive substring
+    field: str
+    value: str
+
+
+@dataclass(slots=True, frozen=True)
+class Range(Specification):
+    # both bounds inclusive, a None bound is open
+    field: str
+    lower: Any = None
+    upper: Any = None
+
+
+@dataclass(slots=True, frozen=True)
+class Similar(Specification):
+    # trigram similarity, as pg_trgm computes it
+    field: str
+    value: str
+    threshold: float = 0.3
+
+
+@dataclass(slots=True, frozen=True)
+class And(Specification):
+    # no specs matches everything
+    specs: Tuple[Specification, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class Or(Specification):
+    # no specs matches nothing
+    specs: Tuple[Specification, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class Not(Specification):
+    spec: Specification
+
+
+# True, False or None for unknown: as in SQL, a None field compared to a value
+# is unknown, a filter keeps only True and negating unknown leaves it unknown
+Predicate = Callable[[Any], Optional[bool]]
+
+
+@lru_cache(maxsize=256)
+def compile_predicate(spec: Specification) -> Predicate:
+    # one closure per node, the constant parts (folded values, getters) are
+    # computed here once instead of on every entity
+    # pylint: disable=too-many-return-statements
+    if isinstance(spec, And):
+        if len(spec.specs) == 1:
+            return compile_predicate(spec.specs[0])
+        predicates = tuple(map(compile_predicate, spec.specs))
+        return lambda entity: _all(predicate(entity) for predicate in predicates)
+    if isinstance(spec, Or):
+        if len(spec.specs) == 1:
+            return compile_predicate(spec.specs[0])
+        predicates = tuple(map(compile_predicate, spec.specs))
+        return lambda entity: _any(predicate(entity) for predicate in predicates)
+    if isinstance(spec, Not):
+        predicate = compile_predicate(spec.spec)
+        return lambda entity: None if (result := predicate(entity)) is None else not result
+    getter = attrgetter(spec.field)
+    if isinstance(spec, Eq):
+        value = spec.value
+        if value is None:
+            # IS NULL, never unknown
+            return lambda entity: getter(entity) is None
+        return lambda entity: None if (found := getter(entity)) is None else found == value
+    if isinstance(spec, Contains):
+        folded = fold(spec.value)
+        return lambda entity: None if (found := getter(entity)) is None \
+            else folded in fold(found)
+    if isinstance(spec, Range):
+        return _range_predicate(getter, spec.lower, spec.upper)
+    if isinstance(spec, Similar):
+        value, threshold = spec.value, spec.threshold
+        return lambda entity: None if (found := getter(entity)) is None \
+            else similarity(value, found) >= threshold
+    raise TypeError(f"Unknown specification: {spec!r}")
+
+
+def _all(results: Iterable[Optional[bool]]) -> Optional[bool]:
+    # SQL AND: False wins over unknown, unknown over True
+    outcome: Optional[bool] = True
+    for result in results:
+        if result is None:
+            outcome = None
+        elif not result:
+            return False
+    return outcome
+
+
+def _any(results: Iterable[Optional[bool]]) -> Optional[bool]:
+    # SQL OR: True wins over unknown, unknown over False
+    outcome: Optional[bool] = False
+    for result in results:
+        if result is None:
+            outcome = None
+        elif result:
+            return True
+    return outcome
+
+
+def _range_predicate(getter: Callable[[Any], Any], lower: Any, upper: Any) -> Predicate:
+    if lower is None and upper is None:
+        return lambda entity: True
+    if upper is None:
+        return lambda entity: None if (found := getter(entity)) is None else found >= lower
+    if lower is None:
+        return lambda entity: None if (found := getter(entity)) is None else found <= upper
+    return lambda entity: None if (found := getter(entity)) is None \
+        else lower <= found <= upper
+
+
+@dataclass(slots=True, frozen=True)
+class SqlWhere:
+    clause: str
+    params: Tuple[Any, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class SqlCompiler:
+    # field -> column; only mapped fields are rendered, so no field name from
+    # the outside ever reaches the SQL text
+    columns: Mapping[str, str]
+    placeholder: str = '%s'
+
+    def compile(self, spec: Specification) -> SqlWhere:
+        params: List[Any] = []
+        clause = self._compile(spec, params)
+        return SqlWhere(clause=clause, params=tuple(params))
+
+    def _compile(self, spec: Specification, params: List[Any]) -> str:
+        # pylint: disable=too-many-return-statements
+        if isinstance(spec, (And, Or)):
+            if not spec.specs:
+                return '1 = 1' if isinstance(spec, And) else '1 = 0'
+            if len(spec.specs) == 1:
+                return self._compile(spec.specs[0], params)
+            operator = ' AND ' if isinstance(spec, And) else ' OR '
+            return f'({operator.join(self._compile(child, params) for child in spec.specs)})'
+        if isinstance(spec, Not):
+            return f'NOT {self._compile(spec.spec, params)}'
+        column = self._column(spec.field)
+        if isinstance(spec, Eq):
+            if spec.value is None:
+                return f'{column} IS NULL'
+            return self._bind(f'{column} = {{}}', params, spec.value)
+        if isinstance(spec, Contains):
+            pattern = f'%{_escape_like(spec.value.lower())}%'
+            return self._bind(f"LOWER({column}) LIKE {{}} ESCAPE '\\'", params, pattern)
+        if isinstance(spec, Range):
+            bounds = [self._bind(f'{column} {operator} {{}}', params, bound)
+                      for operator, bound in (('>=', spec.lower), ('<=', spec.upper))
+                      if bound is not None]
+            if not bounds:
+                return '1 = 1'
+            return bounds[0] if len(bounds) == 1 else f'({" AND ".join(bounds)})'
+        if isinstance(spec, Similar):
+            return self._bind(
+                f'similarity({column}, {{}}) >= {{}}', params, spec.value, spec.threshold)
+        raise TypeError(f"Unknown specification: {spec!r}")
+
+    def _column(self, field: str) -> str:
+        column: Optional[str] = self.columns.get(field)
+        if column is None:
+            raise ValueError(f"Field '{field}' has no column")
+        return column
+
+    def _bind(self, template: str, params: List[Any], *values: Any) -> str:
+        params.extend(values)
+        return template.format(*(self.placeholder,) * len(values))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
@@ -0,0 +1,37 @@
+from functools import lru_cache
+import re
+from typing import FrozenSet
+import unicodedata
+
+_WORD = re.compile(r'\w+')
+
+
+def fold(text: str) -> str:
+    # case- and accent-insensitive key: 'Ação' and 'ACAO' both fold to 'acao'
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def collation_key(text: str) -> str:
+    # sorts by the folded text, then by the text as written: 'ACAO' < 'Ação' < 'acao' < 'ação 2';
+    # one str compares faster than a (folded, text) tuple
+    return f'{fold(text)}\0{text}'
+
+
+@lru_cache(maxsize=4096)
+def trigrams(text: str) -> FrozenSet[str]:
+    # like pg_trgm: every folded word padded with two spaces before and one after
+    grams = set()
+    for word in _WORD.findall(fold(text)):
+        padded = f'  {word} '
+        grams.update(padded[start:start + 3] for start in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(text: str, other: str) -> float:
+    # shared trigrams over all trigrams: 1.0 for the same words, 0.0 for nothing in common
+    grams, other_grams = trigrams(text), trigrams(other)
+    shared = len(grams & other_grams)
+    return shared / (len(grams) + len(other_grams) - shared) if shared else 0.0
@@ -1,14 +1,10 @@
-import contextlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Dict, Generic, List, TypeVar
-from rest_framework.serializers import Serializer
-from rest_framework.fields import CharField, BooleanField
-from django.conf import settings
 from .exceptions import ValidationException
 
-if not settings.configured:
-    settings.configure(USE_I18N=False)
+# the DRF backed validators live in drf_validators, loading them configures
+# django, so this module stays importable without it
 
 
 @dataclass(frozen=True, slots=True)
@@ -54,36 +50,3 @@ class ValidatorFieldsInterface(ABC, Generic[PropsValidated]):
     @abstractmethod
     def validate(self, data: Any) -> bool:
         raise NotImplementedError()
-
-
-class DRFValidator(ValidatorFieldsInterface[PropsValidated], ABC):  # pylint: disable=too-few-public-methods
-
-    def validate(self, data: Serializer) -> bool:
-        serializer = data
-        if serializer.is_valid():
-            self.validate_data = dict(serializer.validated_data)
-            return True
-        self.errors = {field: [str(error) for error in errors]
-                       for field, errors in serializer.errors.items()}
-        return False
-
-
-class StrictCharField(CharField):
-
-    def to_internal_value(self, data):
-        if not isinstance(data, str):
-            self.fail('invalid')
-        return super().to_internal_value(data)
-
-
-class StrictBooleanField(BooleanField):
-
-    def to_internal_value(self, data):  # pylint: disable=inconsistent-return-statements
-        with contextlib.suppress(TypeError):
-            if data is True:
-                return True
-            if data is False:
-                return False
-            if data is None and self.allow_null:
-                return None
-        self.fail('invalid', input=data)
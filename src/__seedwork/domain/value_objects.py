@@ -1,6 +1,9 @@
 from abc import ABC
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, fields
+from functools import cache
 import json
+import os
+from typing import Optional, Tuple
 import uuid
 
 from __seedwork.domain.exceptions import InvalidUuidException
@@ -8,29 +11,77 @@ from __seedwork.domain.exceptions import InvalidUuidException
 # ABC - Abstract Base Class
 
 
+@cache
+def _fields_name(cls: type) -> Tuple[str, ...]:
+    # computed once per value object class instead of on every __str__
+    return tuple(field.name for field in fields(cls))
+
+
 @dataclass(frozen=True, slots=True)
 class ValueObject(ABC):
     def __str__(self) -> str:
-        fields_name = [field.name for field in fields(self)]
+        fields_name = _fields_name(type(self))
         return str(getattr(self, fields_name[0])) \
             if len(fields_name) == 1 \
             else json.dumps({field_name: getattr(self, field_name) for field_name in fields_name})
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, init=False)
 class UniqueEntityId(ValueObject):
+    # the canonical value is the 16-byte form of the UUID; the 36-char string
+    # is only rendered (and cached) when someone asks for it
+    __slots__ = ('raw', '_id')
 
-    id: str = field(  # pylint: disable=invalid-name
-        default_factory=lambda: str(uuid.uuid4())
-    )
+    raw: bytes
 
-    def __post_init__(self):
-        id_value = str(self.id) if isinstance(self.id, uuid.UUID) else self.id
-        object.__setattr__(self, 'id', id_value)
-        self.__validate()
+    def __init__(self, value: Optional[str | uuid.UUID | bytes] = None):
+        object.__setattr__(self, 'raw', self.__validate(value))
+        object.__setattr__(self, '_id', None)
 
-    def __validate(self):
+    @property
+    def id(self) -> str:  # pylint: disable=invalid-name
+        # pylint: disable=no-member
+        if self._id is None:
+            hex_id = self.raw.hex()
+            object.__setattr__(
+                self, '_id',
+                f'{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}')
+        return self._id
+
+    @staticmethod
+    def __generate() -> bytes:
+        # same as uuid.uuid4().bytes without building a UUID object
+        raw = bytearray(os.urandom(16))
+        raw[6] = raw[6] & 0x0F | 0x40
+        raw[8] = raw[8] & 0x3F | 0x80
+        return bytes(raw)
+
+    def __validate(self, value: Optional[str | uuid.UUID | bytes]) -> bytes:
+        if value is None:
+            return self.__generate()
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        if isinstance(value, bytes) and len(value) == 16:
+            return value
         try:
-            uuid.UUID(self.id)
-        except ValueError as ex:
+            return uuid.UUID(value).bytes
+        except (ValueError, TypeError, AttributeError) as ex:
             raise InvalidUuidException() from ex
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.raw == other.raw
+
+    def __hash__(self) -> int:
+        # bytes objects cache their own hash, so this is computed only once
+        return hash(self.raw)
+
+    def __str__(self) -> str:
+        return self.id
+
+    def __repr__(self) -> str:
+        return f"UniqueEntityId('{self.id}')"
+
+    def __reduce__(self):
+        return (self.__class__, (self.raw,))
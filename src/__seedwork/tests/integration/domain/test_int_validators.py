@@ -1,6 +1,6 @@
 import unittest
 from rest_framework import serializers
-from __seedwork.domain.validators import DRFValidator, StrictBooleanField, StrictCharField
+from __seedwork.domain.drf_validators import DRFValidator, StrictBooleanField, StrictCharField
 
 
 # pylint: disable=abstract-method
@@ -0,0 +1,110 @@
+from threading import Thread
+import unittest
+
+from __seedwork.application.cache import CacheStats, LRUCache
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUCacheUnit(unittest.TestCase):
+
+    def test_get_and_set(self):
+        cache = LRUCache()
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.get('key', 'default'), 'default')
+        cache.set('key', 'value')
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertEqual(len(cache), 1)
+
+    def test_evict_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.set('key', 'value')
+        clock.now = 9.9
+        self.assertEqual(cache.get('key'), 'value')
+        clock.now = 10
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats().expirations, 1)
+
+    def test_invalidate_and_clear(self):
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.invalidate('a')
+        cache.invalidate('not cached')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_set_with_a_token_skips_a_key_invalidated_since(self):
+        cache = LRUCache(max_size=2)
+        token = cache.token()
+        cache.invalidate('a')
+        cache.set('a', 'stale', token)
+        cache.set('b', 2, token)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        cache.set('a', 1, cache.token())
+        self.assertEqual(cache.get('a'), 1)
+
+        # past max_size invalidations, the older ones count for every key
+        token = cache.token()
+        for key in 'cde':
+            cache.invalidate(key)
+        cache.set('c', 3, token)
+        cache.set('f', 4, token)
+        self.assertIsNone(cache.get('c'))
+        self.assertIsNone(cache.get('f'))
+
+        token = cache.token()
+        cache.clear()
+        cache.set('g', 5, token)
+        self.assertEqual(len(cache), 0)
+
+    def test_stats(self):
+        cache = LRUCache()
+        self.assertEqual(cache.stats().hit_rate, 0.0)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        self.assertEqual(cache.stats(), CacheStats(
+            hits=3, misses=1, evictions=0, expirations=0, size=1))
+        self.assertEqual(cache.stats().hit_rate, 0.75)
+
+    def test_concurrent_access(self):
+        cache = LRUCache(max_size=50)
+
+        def worker(offset):
+            for index in range(1000):
+                cache.set((offset + index) % 100, index)
+                cache.get(index % 100)
+
+        threads = [Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, 4000)
+        self.assertEqual(stats.size, 50)
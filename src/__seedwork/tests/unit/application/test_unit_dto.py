@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import unittest
 
 from __seedwork.application.dto import (
@@ -17,6 +17,7 @@ class TestSearchInputUnit(unittest.TestCase):
             'sort': Optional[str],
             'sort_dir': Optional[str],
             'filter': Optional[Filter],
+            'facets': Optional[Tuple[str, ...]],
         })
 
 
@@ -29,6 +30,7 @@ class TestPaginationOutputUnit(unittest.TestCase):
             'current_page': int,
             'per_page': int,
             'last_page': int,
+            'facets': Optional[Dict[str, Dict[Any, int]]],
         })
 
 
@@ -51,7 +53,8 @@ class TestPaginationOutputMapperUnit(unittest.TestCase):
             per_page=1,
             sort='name',
             sort_dir='asc',
-            filter='filter fake'
+            filter='filter fake',
+            facets={'name': {'fake': 1}}
         )
         output = PaginationOutputMapper.\
             from_child(PaginationOutputChild).\
@@ -61,5 +64,6 @@ class TestPaginationOutputMapperUnit(unittest.TestCase):
             total=result.total,
             current_page=result.current_page,
             last_page=result.last_page,
-            per_page=result.per_page
+            per_page=result.per_page,
+            facets={'name': {'fake': 1}}
         ))
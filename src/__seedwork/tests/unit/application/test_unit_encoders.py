@@ -0,0 +1,79 @@
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+import json
+from typing import List, Optional
+import unittest
+
+from __seedwork.application.dto import PaginationOutput
+from __seedwork.application.encoders import encode
+
+
+@dataclass(frozen=True, slots=True)
+class StubOutput:
+    name: str
+    price: float
+    created_at: datetime
+    tags: List[str]
+    description: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class EmptyOutput:
+    pass
+
+
+class Color(str, Enum):
+    RED = 'red'
+
+
+def json_dumps(value) -> bytes:
+    return json.dumps(value, default=lambda item: item.isoformat(),
+                      separators=(',', ':')).encode()
+
+
+class TestEncodeUnit(unittest.TestCase):
+
+    def test_scalars(self):
+        arrange = [None, True, False, 0, -15, 2 ** 70, 5.5, float('inf'),
+                   '', 'Movie', 'Ação "quoted"\n\t\\', '\U0001F600', Color.RED]
+        for value in arrange:
+            self.assertEqual(encode(value), json_dumps(value), msg=repr(value))
+
+    def test_dates(self):
+        arrange = [
+            datetime(2022, 1, 1, 10, 30, 5, 123),
+            datetime(2022, 1, 1, tzinfo=timezone.utc),
+            date(2022, 1, 1),
+        ]
+        for value in arrange:
+            self.assertEqual(encode(value), json_dumps(value))
+
+    def test_equal_instants_keep_their_offset(self):
+        utc = datetime(2022, 1, 1, 12, tzinfo=timezone.utc)
+        local = utc.astimezone(timezone(timedelta(hours=-3)))
+        self.assertEqual(utc, local)
+        self.assertEqual(encode(utc), b'"2022-01-01T12:00:00+00:00"')
+        self.assertEqual(encode(local), b'"2022-01-01T09:00:00-03:00"')
+
+    def test_containers(self):
+        arrange = [[], (), {}, [1, [2, (3,)]], {'a': {'b': [None]}},
+                   {1: 'int key', None: 'none key', True: 'bool key'}]
+        for value in arrange:
+            self.assertEqual(encode(value), json_dumps(value), msg=repr(value))
+
+    def test_dataclasses(self):
+        output = StubOutput(
+            name='Movie', price=10.5, created_at=datetime.now(), tags=['a', 'b'])
+        self.assertEqual(encode(output), json_dumps(asdict(output)))
+        self.assertEqual(encode(EmptyOutput()), b'{}')
+
+        page = PaginationOutput(
+            items=[output, output], total=2, current_page=1, per_page=15, last_page=1)
+        self.assertEqual(encode(page), json_dumps(asdict(page)))
+
+    def test_unsupported_type(self):
+        with self.assertRaises(TypeError) as assert_error:
+            encode({'value': object()})
+        self.assertEqual(assert_error.exception.args[0],
+                         'Object of type object is not JSON serializable')
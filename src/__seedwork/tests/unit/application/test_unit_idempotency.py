@@ -0,0 +1,70 @@
+from threading import Barrier, Thread
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from __seedwork.application.idempotency import IdempotencyStore
+
+
+class TestIdempotencyStoreUnit(unittest.TestCase):
+
+    def test_returns_first_output_for_the_same_key(self):
+        store = IdempotencyStore()
+        fn = MagicMock(side_effect=['first', 'second'])
+        self.assertEqual(store.execute('key', fn), 'first')
+        self.assertEqual(store.execute('key', fn), 'first')
+        fn.assert_called_once()
+        self.assertEqual(store.execute('other key', fn), 'second')
+        self.assertEqual(len(store), 2)
+
+    def test_failures_are_not_stored(self):
+        store = IdempotencyStore()
+        fn = MagicMock(side_effect=[ValueError(), 'output'])
+        with self.assertRaises(ValueError):
+            store.execute('key', fn)
+        self.assertEqual(store.execute('key', fn), 'output')
+        self.assertEqual(fn.call_count, 2)
+
+    def test_is_bounded_and_expires(self):
+        store = IdempotencyStore(max_size=2, ttl=None)
+        for key in ('a', 'b', 'c'):
+            store.execute(key, lambda: 'output')
+        self.assertEqual(len(store), 2)
+
+        store = IdempotencyStore(ttl=0)
+        fn = MagicMock(return_value='output')
+        store.execute('key', fn)
+        store.execute('key', fn)
+        self.assertEqual(fn.call_count, 2)
+
+    def test_forget(self):
+        store = IdempotencyStore()
+        fn = MagicMock(return_value='output')
+        store.execute('key', fn)
+        store.forget('key')
+        store.execute('key', fn)
+        self.assertEqual(fn.call_count, 2)
+
+    def test_concurrent_requests_with_the_same_key(self):
+        store = IdempotencyStore()
+        calls = []
+
+        def create():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        results = []
+        started = Barrier(8)
+
+        def worker():
+            started.wait()
+            results.append(store.execute('key', create))
+
+        threads = [Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
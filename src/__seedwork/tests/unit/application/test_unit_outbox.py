@@ -0,0 +1,107 @@
+from threading import Thread
+import time
+import unittest
+
+from __seedwork.application.outbox import (
+    InMemoryEventPublisher,
+    InMemoryOutbox,
+    OutboxDispatcher,
+    OutboxMessage
+)
+from __seedwork.domain.events import DomainEvent
+
+
+def make_events(count: int):
+    return [DomainEvent(entity_id=str(index)) for index in range(count)]
+
+
+class FailingPublisher(InMemoryEventPublisher):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def publish(self, events):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('broker unavailable')
+        super().publish(events)
+
+
+class TestInMemoryOutboxUnit(unittest.TestCase):
+
+    def test_add_fetch_and_ack(self):
+        outbox = InMemoryOutbox()
+        self.assertEqual(outbox.fetch(10), [])
+
+        events = make_events(3)
+        outbox.add_all(events)
+        outbox.add_all([])
+        self.assertEqual(len(outbox), 3)
+
+        messages = outbox.fetch(2)
+        self.assertEqual(messages, [OutboxMessage(1, events[0]), OutboxMessage(2, events[1])])
+        self.assertEqual(outbox.fetch(2), messages)
+
+        outbox.ack(messages)
+        outbox.ack([])
+        self.assertEqual(outbox.fetch(10), [OutboxMessage(3, events[2])])
+
+    def test_fetch_waits_for_messages(self):
+        outbox = InMemoryOutbox()
+        self.assertEqual(outbox.fetch(10, timeout=0.01), [])
+
+        messages = []
+        consumer = Thread(target=lambda: messages.extend(outbox.fetch(10, timeout=5)))
+        consumer.start()
+        outbox.add_all(make_events(1))
+        consumer.join()
+        self.assertEqual(len(messages), 1)
+
+
+class TestOutboxDispatcherUnit(unittest.TestCase):
+
+    def test_dispatch_pending_in_batches(self):
+        outbox = InMemoryOutbox()
+        publisher = InMemoryEventPublisher()
+        dispatcher = OutboxDispatcher(outbox, publisher, batch_size=2)
+        events = make_events(5)
+        outbox.add_all(events)
+
+        self.assertEqual(dispatcher.dispatch_pending(), 5)
+        self.assertEqual(publisher.published, events)
+        self.assertEqual(publisher.batches, 3)
+        self.assertEqual(len(outbox), 0)
+        self.assertEqual(dispatcher.dispatch_pending(), 0)
+
+    def test_failed_batch_stays_in_the_outbox(self):
+        outbox = InMemoryOutbox()
+        publisher = FailingPublisher(failures=1)
+        dispatcher = OutboxDispatcher(outbox, publisher)
+        events = make_events(2)
+        outbox.add_all(events)
+
+        with self.assertRaises(ConnectionError):
+            dispatcher.dispatch_pending()
+        self.assertEqual(len(outbox), 2)
+        self.assertEqual(dispatcher.dispatch_pending(), 2)
+        self.assertEqual(publisher.published, events)
+
+    def test_background_dispatch(self):
+        outbox = InMemoryOutbox()
+        publisher = FailingPublisher(failures=1)
+        dispatcher = OutboxDispatcher(
+            outbox, publisher, batch_size=10, poll_interval=0.01, retry_delay=0.01)
+        dispatcher.start()
+        dispatcher.start()
+        try:
+            events = make_events(25)
+            outbox.add_all(events)
+            deadline = time.monotonic() + 5
+            while len(publisher.published) < 25 and time.monotonic() < deadline:
+                time.sleep(0.005)
+        finally:
+            dispatcher.stop(timeout=5)
+        self.assertEqual(publisher.published, events)
+        self.assertIsInstance(dispatcher.last_error, ConnectionError)
+        self.assertEqual(len(outbox), 0)
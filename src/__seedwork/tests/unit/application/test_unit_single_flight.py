@@ -0,0 +1,156 @@
+import asyncio
+from dataclasses import dataclass
+from threading import Barrier, Event, Thread
+import time
+from typing import List
+import unittest
+from unittest.mock import MagicMock
+
+from __seedwork.application.single_flight import AsyncSingleFlightUseCase, SingleFlightUseCase
+from __seedwork.application.use_cases import UseCase
+
+
+@dataclass(frozen=True, slots=True)
+class StubInput:
+    value: int
+
+
+class SlowUseCase(UseCase):
+
+    def __init__(self):
+        self.release = Event()
+        self.calls = 0
+
+    def execute(self, input_param: StubInput) -> int:
+        self.calls += 1
+        self.release.wait(timeout=5)
+        if input_param.value < 0:
+            raise ValueError('negative')
+        return input_param.value * 2
+
+
+class AsyncSlowUseCase:  # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, input_param: StubInput) -> int:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if input_param.value < 0:
+            raise ValueError('negative')
+        return input_param.value * 2
+
+
+def run_concurrently(target, inputs) -> List:
+    results = [None] * len(inputs)
+    started = Barrier(len(inputs) + 1)
+
+    def worker(index):
+        started.wait()
+        try:
+            results[index] = target(inputs[index])
+        except ValueError as ex:
+            results[index] = ex
+
+    threads = [Thread(target=worker, args=(index,))
+               for index in range(len(inputs))]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    return threads, results
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestSingleFlightUseCaseUnit(unittest.TestCase):
+
+    def test_concurrent_equal_inputs_share_one_call(self):
+        use_case = SlowUseCase()
+        single_flight = SingleFlightUseCase(use_case)
+        threads, results = run_concurrently(
+            single_flight.execute, [StubInput(2)] * 8 + [StubInput(3)])
+        wait_for(lambda: use_case.calls == 2)
+        # give the followers time to join the in-flight calls
+        time.sleep(0.05)
+        use_case.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [4] * 8 + [6])
+        self.assertEqual(use_case.calls, 2)
+        self.assertEqual(len(single_flight._flights), 0)  # pylint: disable=protected-access
+
+    def test_errors_are_shared(self):
+        use_case = SlowUseCase()
+        single_flight = SingleFlightUseCase(use_case)
+        threads, results = run_concurrently(
+            single_flight.execute, [StubInput(-1)] * 4)
+        wait_for(lambda: use_case.calls == 1)
+        time.sleep(0.05)
+        use_case.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(isinstance(result, ValueError)
+                        for result in results))
+        self.assertEqual(use_case.calls, 1)
+
+    def test_sequential_calls_are_not_cached(self):
+        use_case = SlowUseCase()
+        use_case.release.set()
+        single_flight = SingleFlightUseCase(use_case)
+        self.assertEqual(single_flight.execute(StubInput(1)), 2)
+        self.assertEqual(single_flight.execute(StubInput(1)), 2)
+        self.assertEqual(use_case.calls, 2)
+
+    def test_unhashable_input_is_not_coalesced(self):
+        use_case = MagicMock()
+        use_case.execute.return_value = 'output'
+        single_flight = SingleFlightUseCase(use_case)
+        self.assertEqual(single_flight.execute(['unhashable']), 'output')
+        use_case.execute.assert_called_once_with(['unhashable'])
+
+
+class TestAsyncSingleFlightUseCaseUnit(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_equal_inputs_share_one_call(self):
+        use_case = AsyncSlowUseCase()
+        single_flight = AsyncSingleFlightUseCase(use_case)
+        results = await asyncio.gather(
+            *[single_flight.execute(StubInput(2)) for _ in range(8)],
+            single_flight.execute(StubInput(3)))
+        self.assertEqual(results, [4] * 8 + [6])
+        self.assertEqual(use_case.calls, 2)
+        self.assertEqual(single_flight._calls, {})  # pylint: disable=protected-access
+
+    async def test_errors_are_shared(self):
+        use_case = AsyncSlowUseCase()
+        single_flight = AsyncSingleFlightUseCase(use_case)
+        results = await asyncio.gather(
+            *[single_flight.execute(StubInput(-1)) for _ in range(4)],
+            return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ValueError)
+                        for result in results))
+        self.assertEqual(use_case.calls, 1)
+
+    async def test_sync_use_case_runs_in_a_thread(self):
+        use_case = SlowUseCase()
+        use_case.release.set()
+        single_flight = AsyncSingleFlightUseCase(use_case)
+        results = await asyncio.gather(
+            *[single_flight.execute(StubInput(5)) for _ in range(4)])
+        self.assertEqual(results, [10] * 4)
+        self.assertEqual(use_case.calls, 1)
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        use_case = AsyncSlowUseCase()
+        single_flight = AsyncSingleFlightUseCase(use_case)
+        first = asyncio.ensure_future(single_flight.execute(StubInput(1)))
+        second = asyncio.ensure_future(single_flight.execute(StubInput(1)))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, 2)
+        self.assertEqual(use_case.calls, 1)
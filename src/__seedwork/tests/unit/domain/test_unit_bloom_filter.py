@@ -0,0 +1,97 @@
+# pylint: disable=unexpected-keyword-arg
+from dataclasses import dataclass
+import os
+import unittest
+from unittest.mock import patch
+from __seedwork.domain.bloom_filter import BloomFilter, BloomFilteredRepository
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.exceptions import NotFoundExeption
+from __seedwork.domain.repositories import InMemoryRepository
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StubEntity(Entity):
+    name: str
+
+
+class StubInMemoryRepository(InMemoryRepository[StubEntity]):
+    pass
+
+
+class TestBloomFilterUnit(unittest.TestCase):
+
+    def test_added_keys_are_always_found(self):
+        bloom_filter = BloomFilter(capacity=1000)
+        keys = [os.urandom(16) for _ in range(1000)] + ['movie', 'ação']
+        for key in keys:
+            bloom_filter.add(key)
+        self.assertTrue(all(key in bloom_filter for key in keys))
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        for _ in range(1000):
+            bloom_filter.add(os.urandom(16))
+        false_positives = sum(os.urandom(16) in bloom_filter for _ in range(10_000))
+        self.assertLess(false_positives, 300)
+
+    def test_empty_filter(self):
+        self.assertNotIn('movie', BloomFilter())
+
+
+class TestBloomFilteredRepositoryUnit(unittest.TestCase):
+    storage: StubInMemoryRepository
+    repo: BloomFilteredRepository[StubEntity]
+
+    def setUp(self) -> None:
+        self.stored = StubEntity(name='stored')
+        self.storage = StubInMemoryRepository(items=[self.stored])
+        self.repo = BloomFilteredRepository(self.storage)
+
+    def test_knows_the_entities_stored_before(self):
+        self.assertTrue(self.repo.exists(self.stored.id))
+        self.assertEqual(self.repo.find_by_id(self.stored.unique_entity_id), self.stored)
+
+    def test_negative_lookups_skip_the_storage(self):
+        with patch.object(self.storage, 'find_by_id') as spy_find_by_id, \
+                patch.object(self.storage, 'exists') as spy_exists:
+            self.assertFalse(self.repo.exists('af46842e-027d-4c91-b259-3a3642144ba4'))
+            self.assertFalse(self.repo.exists('fake id'))
+            with self.assertRaises(NotFoundExeption):
+                self.repo.find_by_id('af46842e-027d-4c91-b259-3a3642144ba4')
+            spy_find_by_id.assert_not_called()
+            spy_exists.assert_not_called()
+
+    def test_writes_reach_the_storage(self):
+        entity = StubEntity(name='test')
+        self.repo.insert(entity)
+        entities = [StubEntity(name='test 1'), StubEntity(name='test 2')]
+        self.repo.bulk_insert(entities)
+        others = [StubEntity(name='test 3')]
+        self.assertEqual(self.repo.bulk_insert_valid(others), {})
+        self.assertEqual(self.storage.items, [self.stored, entity, *entities, *others])
+        self.assertTrue(all(self.repo.exists(item.id) for item in [entity, *entities, *others]))
+
+        object.__setattr__(entity, 'name', 'changed')
+        self.repo.update(entity)
+        self.assertEqual(self.storage.find_by_id(entity.id).version, 2)
+
+        self.repo.delete(entity.id)
+        # still in the filter, the storage answers it
+        self.assertFalse(self.repo.exists(entity.id))
+        with self.assertRaises(NotFoundExeption):
+            self.repo.find_by_id(entity.id)
+        self.assertEqual(self.repo.find_all(), [self.stored, *entities, *others])
+
+    def test_keys_are_in_the_filter_during_the_write(self):
+        entity, other = StubEntity(name='test'), StubEntity(name='test 1')
+        seen = []
+
+        def look_up(entities):
+            # as a reader reacting to the write, before it returns
+            seen.extend(item.unique_entity_id.raw in self.repo.ids for item in entities)
+
+        with patch.object(self.storage, 'insert', side_effect=lambda item: look_up([item])), \
+                patch.object(self.storage, 'bulk_insert', side_effect=look_up):
+            self.repo.insert(entity)
+            self.repo.bulk_insert([other])
+        self.assertEqual(seen, [True, True])
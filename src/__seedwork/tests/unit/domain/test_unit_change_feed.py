@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from threading import Thread
+import unittest
+
+from __seedwork.domain.change_feed import ChangeEvent, ChangeFeed, ChangeFeedSubscription
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.events import DomainEvent
+from __seedwork.domain.exceptions import ChangeFeedGapException
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StubEntity(Entity):
+    name: str
+
+
+class TestChangeFeedUnit(unittest.TestCase):
+
+    def test_publish(self):
+        feed = ChangeFeed()
+        self.assertEqual(feed.last_sequence, 0)
+        self.assertEqual(feed.read(), [])
+
+        entity = StubEntity(name='test')
+        event = feed.publish('insert', entity)
+        self.assertEqual(event, ChangeEvent(
+            sequence=1, type='insert', entity_id=entity.id, version=1, entity=entity))
+        feed.publish('update', entity, frozenset(['name']))
+        feed.publish('delete', entity)
+
+        self.assertEqual(feed.last_sequence, 3)
+        self.assertEqual([event.sequence for event in feed.read()], [1, 2, 3])
+        self.assertEqual([event.type for event in feed.read(after=1)], ['update', 'delete'])
+        self.assertEqual(feed.read(after=1)[0].fields, frozenset(['name']))
+        self.assertEqual([event.sequence for event in feed.read(after=0, limit=2)], [1, 2])
+        self.assertEqual(feed.read(after=3), [])
+        self.assertEqual(feed.read(after=10), [])
+
+    def test_events_hold_a_copy_of_the_entity(self):
+        feed = ChangeFeed()
+        entity = StubEntity(name='test')
+        entity.record_event(DomainEvent(entity_id=entity.id))
+        feed.publish('insert', entity)
+        entity._set('name', 'changed')  # pylint: disable=protected-access
+        feed.publish('update', entity, frozenset(['name']))
+
+        first, second = feed.read()
+        self.assertIsNot(first.entity, entity)
+        self.assertEqual(first.entity.name, 'test')
+        self.assertEqual(second.entity.name, 'changed')
+        self.assertFalse(second.entity.is_dirty)
+        self.assertEqual(second.entity.events, ())
+        self.assertEqual(len(entity.events), 1)
+
+    def test_ring_buffer(self):
+        feed = ChangeFeed(max_size=3)
+        entity = StubEntity(name='test')
+        for _ in range(5):
+            feed.publish('update', entity)
+        self.assertEqual(feed.first_sequence, 3)
+        self.assertEqual([event.sequence for event in feed.read(after=2)], [3, 4, 5])
+        with self.assertRaises(ChangeFeedGapException) as assert_error:
+            feed.read(after=1)
+        self.assertEqual(
+            assert_error.exception.args[0],
+            'Events after sequence 1 were dropped, the oldest one kept is 3')
+
+    def test_read_waits_for_events(self):
+        feed = ChangeFeed()
+        self.assertEqual(feed.read(timeout=0.01), [])
+
+        entity = StubEntity(name='test')
+        publisher = Thread(target=lambda: feed.publish('insert', entity))
+        events = []
+        consumer = Thread(target=lambda: events.extend(feed.read(timeout=5)))
+        consumer.start()
+        publisher.start()
+        consumer.join()
+        publisher.join()
+        self.assertEqual([event.sequence for event in events], [1])
+
+    def test_subscribe(self):
+        feed = ChangeFeed()
+        entity = StubEntity(name='test')
+        feed.publish('insert', entity)
+
+        subscription = feed.subscribe()
+        self.assertEqual(subscription, ChangeFeedSubscription(feed, 1))
+        self.assertEqual(subscription.poll(), [])
+
+        feed.publish('update', entity)
+        feed.publish('delete', entity)
+        self.assertEqual([event.type for event in subscription.poll(limit=1)], ['update'])
+        self.assertEqual([event.type for event in subscription.poll()], ['delete'])
+        self.assertEqual(subscription.position, 3)
+
+        resumed = feed.subscribe(after=0)
+        self.assertEqual(len(resumed.poll()), 3)
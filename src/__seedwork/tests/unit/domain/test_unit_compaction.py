@@ -0,0 +1,53 @@
+# pylint: disable=unexpected-keyword-arg
+from dataclasses import dataclass
+import time
+import unittest
+from unittest.mock import patch
+
+from __seedwork.domain.compaction import TombstoneCompactor
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.repositories import InMemoryRepository
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StubEntity(Entity):
+    name: str
+
+
+class StubSoftDeleteRepository(InMemoryRepository[StubEntity]):
+    pass
+
+
+class TestTombstoneCompactorUnit(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = StubSoftDeleteRepository(soft_delete=True)
+        self.entities = [StubEntity(name=str(index)) for index in range(10)]
+        self.repo.bulk_insert(self.entities)
+
+    def test_compact_pending_waits_for_the_threshold(self):
+        compactor = TombstoneCompactor(self.repo, threshold=3)
+        for entity in self.entities[:2]:
+            self.repo.delete(entity.id)
+        with patch.object(self.repo, 'compact') as spy_compact:
+            self.assertEqual(compactor.compact_pending(), 0)
+            spy_compact.assert_not_called()
+
+        self.repo.delete(self.entities[2].id)
+        self.assertEqual(compactor.compact_pending(), 3)
+        self.assertEqual(self.repo.items, self.entities[3:])
+
+    def test_background_compaction(self):
+        compactor = TombstoneCompactor(self.repo, threshold=5, poll_interval=0.01)
+        compactor.start()
+        compactor.start()
+        try:
+            for entity in self.entities[:6]:
+                self.repo.delete(entity.id)
+            deadline = time.monotonic() + 5
+            while self.repo.tombstone_count and time.monotonic() < deadline:
+                time.sleep(0.005)
+        finally:
+            compactor.stop(timeout=5)
+        self.assertEqual(self.repo.items, self.entities[6:])
+        self.assertIsNone(compactor.last_error)
@@ -5,6 +5,8 @@ from dataclasses import dataclass, is_dataclass
 import unittest
 
 from __seedwork.domain.entities import Entity
+from __seedwork.domain.events import DomainEvent
+from __seedwork.domain.exceptions import VersionConflictException
 from __seedwork.domain.value_objects import UniqueEntityId
 
 
@@ -56,3 +58,84 @@ class TestEntityUnit(unittest.TestCase):
         # pylint: disable=protected-access
         entity._set("prop1", "changed prop1")
         self.assertEqual(entity.prop1, "changed prop1")
+
+    def test_set_method_tracks_dirty_fields(self):
+        entity = StubEntity(prop1='value1', prop2='value2')
+        self.assertFalse(entity.is_dirty)
+        self.assertEqual(entity.dirty_fields, frozenset())
+
+        # pylint: disable=protected-access
+        entity._set("prop1", "value1")
+        self.assertFalse(entity.is_dirty)
+
+        entity._set("prop1", "changed prop1")
+        self.assertTrue(entity.is_dirty)
+        self.assertEqual(entity.dirty_fields, {'prop1'})
+
+        entity._set("prop1", "value1")
+        self.assertFalse(entity.is_dirty)
+
+        entity._set("prop2", "changed prop2")
+        entity.mark_clean()
+        self.assertFalse(entity.is_dirty)
+        self.assertEqual(entity.prop2, "changed prop2")
+
+    def test_set_method_compares_value_types(self):
+        entity = StubEntity(prop1=True, prop2='value2')
+        # pylint: disable=protected-access
+        entity._set("prop1", 1)
+        self.assertEqual(entity.dirty_fields, {'prop1'})
+
+    def test_check_version(self):
+        entity = StubEntity(prop1='value1', prop2='value2')
+        self.assertEqual(entity.version, 1)
+        self.assertIs(entity.check_version(None), entity)
+        self.assertIs(entity.check_version(1), entity)
+        with self.assertRaises(VersionConflictException):
+            entity.check_version(2)
+
+    def test_restore(self):
+        unique_entity_id = UniqueEntityId()
+        entity = StubEntity.restore(
+            unique_entity_id=unique_entity_id, prop1='value1', prop2='value2')
+        self.assertEqual(entity, StubEntity(
+            unique_entity_id=unique_entity_id, prop1='value1', prop2='value2'))
+        self.assertFalse(entity.is_dirty)
+
+        entity = StubEntity.restore(prop1='value1', prop2='value2')
+        self.assertIsInstance(entity.unique_entity_id, UniqueEntityId)
+        self.assertEqual(entity.version, 1)
+
+        with self.assertRaises(TypeError):
+            StubEntity.restore(prop1='value1')
+
+    def test_copy(self):
+        entity = StubEntity(prop1='value1', prop2='value2')
+        entity._set('prop1', 'changed')  # pylint: disable=protected-access
+        entity.record_event(DomainEvent(entity_id=entity.id))
+        entity_copy = entity.copy()
+        self.assertIsNot(entity_copy, entity)
+        self.assertEqual(entity_copy, entity)
+        self.assertEqual(entity_copy.dirty_fields, {'prop1'})
+        self.assertEqual(entity_copy.events, entity.events)
+
+        entity_copy._set('prop2', 'changed')  # pylint: disable=protected-access
+        entity_copy.pull_events()
+        self.assertEqual(entity.prop2, 'value2')
+        self.assertEqual(entity.dirty_fields, {'prop1'})
+        self.assertEqual(len(entity.events), 1)
+
+    def test_record_and_pull_events(self):
+        entity = StubEntity(prop1='value1', prop2='value2')
+        self.assertEqual(entity.events, ())
+        self.assertEqual(entity.pull_events(), [])
+
+        events = [DomainEvent(entity_id=entity.id), DomainEvent(entity_id=entity.id)]
+        entity.record_event(events[0]).record_event(events[1])
+        self.assertEqual(entity.events, tuple(events))
+        self.assertEqual(events[0].event_type, 'DomainEvent')
+
+        self.assertEqual(entity.pull_events(), events)
+        self.assertEqual(entity.events, ())
+        self.assertEqual(entity, StubEntity(
+            unique_entity_id=entity.unique_entity_id, prop1='value1', prop2='value2'))
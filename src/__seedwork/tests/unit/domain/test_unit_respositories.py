@@ -1,21 +1,30 @@
-# pylint: disable=unexpected-keyword-arg, protected-access
+# pylint: disable=unexpected-keyword-arg, protected-access, too-many-lines
 
 from dataclasses import dataclass
-from typing import List, Optional
+from datetime import datetime
+from threading import Event, Thread
+from typing import Any, Dict, List, Optional, Tuple
 import unittest
+from unittest.mock import patch
 
+from __seedwork.domain.change_feed import ChangeFeed
 from __seedwork.domain.entities import Entity
-from __seedwork.domain.exceptions import NotFoundExeption
+from __seedwork.domain.exceptions import (
+    EntityValidationException, NotFoundExeption, VersionConflictException
+)
 from __seedwork.domain.repositories import (
     ET,
     Filter,
+    InMemoryIndex,
     InMemoryRepository,
     InMemorySearchRepository,
     RepositoryInterface,
     SearchParams,
     SearchResult,
-    SearchableRepositoryInterface
+    SearchableRepositoryInterface,
+    parse_sort
 )
+from __seedwork.domain.specifications import Contains, Eq, Range
 from __seedwork.domain.value_objects import UniqueEntityId
 
 
@@ -29,6 +38,13 @@ class TestRepositoryInterfaceUnit(unittest.TestCase):
             assert_error.exception.args[0], "Can't instantiate abstract class RepositoryInterface"
             " with abstract methods delete, find_all, find_by_id, insert, update")
 
+    def test_exists(self):
+        entity = StubEntity(name='test', price=5)
+        with patch.object(StubInMemoryRepository, 'find_by_id', return_value=entity):
+            self.assertTrue(RepositoryInterface.exists(StubInMemoryRepository(), entity.id))
+        with patch.object(StubInMemoryRepository, 'find_by_id', side_effect=NotFoundExeption()):
+            self.assertFalse(RepositoryInterface.exists(StubInMemoryRepository(), entity.id))
+
 
 @dataclass(frozen=True, kw_only=True, slots=True)
 class StubEntity(Entity):
@@ -40,6 +56,41 @@ class StubInMemoryRepository(InMemoryRepository[StubEntity]):
     pass
 
 
+class StubPriceIndex(InMemoryIndex[StubEntity]):
+
+    def __init__(self):
+        self.prices = {}
+        self.rebuilds = 0
+        self.bulk_adds = 0
+
+    def add(self, entity: StubEntity) -> None:
+        self.prices[entity.id] = entity.price
+
+    def discard(self, entity: StubEntity) -> None:
+        self.prices.pop(entity.id, None)
+
+    def clear(self) -> None:
+        self.prices.clear()
+
+    def add_many(self, entities) -> None:
+        self.bulk_adds += 1
+        super().add_many(entities)
+
+    def rebuild(self, items) -> None:
+        self.rebuilds += 1
+        super().rebuild(items)
+
+
+class StubIndexedInMemoryRepository(InMemoryRepository[StubEntity]):
+
+    def _create_indexes(self):
+        return (StubPriceIndex(),)
+
+    @property
+    def prices(self):
+        return self._get_index(StubPriceIndex).prices
+
+
 class TestInMemoryRespositoryUnit(unittest.TestCase):
     repo: StubInMemoryRepository
 
@@ -54,6 +105,12 @@ class TestInMemoryRespositoryUnit(unittest.TestCase):
         self.repo.insert(entity)
         self.assertEqual(self.repo.items[0], entity)
 
+    def test_bulk_insert(self):
+        entities = [StubEntity(name='test', price=5),
+                    StubEntity(name='other', price=1)]
+        self.repo.bulk_insert(entities)
+        self.assertEqual(self.repo.items, entities)
+
     def test_raise_not_found_exception_in_find_by_id(self):
         with self.assertRaises(NotFoundExeption) as assert_error:
             self.repo.find_by_id('fake id')
@@ -78,6 +135,28 @@ class TestInMemoryRespositoryUnit(unittest.TestCase):
         entity_found = self.repo.find_by_id(entity.unique_entity_id)
         self.assertEqual(entity_found, entity)
 
+    def test_exists(self):
+        entity = StubEntity(name='test', price=5)
+        self.assertFalse(self.repo.exists(entity.id))
+        self.repo.insert(entity)
+        self.assertTrue(self.repo.exists(entity.id))
+        self.assertTrue(self.repo.exists(entity.unique_entity_id))
+        self.assertFalse(self.repo.exists('fake id'))
+
+        self.repo.delete(entity.id)
+        self.assertFalse(self.repo.exists(entity.id))
+
+        self.repo.items = [entity]
+        self.assertTrue(self.repo.exists(entity.id))
+
+    def test_lookups_by_id_do_not_scan_the_items(self):
+        entities = [StubEntity(name='test', price=index) for index in range(10)]
+        self.repo.bulk_insert(entities)
+        with patch.object(StubEntity, '__eq__') as spy_eq:
+            self.assertIs(self.repo.find_by_id(entities[-1].id), entities[-1])
+            self.assertTrue(self.repo.exists(entities[-1].id))
+            spy_eq.assert_not_called()
+
     def test_find_by_all(self):
         entity = StubEntity(name='test', price=5)
         self.repo.insert(entity)
@@ -102,6 +181,92 @@ class TestInMemoryRespositoryUnit(unittest.TestCase):
 
         self.assertEqual(entity_updated, self.repo.items[0])
 
+    def test_update_checks_and_bumps_version(self):
+        entity = StubEntity(name='test', price=5)
+        self.repo.insert(entity)
+
+        stale_entity = StubEntity(
+            unique_entity_id=entity.unique_entity_id, name='stale', price=1)
+        entity_updated = StubEntity(
+            unique_entity_id=entity.unique_entity_id, name='updated', price=1)
+        self.repo.update(entity_updated)
+        self.assertEqual(entity_updated.version, 2)
+
+        with self.assertRaises(VersionConflictException):
+            self.repo.update(stale_entity)
+        with self.assertRaises(VersionConflictException):
+            self.repo.update(entity_updated, expected_version=1)
+        self.assertIs(self.repo.items[0], entity_updated)
+
+        self.repo.update(entity_updated, expected_version=2)
+        self.assertEqual(self.repo.items[0].version, 3)
+
+    def test_concurrent_updates_with_same_expected_version(self):
+        entity = StubEntity(name='test', price=5)
+        self.repo.insert(entity)
+        conflicts = []
+
+        def update():
+            try:
+                self.repo.update(entity, expected_version=1)
+            except VersionConflictException as exception:
+                conflicts.append(exception)
+
+        threads = [Thread(target=update) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(conflicts), 7)
+        self.assertEqual(entity.version, 2)
+
+    def test_delete_checks_version(self):
+        entity = StubEntity(name='test', price=5, version=2)
+        self.repo.insert(entity)
+        with self.assertRaises(VersionConflictException):
+            self.repo.delete(entity.id, expected_version=1)
+        self.repo.delete(entity.id, expected_version=2)
+        self.assertListEqual(self.repo.items, [])
+
+    def test_update_changes_skips_clean_entity(self):
+        entity = StubEntity(name='test', price=5)
+        self.repo.insert(entity)
+        with patch.object(self.repo, 'update') as spy_update:
+            self.assertFalse(self.repo.update_changes(entity))
+            spy_update.assert_not_called()
+
+    def test_update_changes_writes_only_dirty_fields(self):
+        entity = StubEntity(name='test', price=5)
+        self.repo.insert(entity)
+
+        entity_changed = StubEntity(
+            unique_entity_id=entity.unique_entity_id, name='test', price=5)
+        entity_changed._set('name', 'updated')
+        object.__setattr__(entity_changed, 'price', 10)  # not tracked
+
+        self.assertTrue(self.repo.update_changes(entity_changed))
+        self.assertIs(self.repo.items[0], entity)
+        self.assertEqual(entity.name, 'updated')
+        self.assertEqual(entity.price, 5)
+        self.assertFalse(entity_changed.is_dirty)
+        self.assertFalse(entity.is_dirty)
+
+        entity._set('price', 1)
+        self.assertTrue(self.repo.update_changes(entity))
+        self.assertEqual(self.repo.items[0].price, 1)
+        self.assertFalse(entity.is_dirty)
+        self.assertEqual(entity.version, 3)
+
+        entity._set('price', 2)
+        with self.assertRaises(VersionConflictException):
+            self.repo.update_changes(entity, expected_version=1)
+
+    def test_raise_not_found_exception_in_update_changes(self):
+        entity = StubEntity(name='test', price=5)
+        entity._set('name', 'updated')
+        with self.assertRaises(NotFoundExeption):
+            self.repo.update_changes(entity)
+
     def test_raise_not_found_exception_in_delete(self):
         entity = StubEntity(name='test', price=5)
         with self.assertRaises(NotFoundExeption) as assert_error:
@@ -114,6 +279,34 @@ class TestInMemoryRespositoryUnit(unittest.TestCase):
         self.assertEqual(
             assert_error.exception.args[0], f"Entity not found using ID '{entity.id}'")
 
+    def test_bulk_insert_valid(self):
+        entities = [StubEntity(name=name, price=1) for name in 'abc']
+        error = EntityValidationException({'name': ['Taken.']})
+
+        def conflicts(batch, changes=None):
+            # pylint: disable=unused-argument
+            return {index: error for index, entity in enumerate(batch) if entity.name == 'b'}
+
+        with patch.object(self.repo, '_write_conflicts', side_effect=conflicts):
+            self.assertEqual(self.repo.bulk_insert_valid(entities), {1: error})
+            self.assertEqual(self.repo.items, [entities[0], entities[2]])
+            with self.assertRaises(EntityValidationException):
+                self.repo.bulk_insert([StubEntity(name='b', price=1)])
+
+        # by default, entity by entity
+        others = [StubEntity(name=name, price=1) for name in 'abc']
+        insert = self.repo.insert
+
+        def insert_unless_b(entity):
+            if entity.name == 'b':
+                raise error
+            insert(entity)
+
+        with patch.object(self.repo, 'insert', side_effect=insert_unless_b):
+            self.assertEqual(
+                RepositoryInterface.bulk_insert_valid(self.repo, others), {1: error})
+        self.assertEqual(self.repo.items, [entities[0], entities[2], others[0], others[2]])
+
     def test_delete(self):
         entity = StubEntity(name='test', price=5)
 
@@ -126,6 +319,298 @@ class TestInMemoryRespositoryUnit(unittest.TestCase):
         self.assertListEqual(self.repo.items, [])
 
 
+class TestInMemoryRepositorySoftDeleteUnit(unittest.TestCase):
+    repo: StubIndexedInMemoryRepository
+
+    def setUp(self):
+        self.repo = StubIndexedInMemoryRepository(soft_delete=True)
+
+    def test_delete_leaves_a_tombstone(self):
+        entities = [StubEntity(name=name, price=index) for index, name in enumerate('abc')]
+        self.repo.bulk_insert(entities)
+        before = datetime.now()
+        self.repo.delete(entities[1].id)
+
+        self.assertEqual(self.repo.items, entities)
+        self.assertEqual(self.repo.find_all(), [entities[0], entities[2]])
+        self.assertFalse(self.repo.exists(entities[1].id))
+        with self.assertRaises(NotFoundExeption):
+            self.repo.find_by_id(entities[1].id)
+        with self.assertRaises(NotFoundExeption):
+            self.repo.delete(entities[1].id)
+        self.assertEqual(self.repo.prices, {entities[0].id: 0, entities[2].id: 2})
+
+        tombstones = self.repo.tombstones()
+        self.assertEqual(self.repo.tombstone_count, 1)
+        self.assertIs(tombstones[0].entity, entities[1])
+        self.assertTrue(before <= tombstones[0].deleted_at <= datetime.now())
+
+    def test_restore(self):
+        entity = StubEntity(name='a', price=1)
+        self.repo.insert(entity)
+        self.repo.delete(entity.id)
+        self.assertIs(self.repo.restore(entity.id), entity)
+        self.assertIs(self.repo.find_by_id(entity.id), entity)
+        self.assertEqual(self.repo.find_all(), [entity])
+        self.assertEqual(self.repo.prices, {entity.id: 1})
+        self.assertEqual(self.repo.tombstones(), [])
+
+        with self.assertRaises(NotFoundExeption) as assert_error:
+            self.repo.restore(entity.id)
+        self.assertEqual(assert_error.exception.args[0],
+                         f"Deleted entity not found using ID '{entity.id}'")
+
+        self.repo.delete(entity.id)
+        self.repo.insert(StubEntity(entity.unique_entity_id, name='b', price=2))
+        with self.assertRaises(VersionConflictException):
+            self.repo.restore(entity.id)
+
+    def test_an_id_deleted_again_keeps_each_tombstone(self):
+        entity = StubEntity(name='a', price=1)
+        self.repo.insert(entity)
+        self.repo.delete(entity.id)
+        again = StubEntity(entity.unique_entity_id, name='b', price=2)
+        self.repo.insert(again)
+        self.repo.delete(entity.id)
+
+        self.assertEqual(self.repo.find_all(), [])
+        self.assertEqual([tombstone.entity for tombstone in self.repo.tombstones()],
+                         [entity, again])
+        # the latest one is restored
+        self.assertIs(self.repo.restore(entity.id), again)
+        self.assertEqual(self.repo.find_all(), [again])
+        self.assertEqual(self.repo.compact(), 1)
+        self.assertEqual(self.repo.items, [again])
+
+    def test_update_of_an_id_inserted_again(self):
+        entity = StubEntity(name='a', price=1)
+        self.repo.insert(entity)
+        self.repo.delete(entity.id)
+        again = entity.copy()
+        self.repo.insert(again)
+        updated = StubEntity(entity.unique_entity_id, name='b', price=2)
+        self.repo.update(updated)
+
+        # the tombstoned row is equal to the live one, it is left alone
+        self.assertIs(self.repo.items[0], entity)
+        self.assertEqual(self.repo.find_all(), [updated])
+        self.assertEqual(self.repo.prices, {entity.id: 2})
+        self.assertEqual(self.repo.compact(), 1)
+        self.assertEqual(self.repo.items, [updated])
+
+    def test_writes_keep_the_live_rows_in_step(self):
+        entities = [StubEntity(name=name, price=1) for name in 'abcd']
+        self.repo.bulk_insert(entities)
+        self.repo.delete(entities[0].id)
+        self.assertEqual(self.repo.find_all(), entities[1:])
+
+        with patch.object(self.repo, '_rebuild_live') as spy_rebuild_live:
+            other = StubEntity(name='e', price=1)
+            self.repo.insert(other)
+            self.assertEqual(self.repo.find_all(), [*entities[1:], other])
+            self.repo.delete(entities[2].id)
+            self.assertEqual(self.repo.find_all(), [entities[1], entities[3], other])
+            entities[1]._set('price', 2)
+            self.repo.update_changes(entities[1])
+            self.repo.delete(entities[3].id)
+            self.assertEqual(self.repo.find_all(), [entities[1], other])
+            spy_rebuild_live.assert_not_called()
+
+        # a replaced row keeps its place
+        updated = StubEntity(entities[1].unique_entity_id, name='f', price=3)
+        self.repo.update(updated, expected_version=2)
+        self.assertEqual(self.repo.find_all(), [updated, other])
+        self.assertEqual(self.repo.compact(), 3)
+        self.assertEqual(self.repo.items, [updated, other])
+
+    def test_compact(self):
+        entities = [StubEntity(name=name, price=1) for name in 'abcd']
+        self.repo.bulk_insert(entities)
+        stored = self.repo.items
+        self.assertEqual(self.repo.compact(), 0)
+        self.repo.delete(entities[0].id)
+        self.repo.delete(entities[2].id)
+
+        self.assertEqual(self.repo.compact(), 2)
+        self.assertIs(self.repo.items, stored)
+        self.assertEqual(self.repo.items, [entities[1], entities[3]])
+        self.assertEqual(self.repo.tombstones(), [])
+        self.assertEqual(self.repo._get_index(StubPriceIndex).rebuilds, 1)
+        with self.assertRaises(NotFoundExeption):
+            self.repo.restore(entities[0].id)
+
+    def test_tombstones_are_kept_out_of_a_rebuild(self):
+        entities = [StubEntity(name=name, price=1) for name in 'abc']
+        self.repo.bulk_insert(entities)
+        self.repo.delete(entities[0].id)
+        self.repo.items.append(StubEntity(name='d', price=2))
+        self.assertFalse(self.repo.exists(entities[0].id))
+        self.assertEqual(len(self.repo.prices), 3)
+
+        # a new list drops the tombstones of the old one
+        self.repo.items = list(entities)
+        self.assertTrue(self.repo.exists(entities[0].id))
+        self.assertEqual(self.repo.tombstones(), [])
+
+
+class TestInMemoryRepositoryChangeFeedUnit(unittest.TestCase):
+
+    def test_writes_are_published_in_order(self):
+        feed = ChangeFeed()
+        repo = StubInMemoryRepository(change_feed=feed)
+        entity = StubEntity(name='test', price=5)
+        others = [StubEntity(name='test', price=1), StubEntity(name='test', price=2)]
+
+        repo.insert(entity)
+        repo.bulk_insert(others)
+        repo.update(entity)
+        object.__setattr__(others[0], 'price', 10)
+        # pylint: disable=protected-access
+        repo._update_fields(others[0], frozenset(['price']))
+        repo.delete(others[1].id)
+
+        self.assertEqual(
+            [(event.sequence, event.type, event.entity_id, event.version, event.fields)
+             for event in feed.read()],
+            [
+                (1, 'insert', entity.id, 1, None),
+                (2, 'insert', others[0].id, 1, None),
+                (3, 'insert', others[1].id, 1, None),
+                (4, 'update', entity.id, 2, None),
+                (5, 'update', others[0].id, 2, frozenset(['price'])),
+                (6, 'delete', others[1].id, 1, None),
+            ])
+
+    def test_failed_writes_are_not_published(self):
+        feed = ChangeFeed()
+        repo = StubInMemoryRepository(change_feed=feed)
+        entity = StubEntity(name='test', price=5)
+        repo.insert(entity)
+        with self.assertRaises(VersionConflictException):
+            repo.update(entity, expected_version=5)
+        with self.assertRaises(NotFoundExeption):
+            repo.delete('af46842e-027d-4c91-b259-3a3642144ba4')
+        self.assertEqual(feed.last_sequence, 1)
+
+    def test_consumer_follows_the_feed(self):
+        feed = ChangeFeed()
+        repo = StubInMemoryRepository(change_feed=feed)
+        subscription = feed.subscribe()
+        prices = {}
+
+        def apply_changes():
+            for event in subscription.poll():
+                if event.type == 'delete':
+                    prices.pop(event.entity_id)
+                else:
+                    prices[event.entity_id] = event.entity.price
+
+        entities = [StubEntity(name='test', price=price) for price in range(3)]
+        repo.bulk_insert(entities)
+        apply_changes()
+        repo.delete(entities[0].id)
+        object.__setattr__(entities[1], 'price', 10)
+        repo.update(entities[1])
+        apply_changes()
+        self.assertEqual(prices, {entities[1].id: 10, entities[2].id: 2})
+
+
+class TestInMemoryIndexUnit(unittest.TestCase):
+
+    def test_indexes_follow_the_writes(self):
+        repo = StubIndexedInMemoryRepository()
+        entity = StubEntity(name='test', price=5)
+        repo.insert(entity)
+        self.assertEqual(repo.prices, {entity.id: 5})
+
+        entities = [StubEntity(name='test', price=1), StubEntity(name='test', price=2)]
+        repo.bulk_insert(entities)
+        self.assertEqual(repo.prices, {entity.id: 5, entities[0].id: 1, entities[1].id: 2})
+
+        object.__setattr__(entity, 'price', 10)
+        repo.update(entity)
+        self.assertEqual(repo.prices[entity.id], 10)
+
+        updated = StubEntity(
+            unique_entity_id=entities[0].unique_entity_id, name='test', price=7)
+        repo.update(updated)
+        self.assertEqual(repo.prices[entities[0].id], 7)
+
+        # pylint: disable=protected-access
+        repo._update_fields(
+            StubEntity(unique_entity_id=entities[1].unique_entity_id,
+                       name='test', price=8, version=1),
+            frozenset(['price']))
+        self.assertEqual(repo.prices[entities[1].id], 8)
+
+        repo.delete(entity.id)
+        self.assertEqual(repo.prices, {entities[0].id: 7, entities[1].id: 8})
+        self.assertEqual(repo._get_index(StubPriceIndex).rebuilds, 1)
+        # the first build and the bulk_insert
+        self.assertEqual(repo._get_index(StubPriceIndex).bulk_adds, 2)
+
+    def test_failed_writes_keep_the_indexes(self):
+        repo = StubIndexedInMemoryRepository()
+        entity = StubEntity(name='test', price=5)
+        repo.insert(entity)
+        with self.assertRaises(VersionConflictException):
+            repo.update(StubEntity(
+                unique_entity_id=entity.unique_entity_id, name='test', price=1, version=3))
+        with self.assertRaises(NotFoundExeption):
+            repo.delete('af46842e-027d-4c91-b259-3a3642144ba4')
+        self.assertEqual(repo.prices, {entity.id: 5})
+
+    def test_indexes_rebuild_when_items_change_directly(self):
+        repo = StubIndexedInMemoryRepository()
+        entity = StubEntity(name='test', price=5)
+        repo.items = [entity]
+        self.assertEqual(repo.prices, {entity.id: 5})
+
+        other = StubEntity(name='test', price=1)
+        repo.items.append(other)
+        self.assertEqual(repo.prices, {entity.id: 5, other.id: 1})
+
+        repo.insert(StubEntity(name='test', price=2))
+        self.assertEqual(len(repo.prices), 3)
+        # pylint: disable=protected-access
+        self.assertEqual(repo._get_index(StubPriceIndex).rebuilds, 2)
+
+    def test_reads_wait_for_the_write_lock_only_to_rebuild(self):
+        repo = StubIndexedInMemoryRepository()
+        entity = StubEntity(name='test', price=5)
+        repo.insert(entity)
+        release, held = Event(), Event()
+
+        def hold_the_lock():
+            with repo._write_lock:
+                held.set()
+                release.wait()
+
+        writer = Thread(target=hold_the_lock)
+        writer.start()
+        held.wait()
+        try:
+            reader = Thread(target=repo.find_by_id, args=(entity.id,))
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+
+            repo.items.append(StubEntity(name='test', price=1))
+            reader = Thread(target=repo.find_by_id, args=(entity.id,))
+            reader.start()
+            reader.join(timeout=0.1)
+            self.assertTrue(reader.is_alive())
+        finally:
+            release.set()
+            writer.join()
+        reader.join()
+        self.assertEqual(len(repo.prices), 2)
+
+    def test_repository_without_indexes(self):
+        # pylint: disable=protected-access
+        self.assertEqual(StubInMemoryRepository()._synced_indexes(), ())
+
+
 class TestSearchableRepositoryInterface(unittest.TestCase):
 
     def test_raise_error_when_methods_not_implemented(self):
@@ -151,8 +636,30 @@ class TestSearchParams(unittest.TestCase):
             'sort': Optional[str],
             'sort_dir': Optional[str],
             'filter': Optional[Filter],
+            'facets': Optional[Tuple[str, ...]],
         })
 
+    def test_sort_fields_prop(self):
+        self.assertEqual(SearchParams().sort_fields, ())
+
+        arrange = [
+            {'sort': 'name', 'sort_dir': None, 'expected': (('name', 'asc'),)},
+            {'sort': 'name', 'sort_dir': 'DESC', 'expected': (('name', 'desc'),)},
+            {'sort': 'name,-created_at', 'sort_dir': None,
+             'expected': (('name', 'asc'), ('created_at', 'desc'))},
+            {'sort': ' -name , +created_at,price ', 'sort_dir': 'desc',
+             'expected': (('name', 'desc'), ('created_at', 'asc'), ('price', 'desc'))},
+            {'sort': 'name,,-,-name', 'sort_dir': None, 'expected': (('name', 'asc'),)},
+        ]
+        for item in arrange:
+            params = SearchParams(sort=item['sort'], sort_dir=item['sort_dir'])
+            self.assertEqual(params.sort_fields, item['expected'], msg=item['sort'])
+
+    def test_parse_sort(self):
+        self.assertEqual(parse_sort(None), ())
+        self.assertEqual(parse_sort(''), ())
+        self.assertEqual(parse_sort('-name'), (('name', 'desc'),))
+
     def test_page_prop(self):
         params = SearchParams()
         self.assertEqual(params.page, 1)
@@ -268,6 +775,25 @@ class TestSearchParams(unittest.TestCase):
                 params.filter, item['expected'],
                 msg=f"filter = {item['filter']}")
 
+        spec = Eq('name', 'fake')
+        self.assertIs(SearchParams(filter=spec).filter, spec)
+
+    def test_facets_prop(self):
+        params = SearchParams()
+        self.assertIsNone(params.facets)
+
+        arrange = [
+            {'facets': None, 'expected': None},
+            {'facets': '', 'expected': None},
+            {'facets': (), 'expected': None},
+            {'facets': ('price',), 'expected': ('price',)},
+            {'facets': ['name', 'price', 'name'], 'expected': ('name', 'price')},
+            {'facets': 'name, price,', 'expected': ('name', 'price')},
+        ]
+        for item in arrange:
+            params = SearchParams(facets=item['facets'])
+            self.assertEqual(params.facets, item['expected'], msg=f"facets = {item['facets']}")
+
 
 class TestSearchResult(unittest.TestCase):
 
@@ -281,6 +807,7 @@ class TestSearchResult(unittest.TestCase):
             'sort': Optional[str],
             'sort_dir': Optional[str],
             'filter': Optional[Filter],
+            'facets': Optional[Dict[str, Dict[Any, int]]],
         })
 
     def test_constructor(self):
@@ -299,7 +826,8 @@ class TestSearchResult(unittest.TestCase):
             'last_page': 2,
             'sort': None,
             'sort_dir': None,
-            'filter': None
+            'filter': None,
+            'facets': None
         })
 
         result = SearchResult(
@@ -319,7 +847,8 @@ class TestSearchResult(unittest.TestCase):
             'last_page': 2,
             'sort': 'name',
             'sort_dir': 'asc',
-            'filter': 'test'
+            'filter': 'test',
+            'facets': None
         })
 
     def test_when_per_page_is_greather_than_total(self):
@@ -343,6 +872,7 @@ class TestSearchResult(unittest.TestCase):
 
 class StubInMemorySearchableRepository(InMemorySearchRepository[StubEntity, str]):
     sortable_fields = ['name']
+    facetable_fields = ['price']
 
     def _apply_filter(self, items: List[StubEntity], filter_param: str) -> List[ET]:
         if filter_param:
@@ -352,6 +882,32 @@ class StubInMemorySearchableRepository(InMemorySearchRepository[StubEntity, str]
         return items
 
 
+class StubNameIndex(InMemoryIndex[StubEntity]):
+
+    def __init__(self):
+        self.names: Dict[str, List[StubEntity]] = {}
+
+    def add(self, entity: StubEntity) -> None:
+        self.names.setdefault(entity.name, []).append(entity)
+
+    def discard(self, entity: StubEntity) -> None:
+        self.names[entity.name].remove(entity)
+
+    def clear(self) -> None:
+        self.names.clear()
+
+    def lookup(self, spec):
+        if isinstance(spec, Eq) and spec.field == 'name':
+            return list(self.names.get(spec.value, ()))
+        return None
+
+
+class StubIndexedInMemorySearchableRepository(StubInMemorySearchableRepository):
+
+    def _create_indexes(self):
+        return (StubNameIndex(),)
+
+
 class TestInMemorySearchableRepository(unittest.TestCase):
     repo: StubInMemorySearchableRepository
 
@@ -400,6 +956,30 @@ class TestInMemorySearchableRepository(unittest.TestCase):
         result = self.repo._apply_sort(items, 'price', 'desc')
         self.assertEqual([items[2], items[0], items[1]], result)
 
+    def test__apply_sort_by_many_fields(self):
+        self.repo.sortable_fields = ['name', 'price']
+        items = [
+            StubEntity(name='b', price=1),
+            StubEntity(name='a', price=2),
+            StubEntity(name='b', price=3),
+            StubEntity(name='a', price=1),
+        ]
+        arrange = [
+            {'sort': 'name,price', 'expected': [3, 1, 0, 2]},
+            {'sort': 'name,-price', 'expected': [1, 3, 2, 0]},
+            {'sort': '-name,price', 'expected': [0, 2, 3, 1]},
+            {'sort': '-name,-price', 'expected': [2, 0, 1, 3]},
+            {'sort': 'price,-name', 'expected': [0, 3, 1, 2]},
+            {'sort': 'fake,-price,fake2', 'expected': [2, 1, 0, 3]},
+            {'sort': 'fake', 'expected': [0, 1, 2, 3]},
+        ]
+        for item in arrange:
+            result = self.repo._apply_sort(items, item['sort'], None)
+            self.assertEqual(result, [items[index] for index in item['expected']],
+                             msg=item['sort'])
+        self.assertEqual(
+            [item.name for item in items], ['b', 'a', 'b', 'a'], msg='input left unsorted')
+
     def test__apply_paginate(self):
         items = [
             StubEntity(name='a', price=1),
@@ -604,3 +1184,187 @@ class TestInMemorySearchableRepository(unittest.TestCase):
             sort_dir='asc',
             filter='TEST'
         ))
+
+    def test_search_with_facets(self):
+        items = [
+            StubEntity(name='test', price=1),
+            StubEntity(name='a', price=2),
+            StubEntity(name='TEST', price=1),
+            StubEntity(name='TeSt', price=3),
+        ]
+        self.repo.items = items
+
+        result = self.repo.search(SearchParams(per_page=1, filter='test', facets='price,name'))
+        self.assertEqual(result.items, [items[0]])
+        # over every filtered item, not only the page; name is not facetable
+        self.assertEqual(result.facets, {'price': {1: 2, 3: 1}})
+
+        result = self.repo.search(SearchParams(facets='name'))
+        self.assertIsNone(result.facets)
+
+    def test_search_stream(self):
+        items = [
+            StubEntity(name='test', price=1),
+            StubEntity(name='a', price=1),
+            StubEntity(name='TEST', price=1),
+            StubEntity(name='e', price=1),
+            StubEntity(name='TeSt', price=1)
+        ]
+        self.repo.items = items
+
+        with patch.object(self.repo, '_apply_sort', wraps=self.repo._apply_sort) as spy_sort:
+            chunks = self.repo.search_stream(SearchParams(
+                per_page=2, sort='name', filter='TEST'))
+            spy_sort.assert_not_called()
+            self.assertEqual(list(chunks), [[items[2], items[4]], [items[0]]])
+            spy_sort.assert_called_once()
+
+        self.assertEqual(
+            list(self.repo.search_stream(SearchParams(per_page=2, page=3))),
+            [[items[4]]])
+        self.assertEqual(
+            list(self.repo.search_stream(SearchParams(filter='fake'))), [])
+
+    def test_search_stream_is_a_snapshot(self):
+        items = [StubEntity(name=name, price=1) for name in 'abcd']
+        self.repo.items = list(items)
+        chunks = self.repo.search_stream(SearchParams(per_page=2))
+        self.assertEqual(next(chunks), [items[0], items[1]])
+        self.repo.items.remove(items[0])
+        self.assertEqual(next(chunks), [items[2], items[3]])
+
+    def test_default_search_stream_pages_through_search(self):
+        items = [StubEntity(name=name, price=1) for name in 'abcde']
+        self.repo.items = items
+        params = SearchParams(per_page=2, sort='name', sort_dir='desc')
+        with patch.object(self.repo, 'search', wraps=self.repo.search) as spy_search:
+            chunks = SearchableRepositoryInterface.search_stream(self.repo, params)
+            self.assertEqual(
+                list(chunks), list(self.repo.search_stream(params)))
+            self.assertEqual(spy_search.call_count, 3)
+
+        self.repo.items = []
+        self.assertEqual(
+            list(SearchableRepositoryInterface.search_stream(self.repo, params)), [])
+
+    def test_delete_where(self):
+        feed = ChangeFeed()
+        self.repo.change_feed = feed
+        items = [StubEntity(name=name, price=price)
+                 for name, price in (('a', 1), ('b', 2), ('ab', 3), ('c', 1))]
+        self.repo.items = list(items)
+        stored = self.repo.items
+
+        self.assertEqual(self.repo.delete_where(SearchParams(filter='a', page=2)),
+                         [items[0], items[2]])
+        self.assertIs(self.repo.items, stored)
+        self.assertEqual(self.repo.items, [items[1], items[3]])
+        self.assertFalse(self.repo.exists(items[0].id))
+        self.assertTrue(self.repo.exists(items[1].id))
+        self.assertEqual(
+            [(change.type, change.entity_id) for change in feed.read()],
+            [('delete', items[0].id), ('delete', items[2].id)])
+
+        self.assertEqual(self.repo.delete_where(SearchParams(filter='fake')), [])
+        self.assertEqual(self.repo.delete_where(SearchParams()), [items[1], items[3]])
+        self.assertEqual(self.repo.items, [])
+
+    def test_update_where(self):
+        feed = ChangeFeed()
+        self.repo.change_feed = feed
+        items = [StubEntity(name=name, price=price)
+                 for name, price in (('a', 1), ('b', 2), ('ab', 3))]
+        self.repo.items = list(items)
+
+        updated = self.repo.update_where(SearchParams(filter='a'), {'price': 3})
+        self.assertEqual(updated, [items[0]])
+        self.assertEqual([item.price for item in self.repo.items], [3, 2, 3])
+        self.assertEqual([item.version for item in self.repo.items], [2, 1, 1])
+        changes = feed.read()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].entity_id, items[0].id)
+        self.assertEqual(changes[0].fields, frozenset({'price'}))
+
+        # an equal value of another type is a change
+        self.assertEqual(self.repo.update_where(SearchParams(), {'price': 3.0}), items)
+        self.assertEqual(self.repo.update_where(SearchParams(filter='fake'), {'price': 1}), [])
+        # the entities are changed in place, the published events keep what was written
+        self.assertEqual(
+            [(change.entity.version, type(change.entity.price)) for change in feed.read()
+             if change.entity_id == items[0].id],
+            [(2, int), (3, float)])
+
+    def test_default_where_operations_write_entity_by_entity(self):
+        items = [StubEntity(name=name, price=1) for name in ('a', 'b', 'ab')]
+        self.repo.items = list(items)
+        params = SearchParams(filter='a', per_page=1)
+
+        with patch.object(self.repo, 'update_changes',
+                          wraps=self.repo.update_changes) as spy_update:
+            updated = SearchableRepositoryInterface.update_where(
+                self.repo, params, {'name': 'b', 'price': 1})
+            self.assertEqual(updated, [items[0], items[2]])
+            self.assertEqual(spy_update.call_count, 2)
+        self.assertEqual([item.name for item in self.repo.items], ['b', 'b', 'b'])
+        self.assertFalse(any(item.is_dirty for item in self.repo.items))
+
+        with patch.object(self.repo, 'delete', wraps=self.repo.delete) as spy_delete:
+            deleted = SearchableRepositoryInterface.delete_where(
+                self.repo, SearchParams(filter='b', per_page=1))
+            self.assertEqual(deleted, items)
+            self.assertEqual(spy_delete.call_count, 3)
+        self.assertEqual(self.repo.items, [])
+
+    def test_soft_delete(self):
+        items = [StubEntity(name=name, price=1) for name in ('a', 'b', 'ab', 'c')]
+        self.repo.soft_delete = True
+        self.repo.items = list(items)
+        self.repo.delete(items[0].id)
+
+        self.assertEqual(self.repo.search(SearchParams()).items, items[1:])
+        self.assertEqual(self.repo.search(SearchParams(filter='a')).items, [items[2]])
+        self.assertEqual(self.repo.update_where(SearchParams(filter='a'), {'price': 2}),
+                         [items[2]])
+        self.assertEqual(items[0].price, 1)
+
+        self.assertEqual(self.repo.delete_where(SearchParams(filter='b')), [items[1], items[2]])
+        self.assertEqual(len(self.repo.items), 4)
+        self.assertEqual(self.repo.tombstone_count, 3)
+        self.assertEqual(self.repo.search(SearchParams()).items, [items[3]])
+        self.assertEqual(self.repo.compact(), 3)
+        self.assertEqual(self.repo.items, [items[3]])
+
+    def test_search_by_specification(self):
+        items = [StubEntity(name=name, price=price)
+                 for name, price in (('a', 1), ('b', 2), ('ab', 3), ('c', 1))]
+        self.repo.items = list(items)
+        arrange = [
+            (Contains('name', 'A'), [items[0], items[2]]),
+            (Contains('name', 'a') & Range('price', upper=2), [items[0]]),
+            (Eq('price', 1) | Eq('name', 'b'), [items[0], items[1], items[3]]),
+            (~Contains('name', 'a'), [items[1], items[3]]),
+        ]
+        for spec, expected in arrange:
+            with self.subTest(spec=spec):
+                self.assertEqual(self.repo.search(SearchParams(filter=spec)).items, expected)
+
+        self.assertEqual(self.repo.update_where(
+            SearchParams(filter=Eq('price', 1)), {'price': 2}), [items[0], items[3]])
+        self.assertEqual(self.repo.delete_where(SearchParams(filter=Eq('price', 2))),
+                         [items[0], items[1], items[3]])
+        self.assertEqual(self.repo.items, [items[2]])
+
+    def test_search_by_specification_selects_an_index(self):
+        repo = StubIndexedInMemorySearchableRepository()
+        items = [StubEntity(name=name, price=price)
+                 for name, price in (('a', 1), ('b', 2), ('a', 3), ('c', 1))]
+        repo.bulk_insert(items)
+
+        spec = Range('price', lower=2) & Eq('name', 'a')
+        self.assertEqual(repo._index_candidates(spec), [items[0], items[2]])
+        self.assertEqual(repo.search(SearchParams(filter=spec)).items, [items[2]])
+        # an or (or a not) is checked by the predicate on every item
+        self.assertIsNone(repo._index_candidates(Eq('name', 'a') | Eq('name', 'b')))
+        self.assertIsNone(repo._index_candidates(~Eq('name', 'a')))
+        self.assertEqual(
+            repo.search(SearchParams(filter=Eq('name', 'a') | Eq('name', 'b'))).items, items[:3])
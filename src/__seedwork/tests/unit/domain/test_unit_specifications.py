@@ -0,0 +1,181 @@
+# pylint: disable=unexpected-keyword-arg
+from dataclasses import dataclass
+from datetime import datetime
+import sqlite3
+from typing import Optional
+import unittest
+
+from __seedwork.domain.specifications import (
+    And,
+    Contains,
+    Eq,
+    Not,
+    Or,
+    Range,
+    Similar,
+    SqlCompiler,
+    SqlWhere,
+    compile_predicate
+)
+from __seedwork.domain.text import similarity
+
+
+@dataclass(slots=True)
+class StubRow:
+    name: str
+    price: Optional[float]
+    is_active: bool = True
+    created_at: datetime = datetime(2023, 5, 10)
+    description: Optional[str] = None
+
+
+class TestSpecificationUnit(unittest.TestCase):
+
+    def test_operators_compose_flat(self):
+        name, price, active = Contains('name', 'a'), Eq('price', 1), Eq('is_active', True)
+        self.assertEqual(name & price & active, And((name, price, active)))
+        self.assertEqual(name | (price | active), Or((name, price, active)))
+        self.assertEqual(name & (price | active), And((name, Or((price, active)))))
+        self.assertEqual(~name, Not(name))
+
+    def test_predicate(self):
+        movie = StubRow(name='Filmes de Ação', price=10)
+        arrange = [
+            (Eq('price', 10), True),
+            (Eq('price', 5), False),
+            (Contains('name', 'ACAO'), True),
+            (Contains('name', 'drama'), False),
+            (Range('price', 10, 20), True),
+            (Range('price', upper=9), False),
+            (Range('created_at', lower=datetime(2023, 5, 10)), True),
+            (Range('price'), True),
+            (Similar('name', 'Filmes de Acao'), True),
+            (Similar('name', 'Drama'), False),
+            (Contains('name', 'filmes') & Eq('is_active', False), False),
+            (Contains('name', 'drama') | Eq('price', 10), True),
+            (~Eq('price', 10), False),
+            (And(()), True),
+            (Or(()), False),
+        ]
+        for spec, expected in arrange:
+            with self.subTest(spec=spec):
+                self.assertIs(compile_predicate(spec)(movie), expected)
+                self.assertIs(spec.is_satisfied_by(movie), expected)
+
+    def test_predicate_with_a_none_field(self):
+        # unknown, as SQL compares NULL: neither the spec nor its negation match
+        row = StubRow(name='Movie', price=None)
+        arrange = [
+            (Eq('description', 'x'), None),
+            (Contains('description', 'x'), None),
+            (Range('price', 1), None),
+            (Range('price'), True),
+            (Similar('description', 'x'), None),
+            (Eq('description', None), True),
+            (~Eq('description', 'x'), None),
+            (~Eq('description', None), False),
+            (Eq('description', 'x') & Eq('name', 'Movie'), None),
+            (Eq('description', 'x') & Eq('name', 'Drama'), False),
+            (Eq('description', 'x') | Eq('name', 'Movie'), True),
+            (Eq('description', 'x') | Eq('name', 'Drama'), None),
+        ]
+        for spec, expected in arrange:
+            with self.subTest(spec=spec):
+                self.assertIs(compile_predicate(spec)(row), expected)
+                self.assertIs(spec.is_satisfied_by(row), expected is True)
+
+    def test_predicate_is_compiled_once(self):
+        spec = Contains('name', 'a') & Range('price', 1, 2)
+        self.assertIs(compile_predicate(spec),
+                      compile_predicate(Contains('name', 'a') & Range('price', 1, 2)))
+
+
+class TestSqlCompilerUnit(unittest.TestCase):
+    compiler: SqlCompiler
+
+    def setUp(self):
+        self.compiler = SqlCompiler(
+            {'name': 'name', 'price': 'price', 'is_active': 'is_active'})
+
+    def test_compile(self):
+        arrange = [
+            (Eq('price', 10), SqlWhere('price = %s', (10,))),
+            (Eq('name', None), SqlWhere('name IS NULL', ())),
+            (Contains('name', 'Mo_vie 50%'),
+             SqlWhere("LOWER(name) LIKE %s ESCAPE '\\'", ('%mo\\_vie 50\\%%',))),
+            (Range('price', 1, 2), SqlWhere('(price >= %s AND price <= %s)', (1, 2))),
+            (Range('price', upper=2), SqlWhere('price <= %s', (2,))),
+            (Range('price'), SqlWhere('1 = 1', ())),
+            (Similar('name', 'movie', 0.4), SqlWhere('similarity(name, %s) >= %s', ('movie', 0.4))),
+            (Eq('is_active', True) & (Eq('price', 1) | ~Contains('name', 'a')),
+             SqlWhere("(is_active = %s AND (price = %s OR NOT LOWER(name) LIKE %s ESCAPE '\\'))",
+                      (True, 1, '%a%'))),
+            (And((Eq('price', 1),)), SqlWhere('price = %s', (1,))),
+            (And(()), SqlWhere('1 = 1', ())),
+            (Or(()), SqlWhere('1 = 0', ())),
+        ]
+        for spec, expected in arrange:
+            with self.subTest(spec=spec):
+                self.assertEqual(self.compiler.compile(spec), expected)
+
+    def test_compile_with_columns_and_placeholder(self):
+        compiler = SqlCompiler({'name': 'c.title', 'price': 'c.price'}, placeholder='?')
+        self.assertEqual(
+            compiler.compile(Contains('name', 'a') & Range('price', 1)),
+            SqlWhere("(LOWER(c.title) LIKE ? ESCAPE '\\' AND c.price >= ?)", ('%a%', 1)))
+
+    def test_raise_error_when_field_has_no_column(self):
+        with self.assertRaises(ValueError) as assert_error:
+            self.compiler.compile(Eq('price', 1) & Eq('name; DROP TABLE x', 1))
+        self.assertEqual(assert_error.exception.args[0],
+                         "Field 'name; DROP TABLE x' has no column")
+
+
+class TestSpecificationSqlParityUnit(unittest.TestCase):
+    # the in-memory predicate and the compiled WHERE clause, run by sqlite,
+    # match the same rows, NULL fields included
+    connection: sqlite3.Connection
+    rows = [
+        StubRow(name='Movie', price=10),
+        StubRow(name='Drama', price=None, description='Some drama'),
+        StubRow(name='Documentary', price=5, description='x'),
+    ]
+
+    def setUp(self):
+        self.connection = sqlite3.connect(':memory:')
+        self.addCleanup(self.connection.close)
+        # strict, as pg_trgm's: NULL in, NULL out
+        self.connection.create_function(
+            'similarity', 2,
+            lambda text, other: None if text is None or other is None
+            else similarity(text, other))
+        self.connection.execute('CREATE TABLE row (name TEXT, price REAL, description TEXT)')
+        self.connection.executemany(
+            'INSERT INTO row (rowid, name, price, description) VALUES (?, ?, ?, ?)',
+            [(index, row.name, row.price, row.description)
+             for index, row in enumerate(self.rows)])
+
+    def test_same_rows_match(self):
+        compiler = SqlCompiler(
+            {'name': 'name', 'price': 'price', 'description': 'description'}, placeholder='?')
+        specs = [
+            Eq('description', 'x'),
+            ~Eq('description', 'x'),
+            Eq('description', None),
+            ~Eq('description', None),
+            ~Contains('description', 'drama'),
+            ~Range('price', lower=6),
+            ~Range('price'),
+            ~Similar('description', 'drama'),
+            ~(Eq('description', 'x') & Eq('name', 'Movie')),
+            ~(Eq('description', 'x') | Range('price', upper=6)),
+            ~(Eq('description', 'x') | Eq('name', 'Drama')),
+        ]
+        for spec in specs:
+            with self.subTest(spec=spec):
+                where = compiler.compile(spec)
+                expected = [rowid for rowid, in self.connection.execute(
+                    f'SELECT rowid FROM row WHERE {where.clause} ORDER BY rowid', where.params)]
+                predicate = compile_predicate(spec)
+                self.assertEqual(
+                    [index for index, row in enumerate(self.rows) if predicate(row)], expected)
@@ -0,0 +1,39 @@
+import unittest
+from __seedwork.domain.text import collation_key, fold, similarity, trigrams
+
+
+class TestFoldUnit(unittest.TestCase):
+
+    def test_fold(self):
+        arrange = [
+            ('movie', 'movie'),
+            ('MoViE 2', 'movie 2'),
+            ('Ação', 'acao'),
+            ('AÇÃO', 'acao'),
+            ('Documentário', 'documentario'),
+            ('Straße', 'strasse'),
+            ('', ''),
+        ]
+        for text, expected in arrange:
+            self.assertEqual(fold(text), expected, msg=text)
+
+    def test_collation_key(self):
+        names = ['ação 2', 'Drama', 'acao', 'Ação', 'ab', 'ACAO', 'Ábaco']
+        self.assertEqual(sorted(names, key=collation_key),
+                         ['ab', 'Ábaco', 'ACAO', 'Ação', 'acao', 'ação 2', 'Drama'])
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams('Cat'), frozenset(['  c', ' ca', 'cat', 'at ']))
+        self.assertEqual(trigrams('CAT, cat!'), trigrams('cat'))
+        self.assertEqual(trigrams('Ação'), trigrams('acao'))
+        self.assertEqual(trigrams('a b'), frozenset(['  a', ' a ', '  b', ' b ']))
+        self.assertEqual(trigrams(''), frozenset())
+        self.assertEqual(trigrams('!?'), frozenset())
+
+    def test_similarity(self):
+        self.assertEqual(similarity('Movie', 'MOVIE'), 1.0)
+        self.assertEqual(similarity('Movie', 'Drama'), 0.0)
+        self.assertEqual(similarity('', ''), 0.0)
+        self.assertAlmostEqual(similarity('Acton', 'Action'), 4 / 9)
+        self.assertGreater(similarity('Documentry', 'Documentary'),
+                           similarity('Documentry', 'Drama'))
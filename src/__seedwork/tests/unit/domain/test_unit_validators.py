@@ -1,10 +1,16 @@
 from dataclasses import fields
 import unittest
 from unittest.mock import MagicMock, PropertyMock, patch
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import CharField, DateTimeField, Serializer
 
 from __seedwork.domain.exceptions import ValidationException
-from __seedwork.domain.validators import DRFValidator, ValidatorFieldsInterface, ValidatorRules
+from __seedwork.domain.drf_validators import (
+    DRFValidator,
+    StrictBooleanField,
+    StrictCharField,
+    plain_validity_check
+)
+from __seedwork.domain.validators import ValidatorFieldsInterface, ValidatorRules
 
 
 class TestValidatorRulesUnit(unittest.TestCase):
@@ -202,3 +208,52 @@ class TestDRFValidatorUnit(unittest.TestCase):
         self.assertEqual(validator.errors,
                          mock_validated_data.return_value)
         mock_is_valid.assert_called()
+
+
+class StubRules(Serializer):  # pylint: disable=abstract-method
+    title = StrictCharField(min_length=2, max_length=5)
+    note = StrictCharField(required=False, allow_null=True, allow_blank=True,
+                           trim_whitespace=False)
+    flag = StrictBooleanField(required=False)
+    code = CharField(required=False, validators=[lambda value: None])
+    at = DateTimeField(required=False)  # pylint: disable=invalid-name
+
+
+class StubRequiredDateRules(Serializer):  # pylint: disable=abstract-method
+    at = DateTimeField()  # pylint: disable=invalid-name
+
+
+class TestPlainValidityCheckUnit(unittest.TestCase):
+
+    def test_is_derived_from_the_serializer_fields(self):
+        is_plainly_valid = plain_validity_check(StubRules)
+        arrange = [
+            ({'title': 'ab'}, True),
+            ({'title': ' abcde '}, True),
+            ({'title': 'a'}, False),
+            ({'title': 'abcdef'}, False),
+            ({'title': '  '}, False),
+            ({'title': 'ação'}, False),
+            ({'title': 'a\x00b'}, False),
+            ({'title': 5}, False),
+            ({}, False),
+            ({'title': 'ab', 'note': None}, True),
+            ({'title': 'ab', 'note': ''}, True),
+            ({'title': 'ab', 'note': 5}, False),
+            ({'title': 'ab', 'flag': False}, True),
+            ({'title': 'ab', 'flag': None}, False),
+            ({'title': 'ab', 'flag': 1}, False),
+            ({'title': 'ab', 'code': 'x'}, False),
+            ({'title': 'ab', 'at': None}, False),
+            ({'title': 'ab', 'unknown': 1}, False),
+        ]
+        for item, expected in arrange:
+            self.assertIs(is_plainly_valid(item), expected, msg=f'data: {item}')
+            if expected:
+                self.assertTrue(StubRules(data=item).is_valid(), msg=f'data: {item}')
+
+    def test_nothing_is_plainly_valid_when_a_required_field_is_not_plain(self):
+        self.assertFalse(plain_validity_check(StubRequiredDateRules)({'at': None}))
+
+    def test_is_cached_per_serializer(self):
+        self.assertIs(plain_validity_check(StubRules), plain_validity_check(StubRules))
@@ -100,3 +100,26 @@ class TestUniqueEntityIdUnit(unittest.TestCase):
         with self.assertRaises(FrozenInstanceError):
             value_object = UniqueEntityId()
             value_object.id = 'fake id'
+
+    def test_canonical_bytes_representation(self):
+        uuid_value = uuid.UUID('0f42ac99-08b0-4fef-923d-9187b3762a0d')
+        value_object = UniqueEntityId(str(uuid_value))
+        self.assertEqual(value_object.raw, uuid_value.bytes)
+        self.assertEqual(UniqueEntityId(uuid_value.bytes).id, str(uuid_value))
+        self.assertEqual(
+            UniqueEntityId('0F42AC99-08B0-4FEF-923D-9187B3762A0D').id, str(uuid_value))
+
+    def test_string_rendering_is_cached(self):
+        value_object = UniqueEntityId()
+        self.assertIsNone(value_object._id)  # pylint: disable=no-member
+        rendered = value_object.id
+        self.assertIs(value_object.id, rendered)
+        self.assertIs(str(value_object), rendered)
+
+    def test_equality_and_hash(self):
+        value_object1 = UniqueEntityId('0f42ac99-08b0-4fef-923d-9187b3762a0d')
+        value_object2 = UniqueEntityId('0f42ac99-08b0-4fef-923d-9187b3762a0d')
+        self.assertEqual(value_object1, value_object2)
+        self.assertEqual(hash(value_object1), hash(value_object2))
+        self.assertNotEqual(value_object1, UniqueEntityId())
+        self.assertEqual(len({value_object1, value_object2}), 1)
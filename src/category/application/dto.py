@@ -1,7 +1,9 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, TypeVar
+from functools import cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
 from category.domain.entities import Category
 
@@ -13,6 +15,7 @@ class CategoryOutput:  # DTO
     description: Optional[str]
     is_active: bool
     created_at: datetime
+    version: int = Category.get_field('version').default
 
 
 Output = TypeVar("Output", bound=CategoryOutput)
@@ -30,11 +33,21 @@ class CategoryOutputMapper:
     def without_child():
         return CategoryOutputMapper()
 
+    @staticmethod
+    @cache
+    def projection(fields: Tuple[str, ...]) -> Callable[[Category], Dict[str, Any]]:
+        # builds only the requested fields, e.g. ('id', 'name') for a dropdown
+        getter = attrgetter(*fields)
+        if len(fields) == 1:
+            return lambda category: {fields[0]: getter(category)}
+        return lambda category: dict(zip(fields, getter(category)))
+
     def to_output(self, category: Category) -> Output:
         return self.output_child(
             id=category.id,
             name=category.name,
             description=category.description,
             is_active=category.is_active,
-            created_at=category.created_at
+            created_at=category.created_at,
+            version=category.version
         )
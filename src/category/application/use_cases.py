@@ -1,43 +1,148 @@
 # pylint: disable=unexpected-keyword-arg
 
-from dataclasses import asdict, dataclass
-from typing import Optional
-from __seedwork.application.dto import PaginationOutput, PaginationOutputMapper, SearchInput
+from dataclasses import dataclass, fields as dataclass_fields
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+from __seedwork.application.dto import (
+    UNSET,
+    PaginationOutput,
+    PaginationOutputMapper,
+    SearchInput,
+    Unset
+)
 from __seedwork.application.use_cases import UseCase
+from __seedwork.domain.exceptions import InvalidUuidException, ValidationException
+from __seedwork.domain.validators import ErrorFields
+from __seedwork.domain.value_objects import UniqueEntityId
 from category.domain.entities import Category
+from category.domain.events import CategoryDeleted, CategoryUpdated
 from category.application.dto import CategoryOutput, CategoryOutputMapper
-from category.domain.repositories import CategoryRepository
+from category.domain.repositories import CategoryFilter, CategoryRepository
+
+if TYPE_CHECKING:
+    from __seedwork.application.cache import LRUCache
+    from __seedwork.application.idempotency import IdempotencyStore
+    from __seedwork.application.outbox import OutboxInterface
+
+
+def _add_to_outbox(outbox: Optional['OutboxInterface'], *categories: Category) -> None:
+    # called right after the repository write; the events are pulled even
+    # without an outbox so they don't pile up on stored entities
+    events = [event for category in categories for event in category.pull_events()]
+    if outbox is not None and events:
+        outbox.add_all(events)
+
+
+def _cache_key(category_id: str) -> Optional[str]:
+    # outputs are cached by canonical id, whatever form the caller used; an
+    # invalid id has no key, the repository reports it as not found
+    try:
+        return UniqueEntityId(category_id).id
+    except InvalidUuidException:
+        return None
+
+
+def _where_params(category_repo: CategoryRepository,
+                  filter_param: Optional[str | CategoryFilter],
+                  match_all: bool) -> CategoryRepository.SearchParams:
+    # a bulk write to every category has to be asked for, a missing or empty
+    # filter is not enough
+    if isinstance(filter_param, CategoryFilter):
+        matches_all = filter_param.is_empty
+    else:
+        matches_all = not filter_param
+    if matches_all != match_all:
+        raise ValidationException('Either a filter or all is required, not both')
+    return category_repo.SearchParams(filter=None if match_all else filter_param)
 
 
 @dataclass(slots=True, frozen=True)
 class CreateCategoryUseCase(UseCase):
     category_repo: CategoryRepository
+    idempotency_store: Optional['IdempotencyStore[CreateCategoryUseCase.Output]'] = None
+    outbox: Optional['OutboxInterface'] = None
 
     @dataclass(slots=True, frozen=True)
     class Input:  # DTO
         name: str
         description: Optional[str] = Category.get_field('description').default
         is_active: Optional[bool] = Category.get_field('is_active').default
+        idempotency_key: Optional[str] = None
 
     @dataclass(slots=True, frozen=True)
     class Output(CategoryOutput):
         pass
 
     def execute(self, input_param: Input) -> Output:
-        category = Category(
+        if self.idempotency_store is not None and input_param.idempotency_key is not None:
+            return self.idempotency_store.execute(
+                input_param.idempotency_key, lambda: self.__create(input_param))
+        return self.__create(input_param)
+
+    def __create(self, input_param: Input) -> Output:
+        category = Category.create(
             name=input_param.name,
             description=input_param.description,
             is_active=input_param.is_active
         )
         self.category_repo.insert(category)
+        _add_to_outbox(self.outbox, category)
         return CategoryOutputMapper.\
             from_child(CreateCategoryUseCase.Output).\
             to_output(category)
 
 
+@dataclass(slots=True, frozen=True)
+class CreateCategoriesUseCase(UseCase):
+    category_repo: CategoryRepository
+    chunk_size: int = 1000
+    outbox: Optional['OutboxInterface'] = None
+
+    @dataclass(slots=True, frozen=True)
+    class Input:  # DTO
+        items: List[CreateCategoryUseCase.Input]
+
+    @dataclass(slots=True, frozen=True)
+    class ItemOutput:
+        output: Optional[CreateCategoryUseCase.Output] = None
+        errors: Optional[ErrorFields] = None
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        items: List['CreateCategoriesUseCase.ItemOutput']
+
+    def execute(self, input_param: Input) -> Output:
+        mapper = CategoryOutputMapper.from_child(CreateCategoryUseCase.Output)
+        categories = []
+        # position in items of each category
+        positions = []
+        items = []
+        for start in range(0, len(input_param.items), self.chunk_size):
+            chunk = input_param.items[start:start + self.chunk_size]
+            for category, errors in Category.create_many([
+                {'name': item.name, 'description': item.description,
+                 'is_active': item.is_active} for item in chunk
+            ]):
+                if category is None:
+                    items.append(self.ItemOutput(errors=errors))
+                else:
+                    categories.append(category)
+                    positions.append(len(items))
+                    items.append(self.ItemOutput(
+                        output=mapper.to_output(category)))
+        # e.g. a name already taken, when the repository keeps names unique
+        rejected = self.category_repo.bulk_insert_valid(categories)
+        for index, error in rejected.items():
+            items[positions[index]] = self.ItemOutput(errors=error.error)
+        _add_to_outbox(self.outbox, *(category for index, category in enumerate(categories)
+                                      if index not in rejected))
+        return self.Output(items=items)
+
+
 @dataclass(slots=True, frozen=True)
 class GetCategoryUseCase(UseCase):
     category_repo: CategoryRepository
+    # outputs by category id, shared with the use cases that invalidate it
+    cache: Optional['LRUCache[str, GetCategoryUseCase.Output]'] = None
 
     @dataclass(slots=True, frozen=True)
     class Input:  # DTO
@@ -49,10 +154,29 @@ class GetCategoryUseCase(UseCase):
         pass
 
     def execute(self, input_param: Input) -> Output:
+        if self.cache is not None and (category_id := _cache_key(input_param.id)) and \
+                (output := self.cache.get(category_id)) is not None:
+            return output
+        # before the read: a write invalidating the id meanwhile wins
+        token = self.cache.token() if self.cache is not None else None
         category = self.category_repo.find_by_id(input_param.id)
-        return CategoryOutputMapper.\
+        output = CategoryOutputMapper.\
             from_child(GetCategoryUseCase.Output).\
             to_output(category)
+        if self.cache is not None:
+            self.cache.set(output.id, output, token)
+        return output
+
+
+def _search_props(input_param: Any) -> Dict[str, Any]:
+    # shallow, unlike asdict, which would turn a CategoryFilter into a dict
+    return {field.name: getattr(input_param, field.name)
+            for field in dataclass_fields(input_param)}
+
+
+def _item_mapper(fields: Optional[Tuple[str, ...]]) -> Callable[[Category], Any]:
+    return CategoryOutputMapper.projection(fields) if fields \
+        else CategoryOutputMapper.without_child().to_output
 
 
 @dataclass(slots=True, frozen=True)
@@ -60,30 +184,102 @@ class ListCategoryUseCase(UseCase):
     category_repo: CategoryRepository
 
     @dataclass(slots=True, frozen=True)
-    class Input(SearchInput[str]):
-        pass
+    class Input(SearchInput[str | CategoryFilter]):
+        # filter: a CategoryFilter, or a str as shorthand for CategoryFilter(name=...)
+        # e.g. ('id', 'name'): items are dicts with only these fields
+        fields: Optional[Tuple[str, ...]] = None
 
     @dataclass(slots=True, frozen=True)
-    class Output(PaginationOutput):
+    class Output(PaginationOutput[CategoryOutput | Dict[str, Any]]):
         pass
 
     def execute(self, input_param: Input) -> Output:
-        search_params = self.category_repo.SearchParams(**asdict(input_param))
+        search_params = self.category_repo.SearchParams(**_search_props(input_param))
         result = self.category_repo.search(search_params)
-        return self.__to_output(result)
+        return self.__to_output(result, search_params.fields)
 
-    def __to_output(self, result: CategoryRepository.SearchResult) -> Output:
-        items = list(
-            map(CategoryOutputMapper.without_child().to_output, result.items)
-        )
+    def __to_output(self, result: CategoryRepository.SearchResult,
+                    fields: Optional[Tuple[str, ...]] = None) -> Output:
+        items = list(map(_item_mapper(fields), result.items))
         return PaginationOutputMapper.\
             from_child(ListCategoryUseCase.Output).\
             to_output(items, result)
 
 
+@dataclass(slots=True, frozen=True)
+class ExportCategoryUseCase(UseCase):
+    category_repo: CategoryRepository
+    chunk_size: int = 1000
+
+    @dataclass(slots=True, frozen=True)
+    class Input:  # DTO
+        sort: Optional[str] = None
+        sort_dir: Optional[str] = None
+        filter: Optional[str | CategoryFilter] = None
+        fields: Optional[Tuple[str, ...]] = None
+
+    # chunks of chunk_size items, produced lazily while the caller iterates
+    Output = Iterator[List[CategoryOutput | Dict[str, Any]]]
+
+    def execute(self, input_param: Input) -> Output:
+        search_params = self.category_repo.SearchParams(
+            per_page=self.chunk_size, **_search_props(input_param))
+        to_output = _item_mapper(search_params.fields)
+        for chunk in self.category_repo.search_stream(search_params):
+            yield list(map(to_output, chunk))
+
+
+@dataclass(slots=True, frozen=True)
+class AutocompleteCategoryUseCase(UseCase):
+    category_repo: CategoryRepository
+
+    @dataclass(slots=True, frozen=True)
+    class Input:  # DTO
+        prefix: str
+        limit: int = 10
+
+    @dataclass(slots=True, frozen=True)
+    class ItemOutput:
+        id: str  # pylint: disable=invalid-name
+        name: str
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        items: List['AutocompleteCategoryUseCase.ItemOutput']
+
+    def execute(self, input_param: Input) -> Output:
+        categories = self.category_repo.autocomplete(input_param.prefix, input_param.limit)
+        return self.Output(items=[
+            self.ItemOutput(id=category.id, name=category.name) for category in categories
+        ])
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryStatsUseCase(UseCase):
+    category_repo: CategoryRepository
+
+    @dataclass(slots=True, frozen=True)
+    class Input:  # DTO
+        pass
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        total: int
+        active: int
+        inactive: int
+
+    def execute(self, _input_param: Input) -> Output:
+        # the counters cover every category, Input has nothing to narrow them
+        stats = self.category_repo.stats()
+        return self.Output(
+            total=stats.total, active=stats.active, inactive=stats.inactive)
+
+
 @dataclass(slots=True, frozen=True)
 class UpdateCategoryUseCase(UseCase):  # pylint: disable=too-few-public-methods
     category_repo: CategoryRepository
+    cache: Optional['LRUCache[str, GetCategoryUseCase.Output]'] = None
+    outbox: Optional['OutboxInterface'] = None
 
     @dataclass(slots=True, frozen=True)
     class Input:
@@ -92,19 +288,25 @@ class UpdateCategoryUseCase(UseCase):  # pylint: disable=too-few-public-methods
         name: str
         description: Optional[str] = Category.get_field('description').default
         is_active: Optional[bool] = Category.get_field('is_active').default
+        version: Optional[int] = None
 
     @dataclass(slots=True, frozen=True)
     class Output(CategoryOutput):
         pass
 
     def execute(self, input_param: Input) -> Output:
-        category = self.category_repo.find_by_id(input_param.id)
+        # the stored category is only changed by the repository write
+        category = self.category_repo.find_by_id(input_param.id).copy()
+        category.check_version(input_param.version)
         category.update(input_param.name, input_param.description)
         if input_param.is_active is True:
             category.activate()
         else:
             category.deactivate()
-        self.category_repo.update(category)
+        self.category_repo.update(category, input_param.version)
+        _add_to_outbox(self.outbox, category)
+        if self.cache is not None:
+            self.cache.invalidate(category.id)
         return self.__to_output(category)
 
     def __to_output(self, category: Category) -> Output:
@@ -113,14 +315,136 @@ class UpdateCategoryUseCase(UseCase):  # pylint: disable=too-few-public-methods
             to_output(category)
 
 
+@dataclass(slots=True, frozen=True)
+class PartialUpdateCategoryUseCase(UseCase):
+    category_repo: CategoryRepository
+    cache: Optional['LRUCache[str, GetCategoryUseCase.Output]'] = None
+    outbox: Optional['OutboxInterface'] = None
+
+    @dataclass(slots=True, frozen=True)
+    class Input:
+        # pylint: disable=invalid-name
+        id: str
+        name: str | Unset = UNSET
+        description: Optional[str] | Unset = UNSET
+        is_active: bool | Unset = UNSET
+        version: Optional[int] = None
+
+    @dataclass(slots=True, frozen=True)
+    class Output(CategoryOutput):
+        pass
+
+    def execute(self, input_param: Input) -> Output:
+        # the stored category is only changed by the repository write
+        category = self.category_repo.find_by_id(input_param.id).copy()
+        category.check_version(input_param.version)
+        category.change(**self.__changes(input_param))
+        if self.category_repo.update_changes(category, input_param.version):
+            _add_to_outbox(self.outbox, category)
+            if self.cache is not None:
+                self.cache.invalidate(category.id)
+        return CategoryOutputMapper.\
+            from_child(self.Output).\
+            to_output(category)
+
+    def __changes(self, input_param: Input) -> dict:
+        return {
+            name: value for name in ('name', 'description', 'is_active')
+            if (value := getattr(input_param, name)) is not UNSET
+        }
+
+
 @dataclass(slots=True, frozen=True)
 class DeleteCategoryUseCase(UseCase):
     category_repo: CategoryRepository
+    cache: Optional['LRUCache[str, GetCategoryUseCase.Output]'] = None
+    outbox: Optional['OutboxInterface'] = None
 
     @dataclass(slots=True, frozen=True)
     class Input:  # DTO
         # pylint: disable=invalid-name
         id: str
+        version: Optional[int] = None
 
     def execute(self, input_param: Input) -> None:
-        self.category_repo.delete(input_param.id)
+        self.category_repo.delete(input_param.id, input_param.version)
+        # the delete succeeded, so the id is a valid one
+        category_id = UniqueEntityId(input_param.id).id
+        if self.outbox is not None:
+            self.outbox.add_all([CategoryDeleted(entity_id=category_id)])
+        if self.cache is not None:
+            self.cache.invalidate(category_id)
+
+
+@dataclass(slots=True, frozen=True)
+class DeleteCategoriesUseCase(UseCase):
+    # every category matching the filter, in one repository write
+    category_repo: CategoryRepository
+    cache: Optional['LRUCache[str, GetCategoryUseCase.Output]'] = None
+    outbox: Optional['OutboxInterface'] = None
+
+    @dataclass(slots=True, frozen=True)
+    class Input:  # DTO
+        filter: Optional[str | CategoryFilter] = None
+        # instead of a filter, to delete every category
+        all: bool = False
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        deleted: int
+
+    def execute(self, input_param: Input) -> Output:
+        deleted = self.category_repo.delete_where(
+            _where_params(self.category_repo, input_param.filter, input_param.all))
+        if self.outbox is not None and deleted:
+            self.outbox.add_all([CategoryDeleted(entity_id=category.id) for category in deleted])
+        if self.cache is not None:
+            for category in deleted:
+                self.cache.invalidate(category.id)
+        return self.Output(deleted=len(deleted))
+
+
+@dataclass(slots=True, frozen=True)
+class UpdateCategoriesUseCase(UseCase):
+    # names are unique per category, so only description and is_active can be
+    # written to every category matching the filter
+    category_repo: CategoryRepository
+    cache: Optional['LRUCache[str, GetCategoryUseCase.Output]'] = None
+    outbox: Optional['OutboxInterface'] = None
+
+    @dataclass(slots=True, frozen=True)
+    class Input:  # DTO
+        filter: Optional[str | CategoryFilter] = None
+        description: Optional[str] | Unset = UNSET
+        is_active: bool | Unset = UNSET
+        # instead of a filter, to update every category
+        all: bool = False
+
+    @dataclass(slots=True, frozen=True)
+    class Output:
+        updated: int
+
+    def execute(self, input_param: Input) -> Output:
+        search_params = _where_params(self.category_repo, input_param.filter, input_param.all)
+        changes = {
+            name: value for name in ('description', 'is_active')
+            if (value := getattr(input_param, name)) is not UNSET
+        }
+        if not changes:
+            return self.Output(updated=0)
+        Category.validate_changes(**changes)
+        updated = self.category_repo.update_where(search_params, changes)
+        if self.outbox is not None and updated:
+            # changed_fields lists every field of the update, a category may
+            # already have held one of the values
+            self.outbox.add_all([
+                CategoryUpdated(entity_id=category.id, name=category.name,
+                                description=category.description,
+                                is_active=category.is_active,
+                                changed_fields=frozenset(changes))
+                for category in updated
+            ])
+        if self.cache is not None:
+            for category in updated:
+                self.cache.invalidate(category.id)
+        return self.Output(updated=len(updated))
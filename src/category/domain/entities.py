@@ -1,9 +1,10 @@
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import ClassVar, Dict, FrozenSet, Iterable, List, Optional, Tuple
 from __seedwork.domain.entities import Entity
 from __seedwork.domain.exceptions import EntityValidationException
-from category.domain.validators import CategoryValidatorFactory
+from __seedwork.domain.validators import ErrorFields
+from category.domain.events import CategoryCreated, CategoryUpdated
 
 
 @dataclass(kw_only=True, frozen=True, slots=True)
@@ -14,21 +15,88 @@ class Category(Entity):
     created_at: Optional[datetime] = field(
         default_factory=datetime.now)
 
+    _changeable_props: ClassVar[FrozenSet[str]] = frozenset(
+        ('name', 'description', 'is_active'))
+
     def __post_init__(self):
         if not self.created_at:
-            self._set('created_at', datetime.now())
+            object.__setattr__(self, 'created_at', datetime.now())
         self.validate()
 
+    @classmethod
+    def create(cls, **props) -> 'Category':
+        # the create path: unlike a plain construction (e.g. a category loaded
+        # from storage), it records CategoryCreated
+        category = cls(**props)
+        category._record_created()
+        return category
+
+    @classmethod
+    def create_many(cls, props_list: List[Dict]) \
+            -> List[Tuple[Optional['Category'], Optional[ErrorFields]]]:
+        # validates the whole list in one validator pass instead of one per entity
+        # pylint: disable=import-outside-toplevel
+        from category.domain.validators import CategoryValidatorFactory
+        errors_list = CategoryValidatorFactory.create().validate_many(props_list)
+        results: List[Tuple[Optional['Category'], Optional[ErrorFields]]] = []
+        for props, errors in zip(props_list, errors_list):
+            if errors:
+                results.append((None, errors))
+                continue
+            category = cls.restore(**props)
+            cls._record_created(category)
+            results.append((category, None))
+        return results
+
     def update(self, name: str, description: str):
-        self._set("name", name)
-        self._set("description", description)
-        self.validate()
+        self.change(name=name, description=description)
+
+    def change(self, **props):
+        # partial update: only the given props are set and re-validated; when
+        # they are invalid the category is left as it was
+        if unknown := props.keys() - self._changeable_props:
+            raise TypeError(f"Category props can't be changed: {sorted(unknown)}")
+        previous = {name: getattr(self, name) for name in props}
+        for name, value in props.items():
+            self._set(name, value)
+        try:
+            self.validate(props.keys() & self.dirty_fields)
+        except EntityValidationException:
+            for name, value in previous.items():
+                self._set(name, value)
+            raise
+        self._record_updated()
 
     def activate(self):
         self._set("is_active", True)
+        self._record_updated()
 
     def deactivate(self):
         self._set("is_active", False)
+        self._record_updated()
+
+    def _record_created(self):
+        self.record_event(CategoryCreated(
+            entity_id=self.id,
+            name=self.name,
+            description=self.description,
+            is_active=self.is_active,
+            created_at=self.created_at
+        ))
+
+    def _record_updated(self):
+        # one pending CategoryUpdated per unit of work, holding the latest state
+        if self._events:
+            self._events[:] = [event for event in self._events
+                               if not isinstance(event, CategoryUpdated)]
+        if self.is_dirty:
+            self.record_event(CategoryUpdated(
+                entity_id=self.id,
+                name=self.name,
+                description=self.description,
+                is_active=self.is_active,
+                changed_fields=self.dirty_fields
+            ))
 
     # @classmethod
     # def validate(cls, name: str, description: str, is_active: bool = None):
@@ -36,8 +104,28 @@ class Category(Entity):
     #     ValidatorRules(name, 'name').required().string().max_length(255)
     #     ValidatorRules(description, 'description').string()
     #     ValidatorRules(is_active, 'is_active').boolean()
-    def validate(self):
+    def validate(self, fields: Optional[Iterable[str]] = None):
+        # with fields, only those props are re-checked (partial validation)
+        if fields is None:
+            data = self.to_dict()
+        elif not (data := {name: getattr(self, name) for name in fields}):
+            return
+        self._validate_data(data, partial=fields is not None)
+
+    @classmethod
+    def validate_changes(cls, **props):
+        # the checks of change(), for props written to many categories at once
+        if unknown := props.keys() - cls._changeable_props:
+            raise TypeError(f"Category props can't be changed: {sorted(unknown)}")
+        if props:
+            cls._validate_data(props, partial=True)
+
+    @staticmethod
+    def _validate_data(data: Dict, partial: bool):
+        # DRF and the Django settings are only loaded on the first validation
+        # pylint: disable=import-outside-toplevel
+        from category.domain.validators import CategoryValidatorFactory
         validator = CategoryValidatorFactory.create()
-        is_valid = validator.validate(self.to_dict())
+        is_valid = validator.validate(data, partial=partial)
         if not is_valid:
             raise EntityValidationException(validator.errors)
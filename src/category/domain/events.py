@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import FrozenSet, Optional
+from __seedwork.domain.events import DomainEvent
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryCreated(DomainEvent):
+    name: str
+    description: Optional[str]
+    is_active: bool
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryUpdated(DomainEvent):
+    name: str
+    description: Optional[str]
+    is_active: bool
+    changed_fields: FrozenSet[str]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryDeleted(DomainEvent):
+    pass
@@ -1,23 +1,200 @@
 from abc import ABC
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import (
+    TYPE_CHECKING, Any, Callable, ClassVar, Dict, Iterable, List, Mapping, Optional, Tuple
+)
+from __seedwork.domain.exceptions import ValidationException
 from __seedwork.domain.repositories import (
     SearchableRepositoryInterface,
     SearchParams as DefaultSearchParams,
     SearchResult as DefaultSearchResult
 )
+from __seedwork.domain.text import collation_key, fold, similarity
 
 from category.domain.entities import Category
 
+if TYPE_CHECKING:
+    from __seedwork.domain.specifications import And, Specification
 
-class _SearchParams(DefaultSearchParams):  # pylint: disable=too-few-public-methods
-    pass
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class CategoryFilter:
+    # every predicate set must match; the created_at bounds are inclusive
+    name: Optional[str] = None  # case- and accent-insensitive substring
+    is_active: Optional[bool] = None
+    created_at_from: Optional[datetime] = None
+    created_at_to: Optional[datetime] = None
+    # typo tolerant: name matches by trigram similarity instead of as a
+    # substring, and results are ranked by it when no sort is given
+    fuzzy: bool = False
+
+    fuzzy_threshold: ClassVar[float] = 0.3
+
+    def __post_init__(self):
+        if not self.name:
+            object.__setattr__(self, 'name', None)
+
+    @classmethod
+    def from_mapping(cls, params: Mapping[str, Any]) -> 'CategoryFilter':
+        # e.g. query params: string values are read as the field types, an
+        # unknown field or a value that can't be read raises ValidationException
+        if unknown := params.keys() - _FILTER_PARSERS.keys():
+            raise ValidationException(f'Unknown filter fields: {sorted(unknown)}')
+        values = {name: _FILTER_PARSERS[name](value, name) for name, value in params.items()}
+        return cls(**{name: value for name, value in values.items() if value is not None})
+
+    @property
+    def is_empty(self) -> bool:
+        return self.name is None and self.is_active is None \
+            and self.created_at_from is None and self.created_at_to is None
+
+    def matches(self, category: Category) -> bool:
+        return (self.is_active is None or category.is_active == self.is_active) \
+            and (self.created_at_from is None or category.created_at >= self.created_at_from) \
+            and (self.created_at_to is None or category.created_at <= self.created_at_to) \
+            and (self.name is None or self.matches_name(category.name))
+
+    def matches_name(self, name: str) -> bool:
+        if self.fuzzy:
+            return similarity(self.name, name) >= self.fuzzy_threshold
+        return fold(self.name) in fold(name)
+
+    def to_specification(self) -> 'And':
+        # the same predicates for backends that filter through specifications
+        # pylint: disable=import-outside-toplevel
+        from __seedwork.domain.specifications import And, Contains, Eq, Range, Similar
+        specs: List['Specification'] = []
+        if self.name is not None:
+            specs.append(Similar('name', self.name, self.fuzzy_threshold) if self.fuzzy
+                         else Contains('name', self.name))
+        if self.is_active is not None:
+            specs.append(Eq('is_active', self.is_active))
+        if self.created_at_from is not None or self.created_at_to is not None:
+            specs.append(Range('created_at', self.created_at_from, self.created_at_to))
+        return And(tuple(specs))
+
+
+def _parse_str(value: Any, prop: str) -> Optional[str]:
+    if value is not None and not isinstance(value, str):
+        raise ValidationException(f'The {prop} must be a string')
+    return value
+
+
+_BOOL_STRINGS = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def _parse_bool(value: Any, prop: str) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if not text:
+            return None
+        if text in _BOOL_STRINGS:
+            return _BOOL_STRINGS[text]
+    raise ValidationException(f'The {prop} must be a boolean')
+
+
+def _parse_datetime(value: Any, prop: str) -> Optional[datetime]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError as ex:
+            raise ValidationException(f'The {prop} must be an ISO 8601 datetime') from ex
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    if not isinstance(value, datetime):
+        raise ValidationException(f'The {prop} must be an ISO 8601 datetime')
+    # categories are created with local naive datetimes
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+_FILTER_PARSERS: Dict[str, Callable[[Any, str], Any]] = {
+    'name': _parse_str,
+    'is_active': _parse_bool,
+    'created_at_from': _parse_datetime,
+    'created_at_to': _parse_datetime,
+    'fuzzy': _parse_bool,
+}
+
+
+@dataclass(slots=True, kw_only=True)
+class _SearchParams(DefaultSearchParams):
+    # projection: only these fields are fetched and mapped, None means all of them
+    fields: Optional[Tuple[str, ...]] = None
+
+    projectable_fields: ClassVar[Tuple[str, ...]] = (
+        'id', 'name', 'description', 'is_active', 'created_at', 'version')
+
+    def __post_init__(self):
+        DefaultSearchParams.__post_init__(self)
+        self._normalize_fields()
+
+    def _normalize_filter(self):
+        # a str is kept as the name substring shorthand, a mapping (e.g. query
+        # params) is read as a CategoryFilter
+        filter_param: Any = self.filter
+        if isinstance(filter_param, Mapping):
+            filter_param = CategoryFilter.from_mapping(filter_param)
+        if isinstance(filter_param, CategoryFilter):
+            object.__setattr__(self, 'filter', None if filter_param.is_empty else filter_param)
+        else:
+            DefaultSearchParams._normalize_filter(self)  # pylint: disable=protected-access
+
+    def _normalize_fields(self):
+        fields: Iterable = self.fields or ()
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        # unknown fields are ignored, like an unknown sort field
+        names = (str(name).strip() for name in fields)
+        fields = tuple(dict.fromkeys(
+            name for name in names if name in self.projectable_fields))
+        self.fields = fields or None
 
 
 class _SearchResult(DefaultSearchResult):  # pylint: disable=too-few-public-methods
     pass
 
 
+@dataclass(slots=True, frozen=True)
+class CategoryStats:
+    total: int = 0
+    active: int = 0
+
+    @property
+    def inactive(self) -> int:
+        return self.total - self.active
+
+
 class CategoryRepository(
         SearchableRepositoryInterface[Category, _SearchParams, _SearchResult], ABC):
     # simulate a inner class
+    Filter = CategoryFilter
     SearchParams = _SearchParams
     SearchResult = _SearchResult
+
+    def stats(self) -> CategoryStats:
+        # counts every category; backends should answer it from counters or a
+        # COUNT query instead
+        categories = self.find_all()
+        return CategoryStats(
+            total=len(categories),
+            active=sum(1 for category in categories if category.is_active))
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Category]:
+        # categories whose folded name starts with the folded prefix, in
+        # collation order; backends should answer it from an index on the folded name
+        prefix = fold(prefix)
+        return sorted(
+            (category for category in self.find_all() if fold(category.name).startswith(prefix)),
+            key=lambda category: collation_key(category.name)
+        )[:limit]
+
+    def exists_by_name(self, name: str) -> bool:
+        # True when a category has this name, ignoring case and accents;
+        # backends should answer it from a unique index on the folded name
+        name = fold(name)
+        return any(fold(category.name) == name for category in self.find_all())
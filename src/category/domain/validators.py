@@ -1,6 +1,12 @@
-from typing import Dict
+from typing import Dict, List, Optional
 from rest_framework import serializers
-from __seedwork.domain.validators import DRFValidator, StrictBooleanField, StrictCharField
+from __seedwork.domain.drf_validators import (
+    DRFValidator,
+    StrictBooleanField,
+    StrictCharField,
+    plain_validity_check
+)
+from __seedwork.domain.validators import ErrorFields
 
 # pylint: disable=abstract-method
 
@@ -15,10 +21,22 @@ class CategoryRules(serializers.Serializer):
 
 class CategoryValidator(DRFValidator):  # pylint: disable=too-few-public-methods)
 
-    def validate(self, data: Dict) -> bool:
-        rules = CategoryRules(data=data or {})
+    def validate(self, data: Dict, partial: bool = False) -> bool:
+        rules = CategoryRules(data=data or {}, partial=partial)
         return super().validate(rules)
 
+    def validate_many(self, data: List[Dict]) -> List[Optional[ErrorFields]]:
+        # items that are plainly valid skip DRF, the others keep its exact errors
+        is_plainly_valid = plain_validity_check(CategoryRules)
+        errors_list: List[Optional[ErrorFields]] = [None] * len(data)
+        if pending := [index for index, item in enumerate(data)
+                       if not is_plainly_valid(item)]:
+            rules = CategoryRules(
+                data=[data[index] for index in pending], many=True)
+            for index, errors in zip(pending, super().validate_many(rules)):
+                errors_list[index] = errors
+        return errors_list
+
 
 class CategoryValidatorFactory:  # pylint: disable=too-few-public-methods)
 
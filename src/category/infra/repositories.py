@@ -1,23 +1,538 @@
-from typing import List, Optional
-from __seedwork.domain.repositories import InMemorySearchRepository
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from itertools import compress
+import math
+from operator import attrgetter
+from typing import (
+    Any, Callable, ClassVar, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+)
+from __seedwork.domain.bloom_filter import BloomFilter, BloomFilteredRepository
+from __seedwork.domain.exceptions import EntityValidationException
+from __seedwork.domain.repositories import InMemoryIndex, InMemorySearchRepository
+from __seedwork.domain.specifications import And, Contains, Eq, Range, Similar, Specification
+from __seedwork.domain.text import collation_key, fold, similarity, trigrams
 from category.domain.entities import Category
-from category.domain.repositories import CategoryRepository
+from category.domain.repositories import CategoryFilter, CategoryRepository, CategoryStats
 
 
+# (year, month) a category was created in
+_created_at_month = attrgetter('created_at.year', 'created_at.month')
+
+
+class CategoryStatsIndex(InMemoryIndex[Category]):
+
+    def __init__(self) -> None:
+        # category id -> (is_active, (created_at year, month)) as counted
+        self._counted: Dict[bytes, Tuple[bool, Tuple[int, int]]] = {}
+        self._active = 0
+        self._months: Counter = Counter()
+
+    def add(self, entity: Category) -> None:
+        self.discard(entity)
+        month = _created_at_month(entity)
+        self._counted[entity.unique_entity_id.raw] = (entity.is_active, month)
+        self._active += entity.is_active
+        self._months[month] += 1
+
+    def discard(self, entity: Category) -> None:
+        counted = self._counted.pop(entity.unique_entity_id.raw, None)
+        if counted is not None:
+            self._active -= counted[0]
+            self._months[counted[1]] -= 1
+            if not self._months[counted[1]]:
+                del self._months[counted[1]]
+
+    def clear(self) -> None:
+        self._counted.clear()
+        self._active = 0
+        self._months.clear()
+
+    def stats(self) -> CategoryStats:
+        return CategoryStats(total=len(self._counted), active=self._active)
+
+    def facets(self) -> Dict[str, Dict[Any, int]]:
+        return {
+            'is_active': {True: self._active, False: len(self._counted) - self._active},
+            'created_at_month': dict(self._months),
+        }
+
+
+class CategoryFilterIndex(InMemoryIndex[Category]):
+    # every category gets a slot in insertion order and keeps it across updates,
+    # so slot order is the order of the repository items
+
+    def __init__(self) -> None:
+        self._slots: Dict[bytes, int] = {}
+        self._categories: List[Optional[Category]] = []
+        # folded names, computed once per write so a name filter folds nothing
+        self._names: List[Optional[str]] = []
+        self._size = 0
+        # bitmaps over the slots
+        self._live = 0
+        self._active = 0
+        # (created_at, slot) in created_at order
+        self._created_at: List[Tuple[datetime, int]] = []
+
+    def add(self, entity: Category) -> None:
+        self.discard(entity)
+        slot = self._slots.setdefault(entity.unique_entity_id.raw, len(self._categories))
+        if slot == len(self._categories):
+            self._categories.append(entity)
+            self._names.append(fold(entity.name))
+        else:
+            self._categories[slot] = entity
+            self._names[slot] = fold(entity.name)
+        self._live |= 1 << slot
+        if entity.is_active:
+            self._active |= 1 << slot
+        insort(self._created_at, (entity.created_at, slot))
+        self._size += 1
+        if len(self._categories) > 2 * self._size + 64:
+            # deleted categories left too many free slots behind
+            self.rebuild([category for category in self._categories if category is not None])
+
+    def add_many(self, entities: Iterable[Category]) -> None:
+        new = []
+        start = len(self._categories)
+        for entity in entities:
+            raw = entity.unique_entity_id.raw
+            slot = self._slots.get(raw)
+            if slot is None:
+                self._slots[raw] = start + len(new)
+                new.append(entity)
+            elif slot < start:
+                self.add(entity)
+            # else the id is already new in this batch, its first entity wins
+        if not new:
+            return
+        # the new categories take the next slots, so their bits are set in one go
+        self._categories.extend(new)
+        self._names.extend(fold(entity.name) for entity in new)
+        self._live |= ((1 << len(new)) - 1) << start
+        active = ''.join('1' if entity.is_active else '0' for entity in reversed(new))
+        self._active |= int(active, 2) << start
+        self._created_at.extend(
+            (entity.created_at, slot) for slot, entity in enumerate(new, start))
+        self._created_at.sort()
+        self._size += len(new)
+
+    def discard(self, entity: Category) -> None:
+        # the slot stays reserved, an update discards and adds the same id back
+        slot = self._slots.get(entity.unique_entity_id.raw)
+        if slot is None or self._categories[slot] is None:
+            return
+        category = self._categories[slot]
+        self._categories[slot] = None
+        self._names[slot] = None
+        self._live &= ~(1 << slot)
+        self._active &= ~(1 << slot)
+        del self._created_at[bisect_left(self._created_at, (category.created_at, slot))]
+        self._size -= 1
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self._categories.clear()
+        self._names.clear()
+        self._live = self._active = self._size = 0
+        self._created_at.clear()
+
+    def search(self, category_filter: CategoryFilter) -> List[Category]:
+        # drives the search with the most selective indexed predicate and checks
+        # the remaining ones on its candidates only
+        slots = self._by_is_active(category_filter.is_active)
+        if category_filter.created_at_from is not None or category_filter.created_at_to is not None:
+            by_created_at = self._by_created_at(
+                category_filter.created_at_from, category_filter.created_at_to)
+            if slots is None or len(by_created_at) < slots[0]:
+                slots = (len(by_created_at), sorted(slot for _, slot in by_created_at))
+        names = self._names
+        if category_filter.name:
+            name = fold(category_filter.name)
+            slots = [slot for slot, folded in enumerate(names)
+                     if folded is not None and name in folded] \
+                if slots is None else [slot for slot in slots[1] if name in names[slot]]
+        else:
+            slots = [slot for slot, folded in enumerate(names) if folded is not None] \
+                if slots is None else slots[1]
+        categories = self._categories
+        others = replace(category_filter, name=None)
+        if others.is_empty:
+            return [categories[slot] for slot in slots]
+        return [category for category in map(categories.__getitem__, slots)
+                if others.matches(category)]
+
+    def lookup(self, spec: Specification) -> Optional[List[Category]]:
+        if isinstance(spec, And):
+            # the parts a CategoryFilter can express, so search picks the most
+            # selective one; the others are left to the caller
+            props: Dict[str, Any] = {}
+            for child in spec.specs:
+                if isinstance(child, Eq) and child.field == 'is_active' \
+                        and isinstance(child.value, bool):
+                    props.setdefault('is_active', child.value)
+                elif isinstance(child, Range) and child.field == 'created_at':
+                    props.setdefault('created_at_from', child.lower)
+                    props.setdefault('created_at_to', child.upper)
+                elif isinstance(child, Contains) and child.field == 'name':
+                    props.setdefault('name', child.value)
+            category_filter = CategoryFilter(**props)
+            return None if category_filter.is_empty else self.search(category_filter)
+        categories = self._categories
+        if isinstance(spec, Eq) and spec.field == 'is_active' and isinstance(spec.value, bool):
+            return list(map(categories.__getitem__, self._by_is_active(spec.value)[1]))
+        if isinstance(spec, Range) and spec.field == 'created_at':
+            slots = sorted(slot for _, slot in self._by_created_at(spec.lower, spec.upper))
+            return list(map(categories.__getitem__, slots))
+        if isinstance(spec, Contains) and spec.field == 'name':
+            name = fold(spec.value)
+            return [categories[slot] for slot, folded in enumerate(self._names)
+                    if folded is not None and name in folded]
+        return None
+
+    def _by_is_active(self, is_active: Optional[bool]) -> Optional[Tuple[int, Iterator[int]]]:
+        if is_active is None:
+            return None
+        bitmap = self._active if is_active else self._live & ~self._active
+        # the bitmap as '0'/'1' chars, lowest slot first
+        bits = bin(bitmap)[:1:-1]
+        return bitmap.bit_count(), compress(range(len(bits)), map('1'.__eq__, bits))
+
+    def _by_created_at(self, created_at_from: Optional[datetime],
+                       created_at_to: Optional[datetime]) -> List[Tuple[datetime, int]]:
+        # (datetime, -1) sorts before and (datetime, inf) after every slot of
+        # that same instant, so both bounds are inclusive
+        start = 0 if created_at_from is None \
+            else bisect_left(self._created_at, (created_at_from, -1))
+        stop = len(self._created_at) if created_at_to is None \
+            else bisect_right(self._created_at, (created_at_to, float('inf')))
+        return self._created_at[start:stop]
+
+
+# (collation key, category id)
+NameEntry = Tuple[str, bytes]
+
+
+def _folded_name(entry: NameEntry) -> str:
+    return entry[0].partition('\0')[0]
+
+
+class CategoryNameIndex(InMemoryIndex[Category]):
+    # entries in collation order, so a prefix is a bisect plus a short walk
+
+    def __init__(self) -> None:
+        self._entries: List[NameEntry] = []
+        # category id -> (its entry, the name it was built from, the category)
+        self._categories: Dict[bytes, Tuple[NameEntry, str, Category]] = {}
+        # folded name -> categories with it
+        self._folded: Counter = Counter()
+
+    def add(self, entity: Category) -> None:
+        self.discard(entity)
+        entry = self._entry(entity)
+        insort(self._entries, entry)
+        self._categories[entry[1]] = (entry, entity.name, entity)
+        self._folded[_folded_name(entry)] += 1
+
+    def add_many(self, entities: Iterable[Category]) -> None:
+        entities = list(entities)
+        if len(entities) < 64:
+            super().add_many(entities)
+            return
+        for entity in entities:
+            self.discard(entity)
+        entries = [self._entry(entity) for entity in entities]
+        self._categories.update(
+            (entry[1], (entry, entity.name, entity)) for entry, entity in zip(entries, entities))
+        self._folded.update(map(_folded_name, entries))
+        # one sort, it merges the new run into the sorted one
+        self._entries.extend(entries)
+        self._entries.sort()
+
+    def discard(self, entity: Category) -> None:
+        # the stored entry is used, the name may have changed in place
+        stored = self._categories.pop(entity.unique_entity_id.raw, None)
+        if stored is not None:
+            del self._entries[bisect_left(self._entries, stored[0])]
+            folded = _folded_name(stored[0])
+            self._folded[folded] -= 1
+            if not self._folded[folded]:
+                del self._folded[folded]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._categories.clear()
+        self._folded.clear()
+
+    def has_name(self, name: str) -> bool:
+        return fold(name) in self._folded
+
+    def is_taken(self, folded_name: str, category: Category) -> bool:
+        # by another category; the one stored under this id does not count
+        stored = self._categories.get(category.unique_entity_id.raw)
+        own = stored is not None and _folded_name(stored[0]) == folded_name
+        return self._folded[folded_name] > own
+
+    def prefix(self, prefix: str, limit: int) -> List[Category]:
+        # a collation key starts with the folded name
+        prefix = fold(prefix)
+        start = bisect_left(self._entries, (prefix,))
+        categories = []
+        for key, raw in self._entries[start:start + max(limit, 0)]:
+            if not key.startswith(prefix):
+                break
+            categories.append(self._categories[raw][2])
+        return categories
+
+    def key(self, category: Category) -> str:
+        # the collation key stored on the last write; only a category that is
+        # not stored with this same name is folded again
+        stored = self._categories.get(category.unique_entity_id.raw)
+        if stored is not None and stored[1] is category.name:
+            return stored[0][0]
+        return collation_key(category.name)
+
+    @staticmethod
+    def _entry(category: Category) -> NameEntry:
+        return collation_key(category.name), category.unique_entity_id.raw
+
+
+class CategoryTrigramIndex(InMemoryIndex[Category]):
+    # trigram -> ids of the categories whose name has it, so a fuzzy query only
+    # scores the names sharing at least one trigram with it
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[bytes]] = {}
+        # category id -> (its name trigrams, the category)
+        self._categories: Dict[bytes, Tuple[FrozenSet[str], Category]] = {}
+
+    def add(self, entity: Category) -> None:
+        self.discard(entity)
+        raw = entity.unique_entity_id.raw
+        grams = trigrams(entity.name)
+        self._categories[raw] = (grams, entity)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(raw)
+
+    def discard(self, entity: Category) -> None:
+        # the stored trigrams are used, the name may have changed in place
+        stored = self._categories.pop(entity.unique_entity_id.raw, None)
+        if stored is None:
+            return
+        for gram in stored[0]:
+            posting = self._postings[gram]
+            posting.discard(entity.unique_entity_id.raw)
+            if not posting:
+                del self._postings[gram]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._categories.clear()
+
+    def lookup(self, spec: Specification) -> Optional[List[Category]]:
+        # with no threshold even names sharing no trigram are similar enough
+        if isinstance(spec, Similar) and spec.field == 'name' and spec.threshold > 0:
+            return [category for _, category in self.search(spec.value, spec.threshold)]
+        return None
+
+    def search(self, name: str, threshold: float) -> List[Tuple[float, Category]]:
+        # (similarity, category) for every name at least threshold similar
+        query = trigrams(name)
+        shared_counts = Counter()
+        for gram in query:
+            shared_counts.update(self._postings.get(gram, ()))
+        # similarity <= shared / len(query), so fewer shared trigrams cannot reach it
+        min_shared = max(math.ceil(threshold * len(query)), 1)
+        matches = []
+        for raw, shared in shared_counts.items():
+            if shared < min_shared:
+                continue
+            grams, category = self._categories[raw]
+            score = shared / (len(query) + len(grams) - shared)
+            if score >= threshold:
+                matches.append((score, category))
+        return matches
+
+
+@dataclass(slots=True)
 class CategoryInMemoryRepository(
     CategoryRepository,
     InMemorySearchRepository[Category, str]
 ):
-    sortable_fields: List[str] = ['name', 'created_at']
+    # slots=True makes a new class, so the base methods are called by name:
+    # a zero-argument super() would still point at the old one
+    sortable_fields: ClassVar[List[str]] = ['name', 'created_at']
+    facetable_fields: ClassVar[List[str]] = ['is_active', 'created_at_month']
+    # names compared folded, checked on the name index under the write lock
+    unique_names: bool = field(default=False, kw_only=True, compare=False)
 
-    def _apply_filter(self,
-                      items: List[Category], filter_param: Optional[str]) -> List[Category]:
-        if filter_param:
-            return list(filter(lambda i: filter_param.lower() in i.name.lower(), items))
-        return items
+    def stats(self) -> CategoryStats:
+        return self._get_index(CategoryStatsIndex).stats()
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Category]:
+        with self._write_lock:
+            return self._get_index(CategoryNameIndex).prefix(prefix, limit)
+
+    def exists_by_name(self, name: str) -> bool:
+        return self._get_index(CategoryNameIndex).has_name(name)
+
+    def _create_indexes(self) -> Tuple[InMemoryIndex[Category], ...]:
+        return (CategoryStatsIndex(), CategoryFilterIndex(), CategoryNameIndex(),
+                CategoryTrigramIndex())
+
+    def _write_conflicts(self, entities: Iterable[Category],
+                         changes: Optional[Dict[str, Any]] = None) \
+            -> Dict[int, EntityValidationException]:
+        if not self.unique_names or (changes is not None and 'name' not in changes):
+            return {}
+        index = self._get_index(CategoryNameIndex)
+        names: Set[str] = set()
+        conflicts = {}
+        for position, entity in enumerate(entities):
+            name = fold(entity.name if changes is None else changes['name'])
+            if name in names or index.is_taken(name, entity):
+                # the first of a batch holding a name twice wins
+                conflicts[position] = EntityValidationException(
+                    {'name': ['A category with this name already exists.']})
+            else:
+                names.add(name)
+        return conflicts
+
+    def _apply_search(self, input_params: CategoryRepository.SearchParams) -> List[Category]:
+        filter_param = input_params.filter
+        if isinstance(filter_param, CategoryFilter) and filter_param.fuzzy \
+                and filter_param.name and not input_params.sort:
+            # the fuzzy filter already ranks its matches
+            return self._filtered(filter_param)
+        return InMemorySearchRepository._apply_search(self, input_params)
+
+    def _apply_filter(self, items: List[Category],
+                      filter_param: Optional[str | CategoryFilter]) -> List[Category]:
+        if not filter_param:
+            return items
+        if not isinstance(filter_param, CategoryFilter):
+            filter_param = CategoryFilter(name=filter_param)
+        if items is not self.items and items is not self._live_items():
+            matches = list(filter(filter_param.matches, items))
+            if filter_param.fuzzy and filter_param.name:
+                return self._apply_rank(matches, filter_param.name)
+            return matches
+        with self._write_lock:
+            if filter_param.fuzzy and filter_param.name:
+                matches = self._get_index(CategoryTrigramIndex).search(
+                    filter_param.name, filter_param.fuzzy_threshold)
+                others = replace(filter_param, name=None, fuzzy=False)
+                name_key = self._sort_key('name')
+                matches.sort(key=lambda match: (-match[0], name_key(match[1])))
+                return [category for _, category in matches if others.matches(category)]
+            return self._get_index(CategoryFilterIndex).search(filter_param)
 
     def _apply_sort(self, items: List[Category],
                     sort: Optional[str], sort_dir: Optional[str]) -> List[Category]:
         if sort:
-            return super()._apply_sort(items, sort, sort_dir)
-        return super()._apply_sort(items, 'created_at', 'desc')
+            return InMemorySearchRepository._apply_sort(self, items, sort, sort_dir)
+        return InMemorySearchRepository._apply_sort(self, items, 'created_at', 'desc')
+
+    def _apply_facets(self, items: List[Category], input_params: CategoryRepository.SearchParams) \
+            -> Optional[Dict[str, Dict[Any, int]]]:
+        if input_params.filter is None and input_params.facets:
+            # every category matches, so the counters kept on the writes answer it
+            with self._write_lock:
+                counts = self._get_index(CategoryStatsIndex).facets()
+            facets = {name: counts[name] for name in input_params.facets if name in counts}
+        else:
+            facets = InMemorySearchRepository._apply_facets(self, items, input_params)
+        if not facets:
+            return None
+        if 'is_active' in facets:
+            counts = facets['is_active']
+            facets['is_active'] = {True: counts.get(True, 0), False: counts.get(False, 0)}
+        if 'created_at_month' in facets:
+            facets['created_at_month'] = {
+                f'{year:04}-{month:02}': count
+                for (year, month), count in sorted(facets['created_at_month'].items())}
+        return facets
+
+    def _facet_key(self, facet: str) -> Callable[[Category], Any]:
+        if facet == 'created_at_month':
+            return _created_at_month
+        return InMemorySearchRepository._facet_key(self, facet)
+
+    def _sort_key(self, field_name: str) -> Callable[[Category], Any]:
+        # names are ordered by their folded form, so 'Ação' sits next to 'acao'
+        if field_name == 'name':
+            return self._get_index(CategoryNameIndex).key
+        return InMemorySearchRepository._sort_key(self, field_name)
+
+    def _apply_rank(self, items: List[Category], name: str) -> List[Category]:
+        # the most similar name first, ties in name order, as the trigram index
+        # ranks them; only for items the index does not hold
+        name_key = self._sort_key('name')
+        return sorted(items, key=lambda category: (
+            -similarity(name, category.name), name_key(category)))
+
+
+@dataclass(slots=True)
+class BloomFilteredCategoryRepository(BloomFilteredRepository[Category], CategoryRepository):
+    # also fronts the name lookups, so checking a new (unique) name before a
+    # create does not reach the storage
+    repository: CategoryRepository
+    names: BloomFilter = field(default_factory=BloomFilter)
+
+    def __post_init__(self):
+        BloomFilteredRepository.__post_init__(self)
+        for category in self.repository.find_all():
+            self.names.add(fold(category.name))
+
+    # names too are added before the write, as the ids
+
+    def insert(self, entity: Category) -> None:
+        self.names.add(fold(entity.name))
+        BloomFilteredRepository.insert(self, entity)
+
+    def bulk_insert(self, entities: List[Category]) -> None:
+        for entity in entities:
+            self.names.add(fold(entity.name))
+        BloomFilteredRepository.bulk_insert(self, entities)
+
+    def bulk_insert_valid(self, entities: List[Category]) \
+            -> Dict[int, EntityValidationException]:
+        for entity in entities:
+            self.names.add(fold(entity.name))
+        return BloomFilteredRepository.bulk_insert_valid(self, entities)
+
+    def update(self, entity: Category, expected_version: Optional[int] = None) -> None:
+        self.names.add(fold(entity.name))
+        BloomFilteredRepository.update(self, entity, expected_version)
+
+    def update_changes(self, entity: Category, expected_version: Optional[int] = None) -> bool:
+        if 'name' in entity.dirty_fields:
+            self.names.add(fold(entity.name))
+        return BloomFilteredRepository.update_changes(self, entity, expected_version)
+
+    def exists_by_name(self, name: str) -> bool:
+        return fold(name) in self.names and self.repository.exists_by_name(name)
+
+    def search(self, input_params: CategoryRepository.SearchParams) \
+            -> CategoryRepository.SearchResult:
+        return self.repository.search(input_params)
+
+    def search_stream(self, input_params: CategoryRepository.SearchParams) \
+            -> Iterator[List[Category]]:
+        return self.repository.search_stream(input_params)
+
+    def delete_where(self, input_params: CategoryRepository.SearchParams) -> List[Category]:
+        return self.repository.delete_where(input_params)
+
+    def update_where(self, input_params: CategoryRepository.SearchParams,
+                     changes: Dict[str, Any]) -> List[Category]:
+        if 'name' in changes:
+            self.names.add(fold(changes['name']))
+        return self.repository.update_where(input_params, changes)
+
+    def stats(self) -> CategoryStats:
+        return self.repository.stats()
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Category]:
+        return self.repository.autocomplete(prefix, limit)
@@ -14,7 +14,8 @@ class TestCategoryOutputUnit(unittest.TestCase):
             'name': str,
             'description': Optional[str],
             'is_active': bool,
-            'created_at': datetime
+            'created_at': datetime,
+            'version': int
         })
 
 
@@ -66,3 +67,13 @@ class TestCategoryOutputMapperUnit(unittest.TestCase):
             is_active=entity.is_active,
             created_at=entity.created_at
         ))
+
+    def test_projection(self):
+        entity = Category(name='test', description='some description')
+        self.assertEqual(
+            CategoryOutputMapper.projection(('id', 'name'))(entity),
+            {'id': entity.id, 'name': 'test'})
+        self.assertEqual(
+            CategoryOutputMapper.projection(('name',))(entity), {'name': 'test'})
+        self.assertIs(CategoryOutputMapper.projection(('id', 'name')),
+                      CategoryOutputMapper.projection(('id', 'name')))
@@ -1,22 +1,40 @@
-# pylint: disable=no-value-for-parameter, unexpected-keyword-arg
+# pylint: disable=no-value-for-parameter, unexpected-keyword-arg, too-many-lines
 from datetime import datetime, timedelta
+from threading import Barrier, Thread
+import time
 from typing import Optional
 import unittest
 from unittest.mock import patch
-from __seedwork.application.dto import PaginationOutput, SearchInput
+from __seedwork.application.cache import LRUCache
+from __seedwork.application.dto import UNSET, PaginationOutput, SearchInput
+from __seedwork.application.idempotency import IdempotencyStore
+from __seedwork.application.outbox import InMemoryEventPublisher, InMemoryOutbox, OutboxDispatcher
 
 from __seedwork.application.use_cases import UseCase
-from __seedwork.domain.exceptions import NotFoundExeption
+from __seedwork.domain.exceptions import (
+    EntityValidationException,
+    NotFoundExeption,
+    ValidationException,
+    VersionConflictException
+)
 from category.application.use_cases import (
+    AutocompleteCategoryUseCase,
+    CategoryStatsUseCase,
+    CreateCategoriesUseCase,
     CreateCategoryUseCase,
+    DeleteCategoriesUseCase,
     DeleteCategoryUseCase,
+    ExportCategoryUseCase,
     GetCategoryUseCase,
     ListCategoryUseCase,
+    PartialUpdateCategoryUseCase,
+    UpdateCategoriesUseCase,
     UpdateCategoryUseCase
 )
 from category.domain.entities import Category
-from category.domain.repositories import CategoryRepository
-from category.infra.repositories import CategoryInMemoryRepository
+from category.domain.events import CategoryCreated, CategoryDeleted, CategoryUpdated
+from category.domain.repositories import CategoryFilter, CategoryRepository
+from category.infra.repositories import CategoryInMemoryRepository, CategoryNameIndex
 from category.application.dto import CategoryOutput, CategoryOutputMapper
 
 
@@ -35,7 +53,8 @@ class TestCreateCategoryUseCaseUnit(unittest.TestCase):
         self.assertEqual(self.use_case.Input.__annotations__, {
             'name': str,
             'description': Optional[str],
-            'is_active': Optional[bool]
+            'is_active': Optional[bool],
+            'idempotency_key': Optional[str]
         })
 
         # pylint: disable=no-member
@@ -89,6 +108,161 @@ class TestCreateCategoryUseCaseUnit(unittest.TestCase):
             created_at=self.category_repo.items[2].created_at
         ))
 
+    def test_execute_with_unique_names(self):
+        self.use_case.execute(CreateCategoryUseCase.Input(name='Ação'))
+        # duplicates are allowed unless the repository is asked for unique names
+        self.use_case.execute(CreateCategoryUseCase.Input(name='acao'))
+
+        category_repo = CategoryInMemoryRepository(unique_names=True)
+        use_case = CreateCategoryUseCase(category_repo=category_repo)
+        use_case.execute(CreateCategoryUseCase.Input(name='Ação'))
+        with self.assertRaises(EntityValidationException) as assert_error:
+            use_case.execute(CreateCategoryUseCase.Input(name='AÇÃO'))
+        self.assertEqual(assert_error.exception.error,
+                         {'name': ['A category with this name already exists.']})
+        self.assertEqual(len(category_repo.items), 1)
+
+        output = use_case.execute(CreateCategoryUseCase.Input(name='Ação 2'))
+        self.assertEqual(output.name, 'Ação 2')
+
+    def test_concurrent_creates_with_the_same_name(self):
+        category_repo = CategoryInMemoryRepository(unique_names=True)
+        use_case = CreateCategoryUseCase(category_repo=category_repo)
+        is_taken = CategoryNameIndex.is_taken
+
+        def slow_is_taken(index, name, category):
+            # widens the window between the check and the insert
+            time.sleep(0.01)
+            return is_taken(index, name, category)
+
+        outcomes = []
+        started = Barrier(8)
+
+        def worker():
+            started.wait()
+            try:
+                use_case.execute(CreateCategoryUseCase.Input(name='Movie'))
+                outcomes.append('created')
+            except EntityValidationException:
+                outcomes.append('rejected')
+
+        with patch.object(CategoryNameIndex, 'is_taken', slow_is_taken):
+            threads = [Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(sorted(outcomes), ['created'] + ['rejected'] * 7)
+        self.assertEqual(len(category_repo.items), 1)
+
+    def test_execute_with_idempotency_key(self):
+        use_case = CreateCategoryUseCase(
+            category_repo=self.category_repo, idempotency_store=IdempotencyStore())
+        input_params = CreateCategoryUseCase.Input(
+            name='Movie', idempotency_key='request-1')
+        output = use_case.execute(input_params)
+
+        with patch.object(Category, 'validate') as spy_validate, \
+                patch.object(self.category_repo, 'insert') as spy_insert:
+            self.assertIs(use_case.execute(input_params), output)
+            spy_validate.assert_not_called()
+            spy_insert.assert_not_called()
+        self.assertEqual(len(self.category_repo.items), 1)
+        self.assertEqual(output.id, self.category_repo.items[0].id)
+
+        other_output = use_case.execute(CreateCategoryUseCase.Input(
+            name='Movie', idempotency_key='request-2'))
+        self.assertNotEqual(other_output.id, output.id)
+        use_case.execute(CreateCategoryUseCase.Input(name='Movie'))
+        self.assertEqual(len(self.category_repo.items), 3)
+
+    def test_failed_execution_with_idempotency_key_can_be_retried(self):
+        use_case = CreateCategoryUseCase(
+            category_repo=self.category_repo, idempotency_store=IdempotencyStore())
+        with self.assertRaises(EntityValidationException):
+            use_case.execute(CreateCategoryUseCase.Input(
+                name='', idempotency_key='request-1'))
+        output = use_case.execute(CreateCategoryUseCase.Input(
+            name='Movie', idempotency_key='request-1'))
+        self.assertEqual(output.name, 'Movie')
+        self.assertEqual(len(self.category_repo.items), 1)
+
+
+class TestCreateCategoriesUseCaseUnit(unittest.TestCase):
+    use_case: CreateCategoriesUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = CreateCategoriesUseCase(
+            category_repo=self.category_repo, chunk_size=2)
+
+    def test_if_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_execute(self):
+        with patch.object(self.category_repo, 'bulk_insert_valid',
+                          wraps=self.category_repo.bulk_insert_valid) as spy_bulk_insert:
+            output = self.use_case.execute(CreateCategoriesUseCase.Input(items=[
+                CreateCategoryUseCase.Input(name='Movie'),
+                CreateCategoryUseCase.Input(name=''),
+                CreateCategoryUseCase.Input(
+                    name='Documentary', description='Some description', is_active=False),
+                CreateCategoryUseCase.Input(name='Série', description=5),
+                CreateCategoryUseCase.Input(name='Série', description='Ação'),
+            ]))
+            spy_bulk_insert.assert_called_once()
+
+        self.assertEqual(len(self.category_repo.items), 3)
+        self.assertEqual(
+            [item.output.name if item.output else None for item in output.items],
+            ['Movie', None, 'Documentary', None, 'Série'])
+        self.assertEqual(output.items[0].output, CreateCategoryUseCase.Output(
+            id=self.category_repo.items[0].id,
+            name='Movie',
+            description=None,
+            is_active=True,
+            created_at=self.category_repo.items[0].created_at
+        ))
+        self.assertEqual(output.items[2].output.is_active, False)
+        self.assertIsNone(output.items[0].errors)
+        self.assertEqual(output.items[1].errors, {
+                         'name': ['This field may not be blank.']})
+        self.assertEqual(output.items[3].errors, {
+                         'description': ['Not a valid string.']})
+
+    def test_execute_with_unique_names(self):
+        category_repo = CategoryInMemoryRepository(unique_names=True)
+        category_repo.insert(Category(name='Movie'))
+        outbox = InMemoryOutbox()
+        use_case = CreateCategoriesUseCase(category_repo=category_repo, outbox=outbox)
+        output = use_case.execute(CreateCategoriesUseCase.Input(items=[
+            CreateCategoryUseCase.Input(name='Doc'),
+            CreateCategoryUseCase.Input(name='movie'),
+            CreateCategoryUseCase.Input(name=''),
+            CreateCategoryUseCase.Input(name='DOC'),
+            CreateCategoryUseCase.Input(name='Drama'),
+        ]))
+
+        self.assertEqual(
+            [item.output.name if item.output else item.errors for item in output.items], [
+                'Doc',
+                {'name': ['A category with this name already exists.']},
+                {'name': ['This field may not be blank.']},
+                {'name': ['A category with this name already exists.']},
+                'Drama',
+            ])
+        self.assertEqual([category.name for category in category_repo.items],
+                         ['Movie', 'Doc', 'Drama'])
+        self.assertEqual([message.event.name for message in outbox.fetch(10)],
+                         ['Doc', 'Drama'])
+
+    def test_execute_with_empty_input(self):
+        output = self.use_case.execute(
+            CreateCategoriesUseCase.Input(items=[]))
+        self.assertEqual(output.items, [])
+        self.assertEqual(self.category_repo.items, [])
+
 
 class TestGetCategoryUseCaseUnit(unittest.TestCase):
     use_case: GetCategoryUseCase
@@ -134,6 +308,79 @@ class TestGetCategoryUseCaseUnit(unittest.TestCase):
             )
             self.assertEqual(output, expected)
 
+    def test_execute_using_cache(self):
+        category = Category(name="Movie")
+        self.category_repo.items = [category]
+        cache = LRUCache()
+        use_case = GetCategoryUseCase(
+            category_repo=self.category_repo, cache=cache)
+        with patch.object(self.category_repo, 'find_by_id',
+                          wraps=self.category_repo.find_by_id) as spy_find_by_id:
+            input_params = GetCategoryUseCase.Input(id=category.id)
+            output = use_case.execute(input_params)
+            self.assertIs(use_case.execute(input_params), output)
+            spy_find_by_id.assert_called_once()
+        self.assertEqual(cache.stats().hits, 1)
+        self.assertEqual(cache.stats().misses, 1)
+
+        with patch.object(self.category_repo, 'find_by_id') as spy_find_by_id:
+            self.assertIs(use_case.execute(
+                GetCategoryUseCase.Input(id=category.id.upper())), output)
+            self.assertIs(use_case.execute(
+                GetCategoryUseCase.Input(id=category.id.replace('-', ''))), output)
+            spy_find_by_id.assert_not_called()
+        self.assertEqual(cache.stats().hits, 3)
+
+        with self.assertRaises(NotFoundExeption):
+            use_case.execute(GetCategoryUseCase.Input(id='fake id'))
+        self.assertEqual(len(cache), 1)
+
+    def test_cache_is_invalidated_by_writes(self):
+        category = Category(name="Movie")
+        self.category_repo.items = [category]
+        cache = LRUCache()
+        use_case = GetCategoryUseCase(
+            category_repo=self.category_repo, cache=cache)
+        input_params = GetCategoryUseCase.Input(id=category.id)
+
+        use_case.execute(input_params)
+        UpdateCategoryUseCase(category_repo=self.category_repo, cache=cache).execute(
+            UpdateCategoryUseCase.Input(id=category.id, name='Name updated'))
+        self.assertEqual(use_case.execute(input_params).name, 'Name updated')
+
+        PartialUpdateCategoryUseCase(category_repo=self.category_repo, cache=cache).execute(
+            PartialUpdateCategoryUseCase.Input(id=category.id, name='Movie'))
+        self.assertEqual(use_case.execute(input_params).name, 'Movie')
+
+        DeleteCategoryUseCase(category_repo=self.category_repo, cache=cache).execute(
+            DeleteCategoryUseCase.Input(id=category.id.upper()))
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(NotFoundExeption):
+            use_case.execute(input_params)
+
+    def test_a_read_overtaken_by_a_write_is_not_cached(self):
+        category = Category(name='Movie')
+        self.category_repo.items = [category]
+        cache = LRUCache()
+        use_case = GetCategoryUseCase(category_repo=self.category_repo, cache=cache)
+        update_use_case = UpdateCategoryUseCase(category_repo=self.category_repo, cache=cache)
+        find_by_id = self.category_repo.find_by_id
+
+        def find_then_update(category_id):
+            # the read sees the old name, then a write overtakes it
+            found = find_by_id(category_id).copy()
+            spy_find_by_id.side_effect = find_by_id
+            update_use_case.execute(UpdateCategoryUseCase.Input(id=category.id, name='Documentary'))
+            return found
+
+        with patch.object(self.category_repo, 'find_by_id',
+                          side_effect=find_then_update) as spy_find_by_id:
+            self.assertEqual(use_case.execute(GetCategoryUseCase.Input(id=category.id)).name,
+                             'Movie')
+        self.assertIsNone(cache.get(category.id))
+        self.assertEqual(use_case.execute(GetCategoryUseCase.Input(id=category.id)).name,
+                         'Documentary')
+
 
 class TestListCategoryUseCaseUnit(unittest.TestCase):
     use_case: ListCategoryUseCase
@@ -211,6 +458,31 @@ class TestListCategoryUseCaseUnit(unittest.TestCase):
             )
             self.assertEqual(output, expected)
 
+    def test_execute_using_fields(self):
+        items = [
+            Category(name='Movie', description='Some description'),
+            Category(name='Documentary', created_at=datetime.now() +
+                     timedelta(seconds=200))
+        ]
+        self.category_repo.items = items
+        with patch.object(CategoryOutputMapper, 'to_output') as spy_to_output:
+            output = self.use_case.execute(
+                ListCategoryUseCase.Input(fields=('id', 'name', 'unknown')))
+            spy_to_output.assert_not_called()
+        self.assertEqual(output, ListCategoryUseCase.Output(
+            items=[
+                {'id': items[1].id, 'name': 'Documentary'},
+                {'id': items[0].id, 'name': 'Movie'},
+            ],
+            total=2,
+            current_page=1,
+            per_page=15,
+            last_page=1
+        ))
+
+        output = self.use_case.execute(ListCategoryUseCase.Input(fields=()))
+        self.assertIsInstance(output.items[0], CategoryOutput)
+
     def test_execute_using_paginate_and_sort_and_filter(self):
         items = [
             Category(name='a'),
@@ -220,13 +492,14 @@ class TestListCategoryUseCaseUnit(unittest.TestCase):
         ]
         self.category_repo.items = items
 
+        # names are ordered by their folded form first, then as they are written
         input_param = ListCategoryUseCase.Input(
             page=1, per_page=2, sort='name', sort_dir='asc', filter='a')
         output = self.use_case.execute(input_param)
         self.assertEqual(output, ListCategoryUseCase.Output(
             items=list(
                 map(CategoryOutputMapper.without_child(
-                ).to_output, [items[1], items[2]])
+                ).to_output, [items[0], items[1]])
             ),
             total=3,
             current_page=1,
@@ -239,7 +512,7 @@ class TestListCategoryUseCaseUnit(unittest.TestCase):
         output = self.use_case.execute(input_param)
         self.assertEqual(output, ListCategoryUseCase.Output(
             items=list(
-                map(CategoryOutputMapper.without_child().to_output, [items[0]])
+                map(CategoryOutputMapper.without_child().to_output, [items[2]])
             ),
             total=3,
             current_page=2,
@@ -253,7 +526,7 @@ class TestListCategoryUseCaseUnit(unittest.TestCase):
         self.assertEqual(output, ListCategoryUseCase.Output(
             items=list(
                 map(CategoryOutputMapper.without_child(
-                ).to_output, [items[0], items[2]])
+                ).to_output, [items[2], items[1]])
             ),
             total=3,
             current_page=1,
@@ -266,7 +539,7 @@ class TestListCategoryUseCaseUnit(unittest.TestCase):
         output = self.use_case.execute(input_param)
         self.assertEqual(output, ListCategoryUseCase.Output(
             items=list(
-                map(CategoryOutputMapper.without_child().to_output, [items[1]])
+                map(CategoryOutputMapper.without_child().to_output, [items[0]])
             ),
             total=3,
             current_page=2,
@@ -274,6 +547,172 @@ class TestListCategoryUseCaseUnit(unittest.TestCase):
             last_page=2
         ))
 
+    def test_execute_using_category_filter(self):
+        items = [
+            Category(name='Movie', is_active=False),
+            Category(name='Documentary'),
+            Category(name='movie 2'),
+        ]
+        self.category_repo.items = items
+
+        output = self.use_case.execute(ListCategoryUseCase.Input(
+            sort='name', filter=CategoryFilter(name='movie', is_active=True)))
+        self.assertEqual(output.items, [CategoryOutputMapper.without_child().to_output(items[2])])
+        self.assertEqual(output.total, 1)
+
+        # query params
+        output = self.use_case.execute(ListCategoryUseCase.Input(
+            filter={'name': 'movie', 'is_active': 'false'}))
+        self.assertEqual(output.items, [CategoryOutputMapper.without_child().to_output(items[0])])
+
+        output = self.use_case.execute(ListCategoryUseCase.Input(
+            filter=CategoryFilter(name='documentry', fuzzy=True), fields=('name',)))
+        self.assertEqual(output.items, [{'name': 'Documentary'}])
+
+    def test_execute_with_facets(self):
+        items = [
+            Category(name='Movie', is_active=False),
+            Category(name='Documentary'),
+            Category(name='movie 2'),
+        ]
+        self.category_repo.items = items
+
+        output = self.use_case.execute(ListCategoryUseCase.Input(
+            per_page=1, filter='movie', facets=('is_active',)))
+        self.assertEqual(len(output.items), 1)
+        self.assertEqual(output.total, 2)
+        self.assertEqual(output.facets, {'is_active': {True: 1, False: 1}})
+
+        output = self.use_case.execute(ListCategoryUseCase.Input())
+        self.assertIsNone(output.facets)
+
+
+class TestExportCategoryUseCaseUnit(unittest.TestCase):
+    use_case: ExportCategoryUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = ExportCategoryUseCase(
+            category_repo=self.category_repo, chunk_size=2)
+
+    def test_if_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_execute(self):
+        created_at = datetime.now()
+        items = [
+            Category(name='Movie', created_at=created_at),
+            Category(name='Documentary', created_at=created_at + timedelta(seconds=1)),
+            Category(name='movie 2', created_at=created_at + timedelta(seconds=2)),
+            Category(name='Movie 3', created_at=created_at + timedelta(seconds=3)),
+        ]
+        self.category_repo.items = items
+        to_output = CategoryOutputMapper.without_child().to_output
+
+        with patch.object(self.category_repo, 'search',
+                          wraps=self.category_repo.search) as spy_search:
+            chunks = self.use_case.execute(ExportCategoryUseCase.Input())
+            self.assertEqual(list(chunks), [
+                [to_output(items[3]), to_output(items[2])],
+                [to_output(items[1]), to_output(items[0])],
+            ])
+            spy_search.assert_not_called()
+
+        chunks = self.use_case.execute(ExportCategoryUseCase.Input(
+            sort='name', sort_dir='desc', filter='movie', fields=('name',)))
+        self.assertEqual(list(chunks), [
+            [{'name': 'Movie 3'}, {'name': 'movie 2'}],
+            [{'name': 'Movie'}],
+        ])
+
+        chunks = self.use_case.execute(ExportCategoryUseCase.Input(filter='fake'))
+        self.assertEqual(list(chunks), [])
+
+    def test_execute_is_lazy(self):
+        self.category_repo.items = [Category(name=f'Movie {index}') for index in range(5)]
+        with patch.object(self.category_repo, 'search_stream',
+                          wraps=self.category_repo.search_stream) as spy_search_stream:
+            chunks = self.use_case.execute(ExportCategoryUseCase.Input())
+            spy_search_stream.assert_not_called()
+            self.assertEqual(len(next(chunks)), 2)
+            spy_search_stream.assert_called_once()
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+
+
+class TestAutocompleteCategoryUseCaseUnit(unittest.TestCase):
+    use_case: AutocompleteCategoryUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = AutocompleteCategoryUseCase(category_repo=self.category_repo)
+
+    def test_if_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_execute(self):
+        items = [
+            Category(name='Ação'),
+            Category(name='Documentary'),
+            Category(name='acao 2'),
+        ]
+        self.category_repo.items = items
+
+        output = self.use_case.execute(AutocompleteCategoryUseCase.Input(prefix='ACA'))
+        self.assertEqual(output, AutocompleteCategoryUseCase.Output(items=[
+            AutocompleteCategoryUseCase.ItemOutput(id=items[0].id, name='Ação'),
+            AutocompleteCategoryUseCase.ItemOutput(id=items[2].id, name='acao 2'),
+        ]))
+
+        output = self.use_case.execute(AutocompleteCategoryUseCase.Input(prefix='a', limit=1))
+        self.assertEqual(len(output.items), 1)
+
+        output = self.use_case.execute(AutocompleteCategoryUseCase.Input(prefix='fake'))
+        self.assertEqual(output.items, [])
+
+
+class TestCategoryStatsUseCaseUnit(unittest.TestCase):
+    use_case: CategoryStatsUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = CategoryStatsUseCase(category_repo=self.category_repo)
+
+    def test_if_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_execute(self):
+        input_param = CategoryStatsUseCase.Input()
+        self.assertEqual(self.use_case.execute(input_param), CategoryStatsUseCase.Output(
+            total=0, active=0, inactive=0))
+
+        category = Category(name='Movie')
+        CreateCategoriesUseCase(category_repo=self.category_repo).execute(
+            CreateCategoriesUseCase.Input(items=[
+                CreateCategoryUseCase.Input(name='Movie'),
+                CreateCategoryUseCase.Input(name='Documentary', is_active=False),
+            ]))
+        self.category_repo.insert(category)
+        self.assertEqual(self.use_case.execute(input_param), CategoryStatsUseCase.Output(
+            total=3, active=2, inactive=1))
+
+        UpdateCategoryUseCase(category_repo=self.category_repo).execute(
+            UpdateCategoryUseCase.Input(id=category.id, name='Movie', is_active=False))
+        self.assertEqual(self.use_case.execute(input_param), CategoryStatsUseCase.Output(
+            total=3, active=1, inactive=2))
+
+        PartialUpdateCategoryUseCase(category_repo=self.category_repo).execute(
+            PartialUpdateCategoryUseCase.Input(id=category.id, is_active=True))
+        self.assertEqual(self.use_case.execute(input_param), CategoryStatsUseCase.Output(
+            total=3, active=2, inactive=1))
+
+        DeleteCategoryUseCase(category_repo=self.category_repo).execute(
+            DeleteCategoryUseCase.Input(id=category.id))
+        self.assertEqual(self.use_case.execute(input_param), CategoryStatsUseCase.Output(
+            total=2, active=1, inactive=1))
+
 
 class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
     use_case: UpdateCategoryUseCase
@@ -291,7 +730,8 @@ class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
             'id': str,
             'name': str,
             'description': Optional[str],
-            'is_active': Optional[bool]
+            'is_active': Optional[bool],
+            'version': Optional[int]
         })
 
         # pylint: disable=no-member
@@ -318,6 +758,39 @@ class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
         self.assertEqual(
             assert_error.exception.args[0], f"Entity not found using ID '{id_not_found}'")
 
+    def test_raise_exception_when_version_conflicts(self):
+        category = Category(name="Movie")
+        self.category_repo.items = [category]
+        self.use_case.execute(UpdateCategoryUseCase.Input(
+            id=category.id, name='Name updated', version=1))
+
+        input_params = UpdateCategoryUseCase.Input(
+            id=category.id, name='Stale name', version=1)
+        with self.assertRaises(VersionConflictException):
+            self.use_case.execute(input_params)
+        self.assertEqual(self.category_repo.items[0].name, 'Name updated')
+        self.assertEqual(self.category_repo.items[0].version, 2)
+
+    def test_concurrent_writer_gets_a_version_conflict(self):
+        category = Category(name="Movie")
+        self.category_repo.items = [category]
+        write = self.category_repo.update
+
+        def let_other_writer_in_first(*args):
+            spy_write.side_effect = write
+            self.use_case.execute(UpdateCategoryUseCase.Input(
+                id=category.id, name='Documentary'))
+            return write(*args)
+
+        with patch.object(self.category_repo, 'update',
+                          side_effect=let_other_writer_in_first) as spy_write:
+            with self.assertRaises(VersionConflictException):
+                self.use_case.execute(UpdateCategoryUseCase.Input(
+                    id=category.id, name='Series', is_active=False))
+        self.assertEqual(self.category_repo.items[0].name, 'Documentary')
+        self.assertIs(self.category_repo.items[0].is_active, True)
+        self.assertEqual(self.category_repo.items[0].version, 2)
+
     def test_execute(self):
         category = Category(name="Movie")
         self.category_repo.items = [category]
@@ -334,7 +807,8 @@ class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
                 name='Name updated',
                 description=category.description,
                 is_active=category.is_active,
-                created_at=self.category_repo.items[0].created_at
+                created_at=self.category_repo.items[0].created_at,
+                version=2
             ))
         arrange = [
             {
@@ -348,7 +822,8 @@ class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
                     'name': 'Test name',
                     'description': 'Test description',
                     'is_active': True,
-                    'created_at': category.created_at
+                    'created_at': category.created_at,
+                    'version': 3
                 }
             },
             {
@@ -363,7 +838,8 @@ class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
                     'name': 'Test name',
                     'description': 'Test description',
                     'is_active': False,
-                    'created_at': category.created_at
+                    'created_at': category.created_at,
+                    'version': 4
                 }
             },
             {
@@ -378,7 +854,8 @@ class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
                     'name': 'Test name',
                     'description': 'Test description',
                     'is_active': True,
-                    'created_at': category.created_at
+                    'created_at': category.created_at,
+                    'version': 5
                 }
             },
             {
@@ -393,7 +870,8 @@ class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
                     'name': 'Name updated',
                     'description': 'description updated',
                     'is_active': False,
-                    'created_at': category.created_at
+                    'created_at': category.created_at,
+                    'version': 6
                 }
             }
         ]
@@ -406,6 +884,138 @@ class TestUpdateCategoryUseCaseUnit(unittest.TestCase):
                 msg=f'Test input: {item["input"]}')
 
 
+class TestPartialUpdateCategoryUseCaseUnit(unittest.TestCase):
+    use_case: PartialUpdateCategoryUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = PartialUpdateCategoryUseCase(
+            category_repo=self.category_repo)
+
+    def test_if_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_input(self):
+        input_params = PartialUpdateCategoryUseCase.Input(id='fake id')
+        self.assertIs(input_params.name, UNSET)
+        self.assertIs(input_params.description, UNSET)
+        self.assertIs(input_params.is_active, UNSET)
+
+    def test_output(self):
+        self.assertTrue(issubclass(
+            PartialUpdateCategoryUseCase.Output, CategoryOutput))
+
+    def test_raise_exception_when_category_not_found(self):
+        input_params = PartialUpdateCategoryUseCase.Input(id='fake id')
+        with self.assertRaises(NotFoundExeption) as assert_error:
+            self.use_case.execute(input_params)
+        self.assertEqual(
+            assert_error.exception.args[0], "Entity not found using ID 'fake id'")
+
+    def test_raise_exception_when_change_is_invalid(self):
+        category = Category(name="Movie")
+        self.category_repo.items = [category]
+        input_params = PartialUpdateCategoryUseCase.Input(
+            id=category.id, is_active=5)
+        with self.assertRaises(EntityValidationException) as assert_error:
+            self.use_case.execute(input_params)
+        self.assertEqual(list(assert_error.exception.error), ['is_active'])
+
+    def test_concurrent_writer_gets_a_version_conflict(self):
+        category = Category(name="Movie")
+        self.category_repo.items = [category]
+        write = self.category_repo.update_changes
+
+        def let_other_writer_in_first(*args):
+            spy_write.side_effect = write
+            self.use_case.execute(PartialUpdateCategoryUseCase.Input(
+                id=category.id, name='Documentary'))
+            return write(*args)
+
+        with patch.object(self.category_repo, 'update_changes',
+                          side_effect=let_other_writer_in_first) as spy_write:
+            with self.assertRaises(VersionConflictException):
+                self.use_case.execute(PartialUpdateCategoryUseCase.Input(
+                    id=category.id, is_active=False))
+        self.assertEqual(self.category_repo.items[0].name, 'Documentary')
+        self.assertIs(self.category_repo.items[0].is_active, True)
+        self.assertEqual(self.category_repo.items[0].version, 2)
+
+    def test_invalid_change_is_not_saved_by_the_next_update(self):
+        category = Category(name="Movie")
+        self.category_repo.items = [category]
+        with self.assertRaises(EntityValidationException):
+            self.use_case.execute(PartialUpdateCategoryUseCase.Input(
+                id=category.id, is_active=5))
+        self.assertIs(self.category_repo.items[0].is_active, True)
+        self.assertFalse(self.category_repo.items[0].is_dirty)
+
+        output = self.use_case.execute(PartialUpdateCategoryUseCase.Input(
+            id=category.id, name='Documentary'))
+        self.assertEqual((output.name, output.is_active), ('Documentary', True))
+        stats = self.category_repo.stats()
+        self.assertEqual((stats.total, stats.active), (1, 1))
+
+    def test_execute(self):
+        category = Category(name="Movie", description="some description")
+        self.category_repo.items = [category]
+        arrange = [
+            {
+                'input': {'name': 'Name updated'},
+                'expected': {'name': 'Name updated', 'description': 'some description',
+                             'is_active': True, 'version': 2},
+            },
+            {
+                'input': {'is_active': False},
+                'expected': {'name': 'Name updated', 'description': 'some description',
+                             'is_active': False, 'version': 3},
+            },
+            {
+                'input': {'description': None, 'is_active': True},
+                'expected': {'name': 'Name updated', 'description': None,
+                             'is_active': True, 'version': 4},
+            },
+        ]
+        for item in arrange:
+            with patch.object(self.category_repo, 'update_changes',
+                              wraps=self.category_repo.update_changes) as spy_update_changes:
+                input_params = PartialUpdateCategoryUseCase.Input(
+                    id=category.id, **item['input'])
+                output = self.use_case.execute(input_params)
+                spy_update_changes.assert_called_once()
+            self.assertEqual(output, PartialUpdateCategoryUseCase.Output(
+                id=category.id,
+                created_at=category.created_at,
+                **item['expected']
+            ), msg=f'Test input: {item["input"]}')
+            self.assertFalse(self.category_repo.items[0].is_dirty)
+
+    def test_skip_write_when_nothing_changed(self):
+        category = Category(name="Movie", is_active=True)
+        self.category_repo.items = [category]
+        with patch.object(self.category_repo, '_update_fields') as spy_update_fields:
+            input_params = PartialUpdateCategoryUseCase.Input(
+                id=category.id, name='Movie', is_active=True)
+            output = self.use_case.execute(input_params)
+            spy_update_fields.assert_not_called()
+        self.assertEqual(output.name, 'Movie')
+
+        with patch.object(self.category_repo, '_update_fields') as spy_update_fields:
+            input_params = PartialUpdateCategoryUseCase.Input(id=category.id)
+            self.use_case.execute(input_params)
+            spy_update_fields.assert_not_called()
+
+        with patch.object(self.category_repo, '_update_fields') as spy_update_fields:
+            input_params = PartialUpdateCategoryUseCase.Input(
+                id=category.id, is_active=False)
+            self.use_case.execute(input_params)
+            spy_update_fields.assert_called_once()
+            entity, fields, expected_version = spy_update_fields.call_args.args
+        self.assertEqual((entity.id, entity.is_active), (category.id, False))
+        self.assertEqual((fields, expected_version), ({'is_active'}, None))
+
+
 class TestDeleteCategoryUseCaseUnit(unittest.TestCase):
     use_case: DeleteCategoryUseCase
     category_repo: CategoryInMemoryRepository
@@ -420,6 +1030,7 @@ class TestDeleteCategoryUseCaseUnit(unittest.TestCase):
     def test_input(self):
         self.assertEqual(self.use_case.Input.__annotations__, {
             'id': str,
+            'version': Optional[int]
         })
 
     def test_raise_exception_when_catagory_not_found(self):
@@ -429,6 +1040,14 @@ class TestDeleteCategoryUseCaseUnit(unittest.TestCase):
         self.assertEqual(
             assert_error.exception.args[0], "Entity not found using ID 'fake id'")
 
+    def test_raise_exception_when_version_conflicts(self):
+        category = Category(name="Movie", version=3)
+        self.category_repo.items = [category]
+        input_params = DeleteCategoryUseCase.Input(id=category.id, version=2)
+        with self.assertRaises(VersionConflictException):
+            self.use_case.execute(input_params)
+        self.assertEqual(self.category_repo.items, [category])
+
     def test_execute(self):
         category = Category(name="Movie")
         self.category_repo.items = [category]
@@ -438,3 +1057,255 @@ class TestDeleteCategoryUseCaseUnit(unittest.TestCase):
             self.use_case.execute(input_params)
             spy_delete.assert_called_once()
             self.assertEqual(self.category_repo.items, [])
+
+        category = Category(name="Movie", version=3)
+        self.category_repo.items = [category]
+        self.use_case.execute(
+            DeleteCategoryUseCase.Input(id=category.id, version=3))
+        self.assertEqual(self.category_repo.items, [])
+
+
+class TestDeleteCategoriesUseCaseUnit(unittest.TestCase):
+    use_case: DeleteCategoriesUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = DeleteCategoriesUseCase(category_repo=self.category_repo)
+
+    def test_if_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_input(self):
+        self.assertEqual(self.use_case.Input.__annotations__, {
+            'filter': Optional[str | CategoryFilter],
+            'all': bool
+        })
+        input_param = DeleteCategoriesUseCase.Input()
+        self.assertIsNone(input_param.filter)
+        self.assertFalse(input_param.all)
+
+    def test_every_category_is_deleted_only_when_asked_for(self):
+        categories = [Category(name='Movie'), Category(name='Drama')]
+        self.category_repo.items = list(categories)
+        for input_param in (DeleteCategoriesUseCase.Input(),
+                            DeleteCategoriesUseCase.Input(filter=''),
+                            DeleteCategoriesUseCase.Input(filter=CategoryFilter(name='')),
+                            DeleteCategoriesUseCase.Input(filter='movie', all=True)):
+            with self.subTest(input_param=input_param):
+                with self.assertRaises(ValidationException) as assert_error:
+                    self.use_case.execute(input_param)
+                self.assertEqual(str(assert_error.exception),
+                                 'Either a filter or all is required, not both')
+        self.assertEqual(self.category_repo.items, categories)
+
+        output = self.use_case.execute(DeleteCategoriesUseCase.Input(all=True))
+        self.assertEqual(output.deleted, 2)
+        self.assertEqual(self.category_repo.items, [])
+
+    def test_execute(self):
+        categories = [Category(name='Movie'), Category(name='Drama', is_active=False),
+                      Category(name='Documentary', is_active=False)]
+        self.category_repo.items = list(categories)
+        with patch.object(self.category_repo, 'delete_where',
+                          wraps=self.category_repo.delete_where) as spy_delete_where:
+            output = self.use_case.execute(DeleteCategoriesUseCase.Input(
+                filter=CategoryFilter(is_active=False)))
+            spy_delete_where.assert_called_once()
+        self.assertEqual(output, DeleteCategoriesUseCase.Output(deleted=2))
+        self.assertEqual(self.category_repo.items, [categories[0]])
+
+        output = self.use_case.execute(DeleteCategoriesUseCase.Input(filter='drama'))
+        self.assertEqual(output.deleted, 0)
+
+    def test_execute_invalidates_the_deleted_categories(self):
+        categories = [Category(name='Movie'), Category(name='Drama')]
+        self.category_repo.items = list(categories)
+        cache = LRUCache()
+        for category in categories:
+            cache.set(category.id, 'fake output')
+        use_case = DeleteCategoriesUseCase(category_repo=self.category_repo, cache=cache)
+        use_case.execute(DeleteCategoriesUseCase.Input(filter='movie'))
+        self.assertIsNone(cache.get(categories[0].id))
+        self.assertEqual(cache.get(categories[1].id), 'fake output')
+
+
+class TestUpdateCategoriesUseCaseUnit(unittest.TestCase):
+    use_case: UpdateCategoriesUseCase
+    category_repo: CategoryInMemoryRepository
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.use_case = UpdateCategoriesUseCase(category_repo=self.category_repo)
+
+    def test_if_instance_use_case(self):
+        self.assertIsInstance(self.use_case, UseCase)
+
+    def test_input(self):
+        input_params = UpdateCategoriesUseCase.Input()
+        self.assertIsNone(input_params.filter)
+        self.assertIs(input_params.description, UNSET)
+        self.assertIs(input_params.is_active, UNSET)
+        self.assertFalse(input_params.all)
+
+    def test_every_category_is_updated_only_when_asked_for(self):
+        categories = [Category(name='Movie'), Category(name='Drama')]
+        self.category_repo.items = list(categories)
+        for input_param in (UpdateCategoriesUseCase.Input(is_active=False),
+                            UpdateCategoriesUseCase.Input(filter='', is_active=False),
+                            UpdateCategoriesUseCase.Input(filter='movie', is_active=False,
+                                                          all=True)):
+            with self.subTest(input_param=input_param):
+                with self.assertRaises(ValidationException):
+                    self.use_case.execute(input_param)
+        self.assertEqual([category.is_active for category in categories], [True, True])
+
+        output = self.use_case.execute(UpdateCategoriesUseCase.Input(is_active=False, all=True))
+        self.assertEqual(output.updated, 2)
+
+    def test_raise_exception_when_change_is_invalid(self):
+        category = Category(name='Movie')
+        self.category_repo.items = [category]
+        with self.assertRaises(EntityValidationException) as assert_error:
+            self.use_case.execute(UpdateCategoriesUseCase.Input(all=True, is_active=5))
+        self.assertEqual(list(assert_error.exception.error), ['is_active'])
+        self.assertTrue(category.is_active)
+
+    def test_execute(self):
+        categories = [Category(name='Movie'), Category(name='Drama'),
+                      Category(name='Documentary', is_active=False)]
+        self.category_repo.items = list(categories)
+
+        output = self.use_case.execute(UpdateCategoriesUseCase.Input(
+            filter=CategoryFilter(name='d'), is_active=False))
+        self.assertEqual(output, UpdateCategoriesUseCase.Output(updated=1))
+        self.assertEqual([category.is_active for category in categories],
+                         [True, False, False])
+        self.assertEqual([category.version for category in categories], [1, 2, 1])
+
+        output = self.use_case.execute(UpdateCategoriesUseCase.Input(
+            all=True, description='some description'))
+        self.assertEqual(output.updated, 3)
+        self.assertEqual({category.description for category in categories},
+                         {'some description'})
+
+        with patch.object(self.category_repo, 'update_where') as spy_update_where:
+            output = self.use_case.execute(UpdateCategoriesUseCase.Input(all=True))
+            spy_update_where.assert_not_called()
+        self.assertEqual(output.updated, 0)
+
+    def test_execute_invalidates_the_updated_categories(self):
+        categories = [Category(name='Movie'), Category(name='Drama')]
+        self.category_repo.items = list(categories)
+        cache = LRUCache()
+        for category in categories:
+            cache.set(category.id, 'fake output')
+        use_case = UpdateCategoriesUseCase(category_repo=self.category_repo, cache=cache)
+        use_case.execute(UpdateCategoriesUseCase.Input(filter='movie', is_active=False))
+        self.assertIsNone(cache.get(categories[0].id))
+        self.assertEqual(cache.get(categories[1].id), 'fake output')
+
+
+class TestCategoryUseCasesOutboxUnit(unittest.TestCase):
+    category_repo: CategoryInMemoryRepository
+    outbox: InMemoryOutbox
+
+    def setUp(self) -> None:
+        self.category_repo = CategoryInMemoryRepository()
+        self.outbox = InMemoryOutbox()
+
+    def pending_events(self):
+        messages = self.outbox.fetch(100)
+        self.outbox.ack(messages)
+        return [message.event for message in messages]
+
+    def test_write_use_cases_add_their_events_to_the_outbox(self):
+        output = CreateCategoryUseCase(self.category_repo, outbox=self.outbox).execute(
+            CreateCategoryUseCase.Input(name='Movie'))
+        event, = self.pending_events()
+        self.assertIsInstance(event, CategoryCreated)
+        self.assertEqual((event.entity_id, event.name), (output.id, 'Movie'))
+
+        CreateCategoriesUseCase(self.category_repo, outbox=self.outbox).execute(
+            CreateCategoriesUseCase.Input(items=[
+                CreateCategoryUseCase.Input(name='Documentary'),
+                CreateCategoryUseCase.Input(name=''),
+            ]))
+        self.assertEqual(
+            [(type(event), event.name) for event in self.pending_events()],
+            [(CategoryCreated, 'Documentary')])
+
+        UpdateCategoryUseCase(self.category_repo, outbox=self.outbox).execute(
+            UpdateCategoryUseCase.Input(id=output.id, name='Movie 2', is_active=False))
+        event, = self.pending_events()
+        self.assertIsInstance(event, CategoryUpdated)
+        self.assertEqual(event.changed_fields, {'name', 'is_active'})
+
+        use_case = PartialUpdateCategoryUseCase(self.category_repo, outbox=self.outbox)
+        use_case.execute(PartialUpdateCategoryUseCase.Input(id=output.id, name='Movie 2'))
+        self.assertEqual(self.pending_events(), [])
+        use_case.execute(PartialUpdateCategoryUseCase.Input(id=output.id, is_active=True))
+        event, = self.pending_events()
+        self.assertEqual((event.changed_fields, event.is_active), ({'is_active'}, True))
+
+        DeleteCategoryUseCase(self.category_repo, outbox=self.outbox).execute(
+            DeleteCategoryUseCase.Input(id=output.id.upper()))
+        event, = self.pending_events()
+        self.assertEqual(event, CategoryDeleted(
+            entity_id=output.id, occurred_on=event.occurred_on))
+
+    def test_bulk_use_cases_add_an_event_per_category_written(self):
+        categories = [Category(name='Movie'), Category(name='Drama'),
+                      Category(name='Documentary', is_active=False)]
+        self.category_repo.bulk_insert(categories)
+
+        UpdateCategoriesUseCase(self.category_repo, outbox=self.outbox).execute(
+            UpdateCategoriesUseCase.Input(filter=CategoryFilter(name='d'), is_active=False))
+        event, = self.pending_events()
+        self.assertEqual(event, CategoryUpdated(
+            entity_id=categories[1].id, name='Drama', description=None, is_active=False,
+            changed_fields=frozenset({'is_active'}), occurred_on=event.occurred_on))
+
+        DeleteCategoriesUseCase(self.category_repo, outbox=self.outbox).execute(
+            DeleteCategoriesUseCase.Input(filter=CategoryFilter(is_active=False)))
+        self.assertEqual(
+            [(type(event), event.entity_id) for event in self.pending_events()],
+            [(CategoryDeleted, categories[1].id), (CategoryDeleted, categories[2].id)])
+
+        DeleteCategoriesUseCase(self.category_repo, outbox=self.outbox).execute(
+            DeleteCategoriesUseCase.Input(filter='drama'))
+        self.assertEqual(len(self.outbox), 0)
+
+    def test_categories_not_created_by_the_use_case_publish_no_created_event(self):
+        category = Category(name='Movie')
+        self.category_repo.insert(category)
+        PartialUpdateCategoryUseCase(self.category_repo, outbox=self.outbox).execute(
+            PartialUpdateCategoryUseCase.Input(id=category.id, name='Movie 2'))
+        self.assertEqual(
+            [type(event) for event in self.pending_events()], [CategoryUpdated])
+
+    def test_failed_writes_add_no_events(self):
+        category = Category(name='Movie')
+        self.category_repo.insert(category)
+        with self.assertRaises(VersionConflictException):
+            UpdateCategoryUseCase(self.category_repo, outbox=self.outbox).execute(
+                UpdateCategoryUseCase.Input(id=category.id, name='Movie 2', version=2))
+        with self.assertRaises(NotFoundExeption):
+            DeleteCategoryUseCase(self.category_repo, outbox=self.outbox).execute(
+                DeleteCategoryUseCase.Input(id='af46842e-027d-4c91-b259-3a3642144ba4'))
+        self.assertEqual(len(self.outbox), 0)
+
+    def test_events_are_pulled_without_outbox(self):
+        output = CreateCategoryUseCase(self.category_repo).execute(
+            CreateCategoryUseCase.Input(name='Movie'))
+        self.assertEqual(self.category_repo.find_by_id(output.id).events, ())
+
+    def test_dispatcher_publishes_the_outbox(self):
+        publisher = InMemoryEventPublisher()
+        use_case = CreateCategoryUseCase(self.category_repo, outbox=self.outbox)
+        for name in ('Movie', 'Documentary'):
+            use_case.execute(CreateCategoryUseCase.Input(name=name))
+        self.assertEqual(publisher.published, [])
+
+        OutboxDispatcher(self.outbox, publisher).dispatch_pending()
+        self.assertEqual([event.name for event in publisher.published], ['Movie', 'Documentary'])
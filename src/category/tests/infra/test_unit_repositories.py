@@ -1,9 +1,20 @@
-# pylint: disable=unexpected-keyword-arg, protected-access
+# pylint: disable=unexpected-keyword-arg, protected-access, too-many-public-methods
 from datetime import datetime, timedelta
 import unittest
+from unittest.mock import patch
+from __seedwork.domain.exceptions import EntityValidationException
+from __seedwork.domain.specifications import Contains, Eq, Range, Similar
+from __seedwork.domain.text import fold
 from category.domain.entities import Category
+from category.domain.repositories import CategoryFilter, CategoryRepository, CategoryStats
 
-from category.infra.repositories import CategoryInMemoryRepository
+from category.infra.repositories import (
+    BloomFilteredCategoryRepository,
+    CategoryFilterIndex,
+    CategoryInMemoryRepository,
+    CategoryNameIndex,
+    CategoryTrigramIndex
+)
 
 
 class TestCategoryInMemoryRepositoryUnit(unittest.TestCase):
@@ -28,6 +39,104 @@ class TestCategoryInMemoryRepositoryUnit(unittest.TestCase):
         items_filtered = self.repo._apply_filter(items, 'MOVIE')
         self.assertEqual(items_filtered, [items[0], items[1]])
 
+    def test_filter_by_category_filter(self):
+        now = datetime.now()
+        items = [
+            Category(name='Movie New', is_active=True, created_at=now),
+            Category(name='movie old', is_active=False, created_at=now - timedelta(days=10)),
+            Category(name='Some', is_active=True, created_at=now - timedelta(days=1)),
+        ]
+        self.repo.items = items
+
+        arrange = [
+            {'filter': CategoryFilter(is_active=True), 'expected': [items[0], items[2]]},
+            {'filter': CategoryFilter(is_active=False), 'expected': [items[1]]},
+            {'filter': CategoryFilter(name='movie', is_active=True), 'expected': [items[0]]},
+            {'filter': CategoryFilter(created_at_from=now - timedelta(days=1)),
+             'expected': [items[0], items[2]]},
+            {'filter': CategoryFilter(created_at_to=now - timedelta(days=1)),
+             'expected': [items[1], items[2]]},
+            {'filter': CategoryFilter(created_at_from=now - timedelta(days=10),
+                                      created_at_to=now - timedelta(days=10)),
+             'expected': [items[1]]},
+            {'filter': CategoryFilter(is_active=True, created_at_to=now - timedelta(hours=1)),
+             'expected': [items[2]]},
+            {'filter': CategoryFilter(name='fake', is_active=True), 'expected': []},
+        ]
+        for item in arrange:
+            # the index answers for the repository items, the other lists are scanned
+            self.assertEqual(self.repo._apply_filter(self.repo.items, item['filter']),
+                             item['expected'], msg=item['filter'])
+            self.assertEqual(self.repo._apply_filter(list(items), item['filter']),
+                             item['expected'], msg=item['filter'])
+
+    def test_filter_index_follows_the_writes(self):
+        now = datetime.now()
+        categories = [
+            Category(name=f'Movie {index}', is_active=index % 3 == 0,
+                     created_at=now + timedelta(seconds=index % 7))
+            for index in range(200)
+        ]
+        self.repo.bulk_insert(categories[:150])
+        for category in categories[150:]:
+            self.repo.insert(category)
+        for category in categories[:100:2]:
+            self.repo.delete(category.id)
+        for category in categories[1:100:4]:
+            if category.is_active:
+                category.deactivate()
+            else:
+                category.activate()
+            self.repo.update_changes(category)
+
+        filters = [
+            CategoryFilter(is_active=True),
+            CategoryFilter(is_active=False, name='1'),
+            CategoryFilter(created_at_from=now + timedelta(seconds=2),
+                           created_at_to=now + timedelta(seconds=3)),
+            CategoryFilter(is_active=True, created_at_from=now + timedelta(seconds=6)),
+        ]
+        for category_filter in filters:
+            self.assertEqual(
+                self.repo._apply_filter(self.repo.items, category_filter),
+                [item for item in self.repo.items if category_filter.matches(item)],
+                msg=category_filter)
+
+    def test_filter_index_drops_the_free_slots(self):
+        categories = [Category(name=f'Movie {index}') for index in range(300)]
+        self.repo.bulk_insert(categories)
+        for category in categories[:250]:
+            self.repo.delete(category.id)
+        self.repo.insert(Category(name='Movie', is_active=False))
+
+        index = self.repo._get_index(CategoryFilterIndex)
+        self.assertEqual(len(index._categories), 51)
+        self.assertEqual(
+            self.repo._apply_filter(self.repo.items, CategoryFilter(is_active=True)),
+            categories[250:])
+
+    def test_duplicated_ids_index_the_first_category(self):
+        first = Category(name='Movie')
+        duplicate = Category(
+            unique_entity_id=first.unique_entity_id, name='Movie 2', is_active=False)
+        # enough categories for the name index to bulk load them
+        others = [Category(name=f'Other {index}') for index in range(70)]
+        self.repo.bulk_insert([first, duplicate, *others])
+        for repo in (self.repo, CategoryInMemoryRepository(items=[first, duplicate, *others])):
+            self.assertIs(repo.find_by_id(first.id), first)
+            result = repo.search(CategoryRepository.SearchParams(
+                filter=CategoryFilter(name='movie')))
+            self.assertEqual(result.items, [first])
+            result = repo.search(CategoryRepository.SearchParams(
+                filter=CategoryFilter(name='movie', fuzzy=True)))
+            self.assertEqual(result.items, [first])
+            self.assertEqual(repo.autocomplete('mov'), [first])
+            self.assertEqual(repo.stats(), CategoryStats(total=71, active=71))
+
+        index = CategoryFilterIndex()
+        index.add_many([first, duplicate])
+        self.assertEqual(index.search(CategoryFilter()), [first])
+
     def test_sort_by_created_at_when_sort_is_none(self):
         now = datetime.now()
         items = [
@@ -50,3 +159,481 @@ class TestCategoryInMemoryRepositoryUnit(unittest.TestCase):
 
         items_sorted = self.repo._apply_sort(items, 'name', 'desc')
         self.assertEqual(items_sorted, [items[2], items[0], items[1]])
+
+    def test_sort_by_many_fields(self):
+        created_at = datetime.now()
+        items = [
+            Category(name='b', created_at=created_at),
+            Category(name='a', created_at=created_at + timedelta(seconds=100)),
+            Category(name='b', created_at=created_at + timedelta(seconds=200)),
+        ]
+        items_sorted = self.repo._apply_sort(items, 'name,-created_at', None)
+        self.assertEqual(items_sorted, [items[1], items[2], items[0]])
+
+    def assert_stats_consistent(self, expected: CategoryStats):
+        self.assertEqual(self.repo.stats(), expected)
+        # recomputed from scratch by the base implementation
+        self.assertEqual(CategoryRepository.stats(self.repo), expected)
+
+    def test_stats(self):
+        self.assert_stats_consistent(CategoryStats(total=0, active=0))
+
+        category = Category(name='Movie')
+        self.repo.insert(category)
+        self.assert_stats_consistent(CategoryStats(total=1, active=1))
+
+        self.repo.bulk_insert([
+            Category(name='Documentary', is_active=False),
+            Category(name='Series'),
+        ])
+        self.assert_stats_consistent(CategoryStats(total=3, active=2))
+
+        category.deactivate()
+        self.repo.update(category)
+        self.assert_stats_consistent(CategoryStats(total=3, active=1))
+
+        category.activate()
+        self.repo.update_changes(category)
+        self.assert_stats_consistent(CategoryStats(total=3, active=2))
+
+        self.repo.delete(category.id)
+        self.assert_stats_consistent(CategoryStats(total=2, active=1))
+
+        self.repo.items = [Category(name='Movie', is_active=False)]
+        self.assert_stats_consistent(CategoryStats(total=1, active=0))
+        self.assertEqual(self.repo.stats().inactive, 1)
+
+    def test_stats_does_not_scan_the_items(self):
+        self.repo.bulk_insert([Category(name=f'Movie {index}') for index in range(10)])
+        with patch.object(self.repo, 'find_all') as spy_find_all:
+            self.assertEqual(self.repo.stats(), CategoryStats(total=10, active=10))
+            spy_find_all.assert_not_called()
+
+    def test_autocomplete(self):
+        categories = [
+            Category(name='Ação'),
+            Category(name='acao 2'),
+            Category(name='Action'),
+            Category(name='Drama'),
+            Category(name='ACE'),
+        ]
+        self.repo.bulk_insert(categories)
+        arrange = [
+            {'prefix': 'ac', 'limit': 10,
+             'expected': [categories[0], categories[1], categories[4], categories[2]]},
+            {'prefix': 'AÇÃ', 'limit': 10, 'expected': [categories[0], categories[1]]},
+            {'prefix': 'act', 'limit': 10, 'expected': [categories[2]]},
+            {'prefix': 'ac', 'limit': 1, 'expected': [categories[0]]},
+            {'prefix': 'ac', 'limit': 0, 'expected': []},
+            {'prefix': '', 'limit': 2, 'expected': [categories[0], categories[1]]},
+            {'prefix': 'z', 'limit': 10, 'expected': []},
+        ]
+        for item in arrange:
+            self.assertEqual(self.repo.autocomplete(item['prefix'], item['limit']),
+                             item['expected'], msg=item['prefix'])
+            # the default implementation scans and must agree with the index
+            self.assertEqual(
+                CategoryRepository.autocomplete(self.repo, item['prefix'], item['limit']),
+                item['expected'], msg=item['prefix'])
+
+    def test_autocomplete_index_follows_the_writes(self):
+        categories = [Category(name=f'Movie {index:03}') for index in range(100)]
+        self.repo.bulk_insert(categories)
+        categories[0].update('Documentary', None)
+        self.repo.update_changes(categories[0])
+        self.repo.delete(categories[1].id)
+        self.repo.insert(Category(name='Movie 000'))
+
+        self.assertEqual([category.name for category in self.repo.autocomplete('movie 00')],
+                         ['Movie 000', 'Movie 002', 'Movie 003', 'Movie 004', 'Movie 005',
+                          'Movie 006', 'Movie 007', 'Movie 008', 'Movie 009'])
+        self.assertEqual(self.repo.autocomplete('docu'), [categories[0]])
+        self.assertEqual(len(self.repo._get_index(CategoryNameIndex)._entries), 100)
+
+    def test_fuzzy_search(self):
+        categories = [
+            Category(name='Documentary'),
+            Category(name='Action', is_active=False),
+            Category(name='Document'),
+            Category(name='Drama'),
+            Category(name='Documentário'),
+        ]
+        self.repo.bulk_insert(categories)
+
+        result = self.repo.search(CategoryRepository.SearchParams(
+            per_page=2, filter=CategoryFilter(name='documentry', fuzzy=True)))
+        self.assertEqual(result.items, [categories[2], categories[0]])
+        self.assertEqual(result.total, 3)
+        self.assertEqual(result.last_page, 2)
+
+        result = self.repo.search(CategoryRepository.SearchParams(
+            page=2, per_page=2, filter=CategoryFilter(name='documentry', fuzzy=True)))
+        self.assertEqual(result.items, [categories[4]])
+
+        # an explicit sort wins over the ranking
+        result = self.repo.search(CategoryRepository.SearchParams(
+            sort='name', filter=CategoryFilter(name='documentry', fuzzy=True)))
+        self.assertEqual(result.items, [categories[2], categories[4], categories[0]])
+
+        result = self.repo.search(CategoryRepository.SearchParams(
+            filter=CategoryFilter(name='acton', fuzzy=True, is_active=True)))
+        self.assertEqual(result.items, [])
+        result = self.repo.search(CategoryRepository.SearchParams(
+            filter=CategoryFilter(name='acton', fuzzy=True, is_active=False)))
+        self.assertEqual(result.items, [categories[1]])
+
+    def test_fuzzy_search_agrees_with_the_scan(self):
+        categories = [Category(name=f'{name} {index}') for index, name in enumerate(
+            ['Movie', 'Movies', 'Moves', 'Mover', 'Love', 'Drama', 'Doc'] * 5)]
+        self.repo.bulk_insert(categories)
+        categories[0].update('Drama', None)
+        self.repo.update_changes(categories[0])
+        self.repo.delete(categories[1].id)
+
+        for name in ['movei', 'dram', 'loves 4', 'x']:
+            category_filter = CategoryFilter(name=name, fuzzy=True)
+            # a copy of the items is not indexed, so it is scanned and ranked
+            self.assertEqual(
+                self.repo._apply_filter(self.repo.items, category_filter),
+                self.repo._apply_filter(list(self.repo.items), category_filter),
+                msg=name)
+
+    def test_fuzzy_search_ranks_with_the_index_scores(self):
+        self.repo.bulk_insert([Category(name='Movie'), Category(name='Movies')])
+        with patch('category.infra.repositories.similarity') as spy_similarity, \
+                patch.object(self.repo, '_apply_rank') as spy_apply_rank:
+            result = self.repo.search(CategoryRepository.SearchParams(
+                filter=CategoryFilter(name='movie', fuzzy=True)))
+            spy_similarity.assert_not_called()
+            spy_apply_rank.assert_not_called()
+        self.assertEqual([category.name for category in result.items], ['Movie', 'Movies'])
+
+    def test_fuzzy_search_does_not_score_every_name(self):
+        self.repo.bulk_insert([Category(name='Movie'), Category(name='Drama')])
+        index = self.repo._get_index(CategoryTrigramIndex)
+        self.assertEqual(index.search('Muvie', CategoryFilter.fuzzy_threshold),
+                         [(1 / 3, self.repo.items[0])])
+        self.assertEqual(index.search('xyz', CategoryFilter.fuzzy_threshold), [])
+
+    def test_filter_and_sort_by_folded_name(self):
+        categories = [
+            Category(name='Ação'),
+            Category(name='Drama'),
+            Category(name='acao 2'),
+            Category(name='ACAO'),
+            Category(name='Ábaco'),
+        ]
+        self.repo.bulk_insert(categories)
+
+        result = self.repo.search(CategoryRepository.SearchParams(
+            sort='name', filter='AÇÃO'))
+        self.assertEqual(result.items, [categories[3], categories[0], categories[2]])
+
+        result = self.repo.search(CategoryRepository.SearchParams(sort='name', sort_dir='desc'))
+        self.assertEqual(result.items, [
+            categories[1], categories[2], categories[0], categories[3], categories[4]])
+
+    def test_filter_and_sort_use_the_stored_folded_names(self):
+        self.repo.bulk_insert([Category(name=f'Ação {index}') for index in range(10)])
+        self.repo.search(CategoryRepository.SearchParams())
+        with patch('category.infra.repositories.fold', wraps=fold) as spy_fold:
+            result = self.repo.search(CategoryRepository.SearchParams(
+                sort='name', filter=CategoryFilter(name='acao', is_active=True)))
+            self.assertEqual(result.total, 10)
+            # the filter itself, never the stored names
+            spy_fold.assert_called_once_with('acao')
+
+    def test_search_with_facets(self):
+        categories = [
+            Category(name='Movie', created_at=datetime(2024, 1, 10)),
+            Category(name='Movie 2', is_active=False, created_at=datetime(2024, 2, 1)),
+            Category(name='Drama', created_at=datetime(2023, 12, 31)),
+            Category(name='Movie 3', created_at=datetime(2024, 1, 31)),
+        ]
+        self.repo.bulk_insert(categories)
+
+        result = self.repo.search(CategoryRepository.SearchParams(
+            per_page=1, filter='movie', facets=('is_active', 'created_at_month', 'fake')))
+        self.assertEqual(result.facets, {
+            'is_active': {True: 2, False: 1},
+            'created_at_month': {'2024-01': 2, '2024-02': 1},
+        })
+
+        result = self.repo.search(CategoryRepository.SearchParams(
+            filter=CategoryFilter(is_active=False), facets='is_active'))
+        self.assertEqual(result.facets, {'is_active': {True: 0, False: 1}})
+
+        result = self.repo.search(CategoryRepository.SearchParams(filter='movie'))
+        self.assertIsNone(result.facets)
+
+    def test_search_with_facets_and_no_filter_reads_the_counters(self):
+        categories = [
+            Category(name='Movie', created_at=datetime(2024, 1, 10)),
+            Category(name='Drama', is_active=False, created_at=datetime(2023, 12, 31)),
+            Category(name='Doc', created_at=datetime(2024, 1, 31)),
+        ]
+        self.repo.bulk_insert(categories)
+        categories[1].activate()
+        self.repo.update_changes(categories[1])
+        self.repo.delete(categories[2].id)
+
+        with patch.object(self.repo, '_facet_key') as spy_facet_key:
+            result = self.repo.search(CategoryRepository.SearchParams(
+                facets=('created_at_month', 'is_active')))
+            spy_facet_key.assert_not_called()
+        self.assertEqual(result.facets, {
+            'created_at_month': {'2023-12': 1, '2024-01': 1},
+            'is_active': {True: 2, False: 0},
+        })
+
+    def test_exists_by_name(self):
+        categories = [Category(name='Ação'), Category(name='Drama')]
+        self.repo.bulk_insert(categories)
+        for repo in (self.repo, BloomFilteredCategoryRepository(self.repo)):
+            for name, expected in [('acao', True), ('AÇÃO', True), ('drama', True),
+                                   ('Ação 2', False), ('Movie', False)]:
+                self.assertEqual(repo.exists_by_name(name), expected, msg=name)
+                self.assertEqual(CategoryRepository.exists_by_name(repo, name), expected, msg=name)
+
+        categories[0].update('Movie', None)
+        self.repo.update_changes(categories[0])
+        self.repo.delete(categories[1].id)
+        self.assertTrue(self.repo.exists_by_name('movie'))
+        self.assertFalse(self.repo.exists_by_name('acao'))
+        self.assertFalse(self.repo.exists_by_name('drama'))
+
+    def test_unique_names(self):
+        repo = CategoryInMemoryRepository(unique_names=True)
+        error = {'name': ['A category with this name already exists.']}
+        movie, drama = Category(name='Movie'), Category(name='Drama')
+        repo.insert(movie)
+
+        def assert_rejected(write, *args):
+            with self.assertRaises(EntityValidationException) as assert_error:
+                write(*args)
+            self.assertEqual(assert_error.exception.error, error)
+
+        assert_rejected(repo.insert, Category(name='MOVIE'))
+        # a bulk insert is rejected as a whole, also for a name taken twice in it
+        assert_rejected(repo.bulk_insert, [drama, Category(name='movie')])
+        assert_rejected(repo.bulk_insert, [drama, Category(name='Dráma')])
+        self.assertEqual(repo.items, [movie])
+        rejected = repo.bulk_insert_valid([drama, Category(name='movie'), Category(name='Dráma')])
+        self.assertEqual({index: error.error for index, error in rejected.items()},
+                         {1: error, 2: error})
+        self.assertEqual(repo.items, [movie, drama])
+        repo.bulk_insert([Category(name='Documentary')])
+
+        renamed = drama.copy()
+        renamed.update('Movie', None)
+        assert_rejected(repo.update, renamed)
+        assert_rejected(repo.update_changes, renamed)
+        assert_rejected(repo.update_where,
+                        CategoryRepository.SearchParams(filter='drama'), {'name': 'movie'})
+        # two categories renamed to the same name
+        assert_rejected(repo.update_where, CategoryRepository.SearchParams(
+            filter=CategoryFilter(name='d')), {'name': 'Thriller'})
+        self.assertEqual(repo.find_by_id(drama.id).name, 'Drama')
+        self.assertEqual(repo.find_by_id(drama.id).version, 1)
+
+        # keeping its own name is no conflict
+        same = movie.copy()
+        same.change(description='Films', name='movie')
+        repo.update(same)
+        self.assertEqual(repo.update_where(CategoryRepository.SearchParams(filter='drama'),
+                                           {'name': 'Drama', 'is_active': False}), [drama])
+
+        soft_repo = CategoryInMemoryRepository(unique_names=True, soft_delete=True)
+        soft_repo.insert(movie)
+        soft_repo.delete(movie.id)
+        soft_repo.insert(Category(name='movie'))
+        assert_rejected(soft_repo.restore, movie.id)
+
+    def test_bloom_filtered_repository(self):
+        category = Category(name='Movie')
+        self.repo.insert(category)
+        repo = BloomFilteredCategoryRepository(self.repo)
+
+        with patch.object(self.repo, 'exists_by_name') as spy_exists_by_name:
+            self.assertFalse(repo.exists_by_name('Drama'))
+            spy_exists_by_name.assert_not_called()
+
+        other = Category(name='Drama')
+        repo.insert(other)
+        self.assertTrue(repo.exists_by_name('drama'))
+        other.update('Documentary', None)
+        repo.update_changes(other)
+        self.assertTrue(repo.exists_by_name('documentary'))
+        self.assertFalse(repo.exists_by_name('drama'))
+
+        self.assertEqual(repo.search(CategoryRepository.SearchParams(sort='name')).items,
+                         [other, category])
+        self.assertEqual(repo.stats(), CategoryStats(total=2, active=2))
+        self.assertEqual(repo.autocomplete('mov'), [category])
+
+        self.assertEqual(repo.update_where(
+            CategoryRepository.SearchParams(filter='movie'), {'name': 'Thriller'}), [category])
+        self.assertTrue(repo.exists_by_name('thriller'))
+        self.assertEqual(repo.delete_where(
+            CategoryRepository.SearchParams(filter=CategoryFilter(name='thriller'))), [category])
+        self.assertEqual(self.repo.items, [other])
+
+    def test_bloom_filtered_names_are_added_before_the_write(self):
+        repo = BloomFilteredCategoryRepository(self.repo)
+        category = Category(name='Movie')
+        seen = []
+
+        def write(*_):
+            seen.append(fold(category.name) in repo.names)
+
+        for method in ('insert', 'update', 'update_changes'):
+            with patch.object(self.repo, method, side_effect=write):
+                getattr(repo, method)(category)
+            category.update(f'{category.name} 2', None)
+        with patch.object(self.repo, 'bulk_insert', side_effect=write):
+            repo.bulk_insert([category])
+        self.assertEqual(seen, [True] * 4)
+
+    def test_where_operations_keep_the_indexes(self):
+        # a few matches are re-indexed one by one, many rebuild the indexes
+        for size in (10, 200):
+            with self.subTest(size=size):
+                now = datetime.now()
+                categories = [
+                    Category(name=f'Movie {index}', is_active=index % 3 == 0,
+                             created_at=now + timedelta(seconds=index))
+                    for index in range(size)
+                ]
+                self.repo = CategoryInMemoryRepository()
+                self.repo.bulk_insert(categories)
+                recent = CategoryFilter(created_at_from=now + timedelta(seconds=size - 5))
+
+                deactivated = [category for category in categories[-5:] if category.is_active]
+                self.assertEqual(self.repo.update_where(
+                    CategoryRepository.SearchParams(filter=recent), {'is_active': False}),
+                    deactivated)
+                renamed = {category.id for category in categories if '1' in category.name}
+                self.assertEqual({category.id for category in self.repo.update_where(
+                    CategoryRepository.SearchParams(filter='1'),
+                    {'name': 'Drama', 'is_active': True})}, renamed)
+                inactive = {category.id for category in categories if not category.is_active}
+                self.assertEqual({category.id for category in self.repo.delete_where(
+                    CategoryRepository.SearchParams(filter=CategoryFilter(is_active=False)))},
+                    inactive)
+
+                expected = CategoryInMemoryRepository(items=list(self.repo.items))
+                self.assertEqual(self.repo.stats(), expected.stats())
+                self.assertEqual(self.repo.autocomplete('dra', 100),
+                                 expected.autocomplete('dra', 100))
+                for category_filter in (CategoryFilter(is_active=True), recent,
+                                        CategoryFilter(name='drma', fuzzy=True)):
+                    self.assertEqual(
+                        self.repo.search(CategoryRepository.SearchParams(
+                            filter=category_filter, facets='is_active')),
+                        expected.search(CategoryRepository.SearchParams(
+                            filter=category_filter, facets='is_active')),
+                        msg=category_filter)
+
+    def test_soft_delete_is_answered_from_the_indexes(self):
+        self.repo = CategoryInMemoryRepository(soft_delete=True)
+        categories = [Category(name='Movie'), Category(name='Drama', is_active=False),
+                      Category(name='Documentary')]
+        self.repo.bulk_insert(categories)
+        self.repo.delete(categories[2].id)
+
+        with patch.object(CategoryFilter, 'matches') as spy_matches:
+            result = self.repo.search(CategoryRepository.SearchParams(
+                filter=CategoryFilter(name='d'), facets='is_active'))
+            spy_matches.assert_not_called()
+        self.assertEqual(result.items, [categories[1]])
+        self.assertEqual(result.facets, {'is_active': {True: 0, False: 1}})
+        self.assertEqual(self.repo.search(CategoryRepository.SearchParams(
+            sort='name', facets='is_active')).facets, {'is_active': {True: 1, False: 1}})
+        self.assertEqual(self.repo.stats(), CategoryStats(total=2, active=1))
+        self.assertEqual(self.repo.autocomplete('doc'), [])
+        self.assertFalse(self.repo.exists_by_name('documentary'))
+
+        self.repo.restore(categories[2].id)
+        self.assertEqual(self.repo.autocomplete('doc'), [categories[2]])
+        self.repo.delete(categories[2].id)
+        self.repo.compact()
+        self.assertEqual(self.repo.search(CategoryRepository.SearchParams(sort='name')).items,
+                         [categories[1], categories[0]])
+
+    def test_soft_delete_of_an_id_inserted_again(self):
+        self.repo = CategoryInMemoryRepository(soft_delete=True)
+        category = Category(name='Movie')
+        self.repo.insert(category)
+        self.repo.delete(category.id)
+        self.repo.insert(Category(unique_entity_id=category.unique_entity_id, name='Movie 2'))
+        self.repo.delete(category.id)
+
+        self.assertEqual(self.repo.find_all(), [])
+        result = self.repo.search(CategoryRepository.SearchParams())
+        self.assertEqual((result.items, result.total), ([], 0))
+        self.assertEqual(self.repo.stats(), CategoryStats(total=0, active=0))
+
+    def test_soft_delete_then_update_of_an_id_inserted_again(self):
+        self.repo = CategoryInMemoryRepository(soft_delete=True)
+        category = Category(name='Movie')
+        self.repo.insert(category)
+        self.repo.delete(category.id)
+        self.repo.insert(category.copy())
+        renamed = category.copy()
+        renamed.update('Doc', None)
+        self.repo.update(renamed)
+
+        self.assertEqual([item.name for item in self.repo.find_all()], ['Doc'])
+        result = self.repo.search(CategoryRepository.SearchParams())
+        self.assertEqual((result.items, result.total), ([renamed], 1))
+        self.assertEqual(self.repo.stats().total, 1)
+        self.repo.compact()
+        self.assertEqual(self.repo.items, [renamed])
+
+    def test_search_by_specification(self):
+        now = datetime.now()
+        categories = [
+            Category(name=name, is_active=index % 2 == 0,
+                     created_at=now + timedelta(seconds=index))
+            for index, name in enumerate(['Movie', 'Documentary', 'Documentário', 'Drama',
+                                          'Animation', 'Document'])
+        ]
+        self.repo.bulk_insert(categories)
+        arrange = [
+            Eq('is_active', True) & Contains('name', 'docu'),
+            Range('created_at', now + timedelta(seconds=2)) & Contains('name', 'a'),
+            Similar('name', 'Documentari', 0.3) & Eq('is_active', False),
+            Contains('name', 'ma') | Eq('is_active', True),
+            ~Contains('name', 'doc') & Range('created_at', upper=now + timedelta(seconds=3)),
+        ]
+        for spec in arrange:
+            with self.subTest(spec=spec):
+                self.assertEqual(
+                    self.repo.search(CategoryRepository.SearchParams(
+                        filter=spec, sort='name')).items,
+                    sorted(filter(spec.is_satisfied_by, categories),
+                           key=lambda category: fold(category.name)))
+
+        category_filter = CategoryFilter(name='doc', created_at_to=now + timedelta(seconds=4))
+        self.assertEqual(
+            self.repo.search(CategoryRepository.SearchParams(
+                filter=category_filter.to_specification())).items,
+            self.repo.search(CategoryRepository.SearchParams(filter=category_filter)).items)
+
+    def test_search_by_specification_is_driven_by_an_index(self):
+        categories = [Category(name=f'Movie {index}', is_active=index == 3)
+                      for index in range(100)]
+        self.repo.bulk_insert(categories)
+        spec = Contains('name', 'movie') & Eq('is_active', True) & ~Eq('name', 'Movie 3')
+        with patch.object(CategoryFilterIndex, 'search',
+                          wraps=self.repo._get_index(CategoryFilterIndex).search) as spy_search:
+            # the not is left to the predicate
+            self.assertEqual(self.repo._index_candidates(spec), [categories[3]])
+            spy_search.assert_called_once_with(CategoryFilter(name='movie', is_active=True))
+        self.assertEqual(
+            self.repo.search(CategoryRepository.SearchParams(filter=spec)).items, [])
+        similar = Similar('name', 'Movie 42', 0.8)
+        candidates = self.repo._index_candidates(similar)
+        self.assertLess(len(candidates), len(categories))
+        self.assertEqual(set(map(id, filter(similar.is_satisfied_by, categories))),
+                         set(map(id, candidates)))
@@ -0,0 +1,46 @@
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from functools import partial
+import json
+import timeit
+import unittest
+
+from __seedwork.application.encoders import encode
+from category.application.dto import CategoryOutputMapper
+from category.application.use_cases import ListCategoryUseCase
+from category.domain.entities import Category
+
+
+def make_page(size: int) -> ListCategoryUseCase.Output:
+    created_at = datetime(2022, 1, 1)
+    categories = [
+        Category(name=f'Movie {index}', description='Some description' if index % 2 else None,
+                 created_at=created_at + timedelta(seconds=index))
+        for index in range(size)
+    ]
+    return ListCategoryUseCase.Output(
+        items=list(map(CategoryOutputMapper.without_child().to_output, categories)),
+        total=size, current_page=1, per_page=size, last_page=1)
+
+
+def asdict_json_dumps(output) -> bytes:
+    return json.dumps(asdict(output), default=lambda value: value.isoformat(),
+                      separators=(',', ':')).encode()
+
+
+def best_time(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+class TestEncodeBenchmarkIntegration(unittest.TestCase):
+
+    def test_encode_is_faster_than_asdict_json_dumps(self):
+        for size, number in ((15, 200), (100, 50), (1_000, 5)):
+            output = make_page(size)
+            self.assertEqual(encode(output), asdict_json_dumps(output))
+            asdict_time = best_time(partial(asdict_json_dumps, output), number)
+            encode_time = best_time(partial(encode, output), number)
+            self.assertLess(
+                encode_time, asdict_time,
+                msg=f'{size} items: encode {encode_time * 1e6:.0f}us, '
+                f'asdict+json.dumps {asdict_time * 1e6:.0f}us')
@@ -101,6 +101,19 @@ class TestCategoryIntegration(unittest.TestCase):
         except EntityValidationException as exception:
             self.fail(f'Some prop is not valid. Error {exception.error}')
 
+    def test_update_revalidates_only_changed_props(self):
+        category = Category(name='Movie')
+        # an invalid value set behind the entity's back is not re-checked
+        object.__setattr__(category, 'is_active', 5)
+        try:
+            category.update('Movie', 'some description')
+        except EntityValidationException as exception:
+            self.fail(f'Some prop is not valid. Error {exception.error}')
+
+        with self.assertRaises(EntityValidationException) as assert_error:
+            category.update(5, 'some description')
+        self.assertEqual(list(assert_error.exception.error), ['name'])
+
     # def test_invalid_cases_for_name_prop(self):
     #     with self.assertRaises(ValidationException) as assert_error:
     #         Category(name=None)
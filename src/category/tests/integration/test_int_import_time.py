@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC_DIR = Path(__file__).resolve().parents[3]
+IMPORT_TIME_BUDGET_US = 150_000
+
+
+def import_time_report(module: str) -> dict:
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+    with tempfile.TemporaryDirectory() as pycache_dir:
+        # measures a warm start, as a deployed service loads cached bytecode,
+        # even when bytecode writing is disabled in the test environment
+        env = {**os.environ, 'PYTHONPYCACHEPREFIX': pycache_dir}
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        subprocess.run(command, cwd=SRC_DIR, env=env, capture_output=True, check=True)
+        result = subprocess.run(
+            command, cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True
+        )
+    report = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, package = line.split('|')
+        report[package.strip()] = int(cumulative)
+    return report
+
+
+class TestImportTimeIntegration(unittest.TestCase):
+
+    def test_use_cases_import_does_not_load_drf(self):
+        report = import_time_report('category.application.use_cases')
+        loaded = [package for package in report
+                  if package.split('.')[0] in ('django', 'rest_framework')]
+        self.assertEqual(loaded, [])
+
+    def test_validators_import_does_not_load_drf(self):
+        report = import_time_report('__seedwork.domain.validators')
+        loaded = [package for package in report
+                  if package.split('.')[0] in ('django', 'rest_framework')]
+        self.assertEqual(loaded, [])
+
+    def test_use_cases_import_does_not_load_asyncio(self):
+        report = import_time_report('category.application.use_cases')
+        self.assertNotIn('asyncio', report)
+
+    def test_use_cases_import_does_not_load_specifications(self):
+        # the repositories only need the base class, the specifications load with the first use
+        report = import_time_report('category.application.use_cases')
+        self.assertIn('__seedwork.domain.specification', report)
+        self.assertNotIn('__seedwork.domain.specifications', report)
+
+    def test_use_cases_import_time_budget(self):
+        # best of a few runs, a single one is too noisy on a busy machine
+        import_time = min(
+            import_time_report('category.application.use_cases')['category.application.use_cases']
+            for _ in range(3))
+        self.assertLess(import_time, IMPORT_TIME_BUDGET_US)
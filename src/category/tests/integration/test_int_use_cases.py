@@ -0,0 +1,48 @@
+from functools import partial
+import timeit
+import unittest
+
+from category.application.use_cases import CreateCategoriesUseCase, CreateCategoryUseCase
+from category.infra.repositories import CategoryInMemoryRepository
+
+
+def make_inputs(size: int):
+    return [
+        CreateCategoryUseCase.Input(
+            name=f'Movie {index}', description='Some description' if index % 2 else None,
+            is_active=index % 3 != 0)
+        for index in range(size)
+    ]
+
+
+def create_one_by_one(inputs) -> None:
+    use_case = CreateCategoryUseCase(category_repo=CategoryInMemoryRepository())
+    for input_param in inputs:
+        use_case.execute(input_param)
+
+
+def create_in_batch(inputs) -> None:
+    use_case = CreateCategoriesUseCase(category_repo=CategoryInMemoryRepository())
+    use_case.execute(CreateCategoriesUseCase.Input(items=inputs))
+
+
+def best_time(func) -> float:
+    return min(timeit.repeat(func, number=1, repeat=3))
+
+
+class TestCreateCategoriesBenchmarkIntegration(unittest.TestCase):
+
+    def test_batch_is_several_times_faster_than_one_by_one(self):
+        # not the order of magnitude first aimed at: the batch saves the DRF
+        # validation and the per call overhead, but both paths pay the same
+        # name and trigram index upkeep per item, which caps the gain. Measured
+        # around 9x at 1k items and 7x at 10k; 1k keeps the suite fast, and the
+        # 5x bound leaves a margin for a busy machine
+        inputs = make_inputs(1_000)
+        create_in_batch(inputs[:10])  # DRF and the Django settings load here
+        one_by_one_time = best_time(partial(create_one_by_one, inputs))
+        batch_time = best_time(partial(create_in_batch, inputs))
+        self.assertLess(
+            batch_time * 5, one_by_one_time,
+            msg=f'{len(inputs)} items: batch {batch_time * 1e3:.1f}ms, '
+            f'one by one {one_by_one_time * 1e3:.1f}ms')
@@ -3,7 +3,9 @@ from dataclasses import FrozenInstanceError, is_dataclass
 from datetime import datetime
 import unittest
 from unittest.mock import patch
+from __seedwork.domain.exceptions import EntityValidationException
 from category.domain.entities import Category
+from category.domain.events import CategoryCreated, CategoryUpdated
 
 # TDD - Kent Beck
 
@@ -53,6 +55,22 @@ class TestCategoryUnit(unittest.TestCase):
             self.assertEqual(category.name, "Movie")
             self.assertEqual(category.description, "Movie description")
 
+    def test_update_validates_only_dirty_fields(self):
+        category = Category(name="Movie", description="Movie description")
+        with patch.object(Category, 'validate') as mock_validate_method:
+            category.update("Movie", "other description")
+            mock_validate_method.assert_called_once_with({'description'})
+
+    def test_activate_and_deactivate_track_changes(self):
+        with patch.object(Category, 'validate'):
+            category = Category(name="Movie", is_active=True)
+            category.activate()
+            self.assertFalse(category.is_dirty)
+            category.deactivate()
+            self.assertEqual(category.dirty_fields, {'is_active'})
+            category.activate()
+            self.assertFalse(category.is_dirty)
+
     def test_activate(self):
         with patch.object(Category, 'validate'):
             category = Category(name="Movie", is_active=False)
@@ -64,3 +82,81 @@ class TestCategoryUnit(unittest.TestCase):
             category = Category(name="Movie", is_active=True)
             category.deactivate()
             self.assertEqual(category.is_active, False)
+
+    def test_change(self):
+        with patch.object(Category, 'validate') as mock_validate_method:
+            category = Category(name="Movie", description="some description")
+            mock_validate_method.reset_mock()
+
+            category.change(name="Movie", description=None)
+            self.assertEqual(category.description, None)
+            self.assertEqual(category.dirty_fields, {'description'})
+            mock_validate_method.assert_called_once_with({'description'})
+
+            with self.assertRaises(TypeError):
+                category.change(created_at=datetime.now())
+
+    def test_invalid_change_leaves_category_unchanged(self):
+        category = Category(name="Movie", is_active=True)
+        category.change(name="Documentary")
+        with self.assertRaises(EntityValidationException):
+            category.change(name="Movie 2", is_active=5)
+        self.assertEqual(category.name, "Documentary")
+        self.assertIs(category.is_active, True)
+        self.assertEqual(category.dirty_fields, {'name'})
+
+    def test_create_many(self):
+        result = Category.create_many([
+            {'name': 'Movie'},
+            {'name': None},
+        ])
+        category, errors = result[0]
+        self.assertIsInstance(category, Category)
+        self.assertEqual(category.name, 'Movie')
+        self.assertIsInstance(category.created_at, datetime)
+        self.assertIsNone(errors)
+        self.assertEqual(result[1], (None, {'name': ['This field may not be null.']}))
+        self.assertEqual([event.event_type for event in category.events], ['CategoryCreated'])
+
+    def test_records_created_event(self):
+        self.assertEqual(Category(name='Movie').events, ())
+
+        category = Category.create(name='Movie', description='some description')
+        self.assertIsInstance(category, Category)
+        event, = category.events
+        self.assertEqual(event, CategoryCreated(
+            entity_id=category.id,
+            occurred_on=event.occurred_on,
+            name='Movie',
+            description='some description',
+            is_active=True,
+            created_at=category.created_at
+        ))
+
+        restored = Category.restore(name='Movie')
+        self.assertEqual(restored.events, ())
+
+    def test_records_one_updated_event_with_the_latest_state(self):
+        category = Category(name='Movie')
+
+        category.update('Movie', None)
+        self.assertEqual(category.events, ())
+
+        category.update('Documentary', 'some description')
+        category.deactivate()
+        event, = category.events
+        self.assertIsInstance(event, CategoryUpdated)
+        self.assertEqual(
+            (event.entity_id, event.name, event.description, event.is_active),
+            (category.id, 'Documentary', 'some description', False))
+        self.assertEqual(event.changed_fields, {'name', 'description', 'is_active'})
+
+        category.change(name='Movie', description=None)
+        category.activate()
+        self.assertEqual(category.events, ())
+
+    def test_invalid_update_records_no_event(self):
+        category = Category(name='Movie')
+        with self.assertRaises(EntityValidationException):
+            category.change(name='')
+        self.assertEqual(category.events, ())
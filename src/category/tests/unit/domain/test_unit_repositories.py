@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+import unittest
+from __seedwork.domain.exceptions import ValidationException
+from __seedwork.domain.specifications import (
+    And, Contains, Eq, Range, Similar, SqlCompiler, SqlWhere
+)
+from category.domain.entities import Category
+from category.domain.repositories import CategoryFilter, CategoryRepository
+
+
+class TestCategoryFilterUnit(unittest.TestCase):
+
+    def test_is_empty(self):
+        self.assertTrue(CategoryFilter().is_empty)
+        self.assertTrue(CategoryFilter(name='').is_empty)
+        self.assertIsNone(CategoryFilter(name='').name)
+        self.assertFalse(CategoryFilter(is_active=False).is_empty)
+        self.assertFalse(CategoryFilter(created_at_to=datetime.now()).is_empty)
+
+    def test_matches(self):
+        now = datetime.now()
+        category = Category(name='Movie', is_active=False, created_at=now)
+        arrange = [
+            (CategoryFilter(), True),
+            (CategoryFilter(name='MOV'), True),
+            (CategoryFilter(name='doc'), False),
+            (CategoryFilter(is_active=False), True),
+            (CategoryFilter(is_active=True), False),
+            (CategoryFilter(created_at_from=now, created_at_to=now), True),
+            (CategoryFilter(created_at_from=now + timedelta(seconds=1)), False),
+            (CategoryFilter(created_at_to=now - timedelta(seconds=1)), False),
+            (CategoryFilter(name='mov', is_active=True), False),
+            (CategoryFilter(name='Moveis', fuzzy=True), True),
+            (CategoryFilter(name='Drama', fuzzy=True), False),
+            (CategoryFilter(name='Moveis', fuzzy=True, is_active=True), False),
+        ]
+        for category_filter, expected in arrange:
+            self.assertEqual(category_filter.matches(category), expected, msg=category_filter)
+            self.assertEqual(category_filter.to_specification().is_satisfied_by(category),
+                             expected, msg=category_filter)
+
+    def test_from_mapping(self):
+        arrange = [
+            ({}, CategoryFilter()),
+            ({'name': 'mov', 'fuzzy': 'true'}, CategoryFilter(name='mov', fuzzy=True)),
+            ({'is_active': 'false'}, CategoryFilter(is_active=False)),
+            ({'is_active': ' TRUE '}, CategoryFilter(is_active=True)),
+            ({'is_active': '1', 'fuzzy': '0'}, CategoryFilter(is_active=True)),
+            ({'is_active': False, 'fuzzy': ''}, CategoryFilter(is_active=False)),
+            ({'is_active': '', 'name': None}, CategoryFilter()),
+            ({'created_at_from': '2020-01-01'},
+             CategoryFilter(created_at_from=datetime(2020, 1, 1))),
+            ({'created_at_to': '2020-01-01T10:30:00'},
+             CategoryFilter(created_at_to=datetime(2020, 1, 1, 10, 30))),
+            ({'created_at_from': datetime(2020, 1, 1).date()},
+             CategoryFilter(created_at_from=datetime(2020, 1, 1))),
+            ({'created_at_to': datetime(2020, 1, 1, 10)},
+             CategoryFilter(created_at_to=datetime(2020, 1, 1, 10))),
+        ]
+        for params, expected in arrange:
+            self.assertEqual(CategoryFilter.from_mapping(params), expected, msg=f'params: {params}')
+
+        created_at_from = CategoryFilter.from_mapping(
+            {'created_at_from': '2020-01-01T10:00:00+00:00'}).created_at_from
+        self.assertIsNone(created_at_from.tzinfo)
+        self.assertEqual(created_at_from, datetime(2020, 1, 1, 10, tzinfo=timezone.utc)
+                         .astimezone().replace(tzinfo=None))
+
+    def test_from_mapping_rejects_unknown_fields_and_bad_values(self):
+        arrange = [
+            ({'foo': 1, 'name': 'mov'}, "Unknown filter fields: ['foo']"),
+            ({'name': 5}, 'The name must be a string'),
+            ({'is_active': 'maybe'}, 'The is_active must be a boolean'),
+            ({'is_active': 1}, 'The is_active must be a boolean'),
+            ({'fuzzy': 'yes please'}, 'The fuzzy must be a boolean'),
+            ({'created_at_from': 'yesterday'}, 'The created_at_from must be an ISO 8601 datetime'),
+            ({'created_at_to': 5}, 'The created_at_to must be an ISO 8601 datetime'),
+        ]
+        for params, message in arrange:
+            with self.assertRaises(ValidationException, msg=f'params: {params}') as assert_error:
+                CategoryFilter.from_mapping(params)
+            self.assertEqual(assert_error.exception.args[0], message)
+
+    def test_to_specification(self):
+        now = datetime.now()
+        self.assertEqual(CategoryFilter().to_specification(), And(()))
+        self.assertEqual(
+            CategoryFilter(name='mov', is_active=True, created_at_to=now).to_specification(),
+            And((Contains('name', 'mov'), Eq('is_active', True),
+                 Range('created_at', None, now))))
+        self.assertEqual(CategoryFilter(name='mov', fuzzy=True).to_specification(),
+                         And((Similar('name', 'mov', CategoryFilter.fuzzy_threshold),)))
+
+        compiler = SqlCompiler({'name': 'name', 'is_active': 'is_active',
+                                'created_at': 'created_at'})
+        self.assertEqual(
+            compiler.compile(CategoryFilter(
+                name='mov', is_active=False, created_at_from=now).to_specification()),
+            SqlWhere("(LOWER(name) LIKE %s ESCAPE '\\' AND is_active = %s"
+                     " AND created_at >= %s)", ('%mov%', False, now)))
+
+
+class TestCategorySearchParamsUnit(unittest.TestCase):
+
+    def test_fields_prop(self):
+        params = CategoryRepository.SearchParams()
+        self.assertIsNone(params.fields)
+
+        arrange = [
+            {'fields': None, 'expected': None},
+            {'fields': '', 'expected': None},
+            {'fields': (), 'expected': None},
+            {'fields': ('fake',), 'expected': None},
+            {'fields': ('id', 'name'), 'expected': ('id', 'name')},
+            {'fields': ['name', 'id', 'name'], 'expected': ('name', 'id')},
+            {'fields': 'id, name,fake', 'expected': ('id', 'name')},
+            {'fields': ('created_at', 'version'), 'expected': ('created_at', 'version')},
+        ]
+        for item in arrange:
+            params = CategoryRepository.SearchParams(fields=item['fields'])
+            self.assertEqual(params.fields, item['expected'],
+                             msg=f"fields = {item['fields']}")
+
+    def test_filter_prop(self):
+        category_filter = CategoryFilter(is_active=True)
+        arrange = [
+            {'filter': None, 'expected': None},
+            {'filter': '', 'expected': None},
+            {'filter': 'movie', 'expected': 'movie'},
+            {'filter': CategoryFilter(), 'expected': None},
+            {'filter': category_filter, 'expected': category_filter},
+            {'filter': {'is_active': True}, 'expected': category_filter},
+            {'filter': {'is_active': 'true'}, 'expected': category_filter},
+            {'filter': {'is_active': ''}, 'expected': None},
+            {'filter': {}, 'expected': None},
+        ]
+        for item in arrange:
+            params = CategoryRepository.SearchParams(filter=item['filter'])
+            self.assertEqual(params.filter, item['expected'], msg=f"filter = {item['filter']}")
+
+    def test_filter_prop_rejects_bad_mappings(self):
+        for filter_param in ({'foo': 1}, {'created_at_from': 'yesterday'}):
+            with self.assertRaises(ValidationException, msg=f'filter = {filter_param}'):
+                CategoryRepository.SearchParams(filter=filter_param)
+
+    def test_keeps_default_normalization(self):
+        params = CategoryRepository.SearchParams(
+            page='2', per_page='fake', sort='', filter='', fields='name')
+        self.assertEqual(params.page, 2)
+        self.assertEqual(params.per_page, 15)
+        self.assertIsNone(params.sort)
+        self.assertIsNone(params.filter)
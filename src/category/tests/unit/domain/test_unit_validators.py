@@ -1,5 +1,6 @@
 import unittest
-from category.domain.validators import CategoryValidator, CategoryValidatorFactory
+from __seedwork.domain.drf_validators import plain_validity_check
+from category.domain.validators import CategoryRules, CategoryValidator, CategoryValidatorFactory
 
 
 class TestCategoryValidatorUnit(unittest.TestCase):
@@ -75,3 +76,42 @@ class TestCategoryValidatorUnit(unittest.TestCase):
         for item in valid_data:
             is_valid = self.validator.validate(data=item)
             self.assertTrue(is_valid, msg=f'data: {item}')
+
+    def test_validate_many(self):
+        data = [
+            {'name': 'Movie'},
+            {'name': ''},
+            {'name': 'Movie', 'description': 5},
+            {'name': 'Ação', 'is_active': False},
+            {'name': 'Movie', 'is_active': 0},
+        ]
+        self.assertEqual(self.validator.validate_many(data), [
+            None,
+            {'name': ['This field may not be blank.']},
+            {'description': ['Not a valid string.']},
+            None,
+            {'is_active': ['Must be a valid boolean.']},
+        ])
+
+    def test_plainly_valid_items_are_valid_for_drf(self):
+        candidates = [
+            {'name': 'Movie'},
+            {'name': '  '},
+            {'name': ' Movie '},
+            {'name': 'a' * 255},
+            {'name': 'a' * 256},
+            {'name': 'Mo\x00vie'},
+            {'name': 'Movie', 'description': None},
+            {'name': 'Movie', 'description': ''},
+            {'name': 'Movie', 'description': '\ud800'},
+            {'name': 'Movie', 'is_active': None},
+            {'name': 'Movie', 'is_active': 1},
+            {'name': 'Movie', 'created_at': None},
+            {'name': 5},
+        ]
+        is_plainly_valid = plain_validity_check(CategoryRules)
+        for item in candidates:
+            if is_plainly_valid(item):
+                self.assertTrue(self.validator.validate(item), msg=f'data: {item}')
+        self.assertTrue(is_plainly_valid({'name': 'Movie', 'description': 'Some description',
+                                          'is_active': False}))